@@ -0,0 +1,318 @@
+# backend/analysis.py
+
+import hashlib
+import os
+from collections import namedtuple
+import numpy as np
+from . import batch_des
+from .des import S_BOX
+from .key_expansion import get_key_schedule
+from .key_search import ROUND_KEY_DELTAS
+from .utils import LRUCache
+
+# Difference distribution tables (DDT) and linear approximation tables (LAT)
+# of the DES S-boxes, the starting point of differential and linear cryptanalysis.
+#
+# An S-box maps a 6-bit input x (b1..b6, b1 most significant) to a 4-bit
+# output: the row is b1b6, the column b2b3b4b5.
+#   DDT[s][dx][dy] = #{x : S(x) ^ S(x ^ dx) = dy}
+#   LAT[s][a][b]   = #{x : a.x = b.S(x)} - 32   (a.x: parity of a & x)
+# so DDT rows sum to 64 and a LAT entry of +-n means the approximation holds
+# with probability 1/2 +- n/64 (Matsui's NS(a, b) - 32).
+
+SBOX_INPUTS = 64
+SBOX_OUTPUTS = 16
+
+# Tables of both kinds for one set of S-boxes, as int arrays of shape (8, 64, 16)
+SBoxTables = namedtuple('SBoxTables', ['ddt', 'lat'])
+
+# Computed tables by S-box content hash; a handful of S-box sets at most are in use
+sbox_table_cache = LRUCache(maxsize=int(os.environ.get('DES_ANALYSIS_CACHE_SIZE', 16)))
+
+# Directory where computed tables are stored and reused across processes (unset: memory only)
+TABLE_DIR = os.environ.get('DES_ANALYSIS_CACHE_DIR')
+
+# Parity of every 6-bit value
+_PARITY = np.array([bin(value).count('1') & 1 for value in range(SBOX_INPUTS)], dtype=np.uint8)
+
+def sbox_lookup(s_boxes=S_BOX):
+    """
+    Flatten S-boxes into direct lookup arrays indexed by the 6-bit input.
+
+    Args:
+        s_boxes (list): S-boxes, each 4 rows of 16 values.
+
+    Returns:
+        np.ndarray: uint8 array of shape (len(s_boxes), 64).
+    """
+    x = np.arange(SBOX_INPUTS)
+    rows = ((x >> 4) & 0b10) | (x & 1)
+    columns = (x >> 1) & 0xF
+    return np.array(s_boxes, dtype=np.uint8)[:, rows, columns]
+
+def difference_distribution_tables(lookup):
+    """
+    Compute the DDT of every S-box in one vectorized pass.
+
+    Args:
+        lookup (np.ndarray): Output of `sbox_lookup`.
+
+    Returns:
+        np.ndarray: int64 array of shape (boxes, 64, 16).
+    """
+    boxes = len(lookup)
+    x = np.arange(SBOX_INPUTS)
+    # Output difference for every (box, dx, x)
+    dy = lookup[:, x[None, :]] ^ lookup[:, x[None, :] ^ x[:, None]]
+    cells = (np.arange(boxes)[:, None, None] * SBOX_INPUTS + x[None, :, None]) * SBOX_OUTPUTS + dy
+    return np.bincount(cells.ravel(), minlength=boxes * SBOX_INPUTS * SBOX_OUTPUTS).reshape(
+        boxes, SBOX_INPUTS, SBOX_OUTPUTS)
+
+def linear_approximation_tables(lookup):
+    """
+    Compute the LAT of every S-box in one vectorized pass.
+
+    Args:
+        lookup (np.ndarray): Output of `sbox_lookup`.
+
+    Returns:
+        np.ndarray: int64 array of shape (boxes, 64, 16).
+    """
+    x = np.arange(SBOX_INPUTS)
+    # Parity of a & x for every (a, x), and of b & S(x) for every (box, b, x)
+    input_parity = _PARITY[x[:, None] & x[None, :]]
+    output_parity = _PARITY[np.arange(SBOX_OUTPUTS)[None, :, None] & lookup[:, None, :]]
+    agree = input_parity[None, :, None, :] == output_parity[:, None, :, :]
+    return agree.sum(axis=-1, dtype=np.int64) - SBOX_INPUTS // 2
+
+def sbox_digest(s_boxes=S_BOX):
+    """
+    Content hash identifying a set of S-boxes.
+
+    Returns:
+        str: Hexadecimal SHA-256 of the S-box values.
+    """
+    return hashlib.sha256(sbox_lookup(s_boxes).tobytes()).hexdigest()
+
+def _table_path(directory, digest):
+    return os.path.join(directory, f'sbox-tables-{digest[:16]}.npz')
+
+def _compute_tables(s_boxes, directory):
+    """
+    Load the tables of a set of S-boxes from `directory`, or compute (and store) them.
+    """
+    lookup = sbox_lookup(s_boxes)
+    path = _table_path(directory, sbox_digest(s_boxes)) if directory else None
+    if path and os.path.exists(path):
+        with np.load(path) as stored:
+            if np.array_equal(stored['lookup'], lookup):
+                return SBoxTables(stored['ddt'], stored['lat'])
+    tables = SBoxTables(difference_distribution_tables(lookup), linear_approximation_tables(lookup))
+    if path:
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename, so concurrent processes never read a partial file
+        temporary = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(temporary, lookup=lookup, ddt=tables.ddt, lat=tables.lat)
+        os.replace(temporary, path)
+    return tables
+
+def get_sbox_tables(s_boxes=S_BOX, directory=TABLE_DIR):
+    """
+    Return the DDT and LAT of a set of S-boxes, computing them at most once per process.
+
+    Tables are cached in memory by S-box content and, when `directory` is
+    set (DES_ANALYSIS_CACHE_DIR), stored there for later processes.
+
+    Args:
+        s_boxes (list): S-boxes, each 4 rows of 16 values (default: the DES S-boxes).
+        directory (str): Directory for persisted tables, or None.
+
+    Returns:
+        SBoxTables: Read-only int arrays of shape (boxes, 64, 16).
+    """
+    def compute(_):
+        tables = _compute_tables(s_boxes, directory)
+        for table in tables:
+            table.flags.writeable = False
+        return tables
+    return sbox_table_cache.get(sbox_digest(s_boxes), compute)
+
+def table_summary(tables):
+    """
+    Strongest differential and linear approximation of each S-box.
+
+    Args:
+        tables (SBoxTables): Output of `get_sbox_tables`.
+
+    Returns:
+        list: One dict per S-box with the largest DDT entry for a non-zero input
+            difference and the largest |LAT| entry for a non-zero output mask.
+    """
+    summary = []
+    for i, (ddt, lat) in enumerate(zip(tables.ddt, tables.lat)):
+        dx, dy = np.unravel_index(np.argmax(ddt[1:]), ddt[1:].shape)
+        a, b = np.unravel_index(np.argmax(np.abs(lat[:, 1:])), lat[:, 1:].shape)
+        bias = int(lat[a, b + 1])
+        summary.append({
+            'sbox': f'S{i + 1}',
+            'best_differential': {'input_difference': int(dx) + 1, 'output_difference': int(dy),
+                                  'count': int(ddt[dx + 1, dy]),
+                                  'probability': int(ddt[dx + 1, dy]) / SBOX_INPUTS},
+            'best_approximation': {'input_mask': int(a), 'output_mask': int(b) + 1, 'value': bias,
+                                   'bias': bias / SBOX_INPUTS}
+        })
+    return summary
+
+# Avalanche analysis: how many bits of the round state change when a single
+# plaintext or key bit is flipped. All flips of an input run through the
+# batch round-state engine together, so no per-round trace is ever built.
+# Bits are numbered 1 to 64 from the most significant, as in the DES tables.
+
+BLOCK_BITS = 64
+
+# Mask of every bit of a block, bit 1 (most significant) first
+FLIP_MASKS = np.uint64(1) << np.arange(BLOCK_BITS - 1, -1, -1, dtype=np.uint64)
+
+# Round key deltas of every key bit, shape (16, 64), bit 1 first
+KEY_FLIP_DELTAS = np.array([ROUND_KEY_DELTAS[BLOCK_BITS - 1 - i] for i in range(BLOCK_BITS)], dtype=np.uint64).T
+
+# Key bits other than the parity bits 8, 16, ..., 64 (as indexes from bit 1)
+KEY_EFFECTIVE_BITS = [i for i in range(BLOCK_BITS) if (i + 1) % 8]
+
+# Random inputs encrypted per batch by `strict_avalanche` (each batch runs 64 flips of each)
+SAC_BATCH = 512
+
+def popcount(values):
+    """
+    Number of set bits of every element of a uint64 array.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    return np.unpackbits(values.view(np.uint8).reshape(values.shape + (8,)), axis=-1).sum(axis=-1)
+
+def _state_distances(left, right):
+    """
+    Hamming distance of every column's L/R state to column 0, per round.
+
+    Args:
+        left, right (np.ndarray): Output of `batch_des.crypt_states`, shape (rounds + 1, n).
+
+    Returns:
+        np.ndarray: Distances of shape (rounds, n - 1), rounds 1 to 16.
+    """
+    left = left[1:] ^ left[1:, :1]
+    right = right[1:] ^ right[1:, :1]
+    return popcount((left << np.uint64(32)) | right)[:, 1:]
+
+def avalanche(plaintext, key):
+    """
+    Hamming distance of the round state after each round when each plaintext
+    bit, and each key bit, is flipped.
+
+    The distance after round 16 is also the ciphertext distance, the Final
+    Permutation only moves bits around.
+
+    Args:
+        plaintext (int): The 64-bit plaintext.
+        key (int): The 64-bit key.
+
+    Returns:
+        dict: 'plaintext' and 'key': 64 lists (one per flipped bit) of 16 distances;
+            'plaintext_mean' and 'key_mean': the mean distance after each round
+            (key parity bits excluded).
+    """
+    schedule = np.array(get_key_schedule(key).forward, dtype=np.uint64)[:, None]
+    blocks = np.concatenate([np.array([plaintext], dtype=np.uint64), np.uint64(plaintext) ^ FLIP_MASKS,
+                             np.full(BLOCK_BITS, plaintext, dtype=np.uint64)])
+    # Column 0 is the reference, then the 64 plaintext flips, then the 64 key flips
+    schedules = np.concatenate([np.repeat(schedule, BLOCK_BITS + 1, axis=1), schedule ^ KEY_FLIP_DELTAS], axis=1)
+    distances = _state_distances(*batch_des.crypt_states(blocks, schedules))
+    plaintext_flips = distances[:, :BLOCK_BITS]
+    key_flips = distances[:, BLOCK_BITS:]
+    return {
+        'plaintext': plaintext_flips.T.tolist(),
+        'key': key_flips.T.tolist(),
+        'plaintext_mean': plaintext_flips.mean(axis=1).tolist(),
+        # Parity bits of the key never affect the output; leave them out of the mean
+        'key_mean': key_flips[:, KEY_EFFECTIVE_BITS].mean(axis=1).tolist()
+    }
+
+def _flip_statistics(blocks, schedules):
+    """
+    Encrypt every input and its 64 single-bit variants.
+
+    Args:
+        blocks (np.ndarray): uint64 array of shape (65, n): references first, then one row per flip.
+        schedules (np.ndarray): Round keys of shape (16, 65, n).
+
+    Returns:
+        tuple: (per-round distance sums of each flip, shape (16, 64); ciphertext bit flip
+            counts, shape (64, 64))
+    """
+    rows, n = blocks.shape
+    left, right = batch_des.crypt_states(blocks.ravel(), schedules.reshape(len(schedules), rows * n))
+    left = left[1:].reshape(-1, rows, n)
+    right = right[1:].reshape(-1, rows, n)
+    left = left[:, 1:] ^ left[:, :1]
+    right = right[:, 1:] ^ right[:, :1]
+    round_sums = popcount((left << np.uint64(32)) | right).sum(axis=2, dtype=np.int64)
+    # Ciphertext differences: Final Permutation of R16 + L16
+    ciphertexts = batch_des.permute_array((right[-1] << np.uint64(32)) | left[-1], batch_des.FP_LOOKUP)
+    bits = np.unpackbits(ciphertexts.astype('>u8').view(np.uint8).reshape(BLOCK_BITS, n, 8), axis=-1)
+    return round_sums, bits.sum(axis=1, dtype=np.int64)
+
+def strict_avalanche(samples=1000, seed=None, matrix=False):
+    """
+    Strict avalanche criterion statistics over random plaintexts and keys.
+
+    For every input bit i and ciphertext bit j, estimates the probability that
+    bit j changes when bit i is flipped; an ideal cipher gives 0.5 everywhere.
+
+    Args:
+        samples (int): Number of random (plaintext, key) inputs.
+        seed (int): Seed for reproducible samples.
+        matrix (bool): Include the full 64 x 64 probability matrices.
+
+    Returns:
+        dict: For 'plaintext' and 'key' flips: 'mean' and 'max_deviation' of the
+            probabilities (key parity bits excluded), 'round_mean_distance' (mean
+            state distance after each round) and, with `matrix`, 'matrix' indexed
+            [input bit][output bit].
+
+    Raises:
+        ValueError: If the number of samples is not positive.
+    """
+    if samples < 1:
+        raise ValueError("The number of samples must be at least 1.")
+    rng = np.random.default_rng(seed)
+    totals = {name: [np.zeros((16, BLOCK_BITS), dtype=np.int64), np.zeros((BLOCK_BITS, BLOCK_BITS), dtype=np.int64)]
+              for name in ('plaintext', 'key')}
+    for first in range(0, samples, SAC_BATCH):
+        n = min(SAC_BATCH, samples - first)
+        plaintexts = rng.integers(0, 1 << 64, n, dtype=np.uint64, endpoint=False)
+        keys = rng.integers(0, 1 << 64, n, dtype=np.uint64, endpoint=False)
+        schedules = batch_des.key_schedules(keys)
+        flipped = np.concatenate([plaintexts[None, :], plaintexts[None, :] ^ FLIP_MASKS[:, None]])
+        same_keys = np.broadcast_to(schedules[:, None, :], (len(schedules), BLOCK_BITS + 1, n))
+        key_flips = np.concatenate([schedules[:, None, :], schedules[:, None, :] ^ KEY_FLIP_DELTAS[:, :, None]], axis=1)
+        unchanged = np.broadcast_to(plaintexts, (BLOCK_BITS + 1, n))
+        for name, blocks, round_keys in (('plaintext', flipped, same_keys), ('key', unchanged, key_flips)):
+            round_sums, flips = _flip_statistics(np.ascontiguousarray(blocks), np.ascontiguousarray(round_keys))
+            totals[name][0] += round_sums
+            totals[name][1] += flips
+
+    report = {'samples': samples}
+    for name, (round_sums, flips) in totals.items():
+        probabilities = flips / samples
+        # Parity bits of the key never affect the output; leave them out of the statistics
+        bits = KEY_EFFECTIVE_BITS if name == 'key' else list(range(BLOCK_BITS))
+        effective = probabilities[bits]
+        report[name] = {
+            'mean': float(effective.mean()),
+            'max_deviation': float(np.abs(effective - 0.5).max()),
+            'round_mean_distance': (round_sums[:, bits].sum(axis=1) / (samples * len(bits))).tolist()
+        }
+        if matrix:
+            report[name]['matrix'] = probabilities.tolist()
+    return report
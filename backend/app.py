@@ -1,17 +1,35 @@
 # backend/app.py
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context, make_response
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_sqlalchemy import SQLAlchemy  # Import SQLAlchemy
 from flask_migrate import Migrate  # Import Migrate
-from .des import des_encrypt, des_decrypt
-from .key_expansion import generate_keys
-from .utils import hex_to_bin, bin_to_hex, ascii_to_hex, is_valid_hex, is_valid_binary
+from .des import (des_encrypt, des_decrypt, pack_round_details, RoundTrace, TRACE_NONE, TRACE_SUMMARY, TRACE_FULL, TRACE_LEVELS,
+                  TRACE_FORMATS, TRACE_FORMAT_BITS, TRACE_FORMAT_HEX, TRACE_FORMAT_PACKED)
+from .key_expansion import generate_keys, key_schedule_cache
+from . import modes
+from .variants import get_variant, variant_cache
+from .utils import LRUCache
+
+try:
+    from . import analysis, differential, linear
+except ImportError:  # NumPy is optional
+    analysis = differential = linear = None
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+from .conversions import (hex_to_bits, bits_to_hex, bits_to_binary, binary_to_bits, bytes_to_bits, bits_to_bytes,
+                          hex_to_bytes, bytes_to_hex, hex_to_binary, binary_to_bytes, bytes_to_base64,
+                          text_to_bytes, is_hex, is_binary, decode_input, decode_stream, StreamDecoder,
+                          INPUT_FORMATS)
 import time
 import random
+import gzip
+from functools import wraps
 from io import BytesIO
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -20,9 +38,9 @@ from reportlab.lib import colors
 from reportlab.lib.units import inch
 import magic  # For MIME type detection
 import logging
-import base64  # Import base64 for encoding
 from datetime import datetime
 import os  # For environment variables
+import uuid
 # from openai import OpenAI  # Uncomment if using OpenAI
 from reportlab.lib.enums import TA_CENTER
 import json  # For JSON serialization
@@ -46,7 +64,7 @@ limiter.init_app(app)
 # Database configuration
 basedir = os.path.abspath(os.path.dirname(__file__))
 db_path = os.path.join(basedir, 'history.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + db_path
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DES_DATABASE_URL', 'sqlite:///' + db_path)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Initialize SQLAlchemy and Flask-Migrate
@@ -55,33 +73,105 @@ migrate = Migrate(app, db)
 
 # Constants
 ALLOWED_EXTENSIONS = {'txt'}
+ALGORITHMS = ('des', '3des')
+
+# Bytes read from an uploaded file (or a streamed request body) per decoding step
+FILE_CHUNK_SIZE = 64 * 1024
 
 # Set maximum allowed payload to 1MB (adjust as needed)
 app.config['MAX_CONTENT_LENGTH'] = 1 * 1024 * 1024  # 1 MB
 
+# Responses smaller than this (in bytes) are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def response_encoding():
+    """
+    Pick the content encoding for the current request from its Accept-Encoding header.
+
+    Returns:
+        str: 'br' (if the brotli module is installed), 'gzip', or None.
+    """
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+def compressed(view):
+    """
+    Compress a view's JSON response with brotli or gzip when the client accepts it.
+
+    Small, streamed and already encoded responses are sent unchanged.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        response.vary.add('Accept-Encoding')
+        encoding = response_encoding()
+        if (encoding is None or response.direct_passthrough or response.is_streamed or
+                'Content-Encoding' in response.headers or not response.is_json):
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+        else:
+            response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+        response.headers['Content-Encoding'] = encoding
+        return response
+    return wrapper
+
+# Upload limit of /encrypt_stream and /files, which never hold the body in memory
+STREAM_MAX_CONTENT_LENGTH = int(os.environ.get('DES_STREAM_MAX_BYTES', 10 * 1024 ** 3))  # 10 GB
+
+# Directory of the CTR-encrypted files uploaded to /files
+STORAGE_DIR = os.environ.get('DES_STORAGE_DIR', os.path.join(basedir, 'encrypted_files'))
+
+# Full round traces recomputed for GET /trace/<trace_id>, by trace id; only the
+# traces open in a round viewer are in use at a time
+trace_cache = LRUCache(maxsize=int(os.environ.get('DES_TRACE_CACHE_SIZE', 64)))
+
 # Define the History model
 class History(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     operation = db.Column(db.String(20), nullable=False)  # 'encrypt', 'decrypt', 'generate_key'
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    key_hex = db.Column(db.String(16), nullable=True)
-    key_binary = db.Column(db.String(64), nullable=True)
-    key_base64 = db.Column(db.String(24), nullable=True)
+    key_hex = db.Column(db.String(48), nullable=True)  # Up to three DES keys for Triple-DES
+    key_binary = db.Column(db.String(192), nullable=True)
+    key_base64 = db.Column(db.String(32), nullable=True)
     
     # New fields for Input
     input_data = db.Column(db.Text, nullable=True)
     input_format = db.Column(db.String(10), nullable=True)  # 'hex', 'text', 'binary', 'file'
-    input_hex = db.Column(db.String(64), nullable=True)
+    input_hex = db.Column(db.Text, nullable=True)  # Any number of blocks with a mode of operation
     input_text = db.Column(db.Text, nullable=True)
     
     # New fields for Output
     output_data = db.Column(db.Text, nullable=True)
     output_format = db.Column(db.String(10), nullable=True)  # 'hex', 'text', 'binary', 'file'
-    output_hex = db.Column(db.String(64), nullable=True)
+    output_hex = db.Column(db.Text, nullable=True)
     output_text = db.Column(db.Text, nullable=True)
     
     time_taken = db.Column(db.Float, nullable=True)  # in milliseconds
     round_details = db.Column(db.Text, nullable=True)  # JSON serialized
+    trace_id = db.Column(db.String(32), unique=True, index=True, nullable=True)  # For GET /trace/<trace_id>
+
+    def round_details_bits(self):
+        """
+        The stored round details as bit lists, whatever format the row was saved in.
+
+        Rows are saved as `RoundTrace.to_hex` dicts; older rows hold the bit lists
+        themselves. Both are served in the older format, which the history view reads.
+        """
+        if not self.round_details:
+            return []
+        return [RoundTrace.from_hex(round_info).to_dict() if isinstance(round_info.get('left_before'), str)
+                else round_info
+                for round_info in json.loads(self.round_details)]
 
     def to_dict(self):
         return {
@@ -100,7 +190,8 @@ class History(db.Model):
             'output_hex': self.output_hex,
             'output_text': self.output_text,
             'time_taken': self.time_taken,
-            'round_details': json.loads(self.round_details) if self.round_details else []
+            'round_details': self.round_details_bits(),
+            'trace_id': self.trace_id
         }
 
 # Initialize the database (only needed once)
@@ -112,7 +203,7 @@ class History(db.Model):
 def save_history(operation, key_hex=None, key_binary=None, key_base64=None,
                 input_data=None, input_format=None, input_hex=None, input_text=None,
                 output_data=None, output_format=None, output_hex=None, output_text=None,
-                time_taken=None, round_details=None):
+                time_taken=None, round_details=None, trace_id=None):
     history_entry = History(
         operation=operation,
         key_hex=key_hex,
@@ -127,7 +218,9 @@ def save_history(operation, key_hex=None, key_binary=None, key_base64=None,
         output_hex=output_hex,
         output_text=output_text,
         time_taken=time_taken,
-        round_details=json.dumps(round_details) if round_details else None
+        # Stored packed: one hexadecimal string per field instead of lists of bits
+        round_details=json.dumps([round_trace.to_hex() for round_trace in round_details]) if round_details else None,
+        trace_id=trace_id
     )
     db.session.add(history_entry)
     db.session.commit()
@@ -138,23 +231,35 @@ def allowed_file(file_stream, filename):
     """
     if '.' in filename and \
        filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS:
-        # Check MIME type using magic
-        try:
-            mime = magic.from_buffer(file_stream.read(1024), mime=True)
-            file_stream.seek(0)  # Reset stream position
-            return mime == 'text/plain'
-        except Exception as e:
-            logger.error(f"MIME type detection failed: {str(e)}")
-            return False
+        sample = file_stream.read(1024)
+        file_stream.seek(0)  # Reset stream position
+        return is_plain_text(sample)
     return False
 
+def is_plain_text(sample):
+    """
+    Check the MIME type of the start of an upload.
+
+    Args:
+        sample (bytes): The first bytes of the upload.
+
+    Returns:
+        bool: True if the content is detected as text/plain.
+    """
+    # Check MIME type using magic
+    try:
+        return magic.from_buffer(sample[:1024], mime=True) == 'text/plain'
+    except Exception as e:
+        logger.error(f"MIME type detection failed: {str(e)}")
+        return False
+
 def convert_input(data, input_format):
     """
     Convert input data based on the specified format to binary.
 
     Args:
         data (str): The input data as a string.
-        input_format (str): The format of the input data ('hex', 'text', 'binary').
+        input_format (str): The format of the input data ('hex', 'text', 'binary', 'base64').
 
     Returns:
         list: A list of bits representing the binary data.
@@ -163,43 +268,266 @@ def convert_input(data, input_format):
         ValueError: If the input data is invalid or not in the expected format.
     """
     if input_format == 'hex':
-        if not is_valid_hex(data):
-            raise ValueError("Invalid hexadecimal input.")
-        return hex_to_bin(data)
+        return hex_to_bits(data)
     elif input_format == 'text':
         # Ensure text is ASCII
-        try:
-            data.encode('ascii')
-        except UnicodeEncodeError:
-            raise ValueError("Text contains non-ASCII characters.")
-        hex_data = ascii_to_hex(data)
-        return hex_to_bin(hex_data)
+        return bytes_to_bits(text_to_bytes(data))
     elif input_format == 'binary':
-        if not is_valid_binary(data):
+        if not is_binary(data):
             raise ValueError("Invalid binary input.")
         if len(data) != 64:
             raise ValueError("Binary input must be exactly 64 bits.")
-        return [int(bit) for bit in data]
+        return binary_to_bits(data)
+    elif input_format == 'base64':
+        return bytes_to_bits(decode_input(data, 'base64'))
     else:
         raise ValueError("Unsupported input format.")
 
+def convert_input_bytes(data, input_format):
+    """
+    Convert input data of any length to bytes for the modes of operation.
+
+    Args:
+        data (str): The input data as a string.
+        input_format (str): The format of the input data ('hex', 'text', 'binary', 'base64').
+
+    Returns:
+        bytes: The decoded input.
+
+    Raises:
+        ValueError: If the input data is invalid or not in the expected format.
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError("Unsupported input format.")
+    return decode_input(data, input_format)
+
+def read_file_input(file, file_format):
+    """
+    Decode an uploaded file chunk by chunk, validating as it is read.
+
+    Args:
+        file: The uploaded file (werkzeug FileStorage).
+        file_format (str): Format of the file contents (one of INPUT_FORMATS).
+
+    Returns:
+        bytes: The decoded contents.
+
+    Raises:
+        ValueError: If the format is unsupported or the contents are invalid.
+    """
+    if file_format not in INPUT_FORMATS:
+        raise ValueError(f"File format must be one of: {', '.join(INPUT_FORMATS)}.")
+    chunks = iter(lambda: file.stream.read(FILE_CHUNK_SIZE), b'')
+    return b''.join(decode_stream(chunks, file_format))
+
+def validate_key(key_hex, algorithm):
+    """
+    Validate a hexadecimal key for the requested algorithm.
+
+    Args:
+        key_hex (str): The key as a hexadecimal string.
+        algorithm (str): One of ALGORITHMS.
+
+    Raises:
+        ValueError: If the algorithm is unsupported or the key has the wrong length or format.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algorithm must be one of: {', '.join(ALGORITHMS)}.")
+    if algorithm == 'des':
+        if not key_hex or len(key_hex) != 16 or not is_hex(key_hex):
+            raise ValueError('Key must be exactly 16 hexadecimal characters.')
+    elif not key_hex or len(key_hex) not in (16, 32, 48) or not is_hex(key_hex):
+        raise ValueError('Triple-DES key must be 16, 32 or 48 hexadecimal characters.')
+
+def parse_mode(form, default_mode=None):
+    """
+    Read the optional mode of operation and IV from the form data.
+
+    Args:
+        form: The request form.
+        default_mode (str): Mode used when none is given (None for single-block DES).
+
+    Returns:
+        tuple: (mode name or None for single-block DES, IV bytes or None)
+
+    Raises:
+        ValueError: If the mode or IV is invalid.
+    """
+    mode = form.get('mode', '').strip().upper() or default_mode
+    iv_hex = form.get('iv', '').strip()
+    if not mode:
+        if iv_hex:
+            raise ValueError("An IV can only be used together with a mode of operation.")
+        return None, None
+    if mode not in modes.MODES:
+        raise ValueError(f"Mode must be one of: {', '.join(modes.MODES)}.")
+    if not iv_hex:
+        return mode, None
+    if len(iv_hex) != 16 or not is_hex(iv_hex):
+        raise ValueError("IV must be exactly 16 hexadecimal characters.")
+    return mode, hex_to_bytes(iv_hex)
+
+def parse_trace_level(form):
+    """
+    Read the requested round-detail level from the form data.
+
+    Args:
+        form: The request form.
+
+    Returns:
+        str: One of TRACE_LEVELS ('full' when not specified).
+
+    Raises:
+        ValueError: If the trace level is not supported.
+    """
+    trace = form.get('trace', TRACE_FULL).strip().lower()
+    if trace not in TRACE_LEVELS:
+        raise ValueError(f"Trace must be one of: {', '.join(TRACE_LEVELS)}.")
+    return trace
+
+def parse_trace_format(form):
+    """
+    Read the wire format of the round details from a request form.
+
+    Args:
+        form: The request form.
+
+    Returns:
+        str: One of TRACE_FORMATS ('bits' when not specified).
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    trace_format = form.get('trace_format', TRACE_FORMAT_BITS).strip().lower()
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"Trace format must be one of: {', '.join(TRACE_FORMATS)}.")
+    return trace_format
+
+def format_round_details(round_details, trace_format=TRACE_FORMAT_BITS):
+    """
+    Prepare round details for the frontend.
+
+    In the 'bits' format the raw S-box output is left out; the frontend rebuilds
+    it from 'sbox_details'. The 'hex' and 'packed' formats carry the S-box output
+    and leave the S-box breakdown to the client.
+
+    Args:
+        round_details (list): RoundTrace objects as returned by des_encrypt/des_decrypt.
+        trace_format (str): One of TRACE_FORMATS.
+
+    Returns:
+        list or dict: Round details ready for JSON serialization (a dict for 'packed',
+            see `des.pack_round_details`).
+    """
+    if trace_format == TRACE_FORMAT_HEX:
+        return [round_trace.to_hex() for round_trace in round_details]
+    if trace_format == TRACE_FORMAT_PACKED:
+        return pack_round_details(round_details)
+    return [
+        {field: value for field, value in round_trace.to_dict().items() if field != 'sbox_output'}
+        for round_trace in round_details
+    ]
+
+def process_mode_request(operation, algorithm, mode, iv, key_hex, key_bin, data,
+                         input_data, input_format, input_hex, input_text):
+    """
+    Encrypt or decrypt data of any length in a mode of operation and build the response.
+
+    Round details are not collected for multi-block operations.
+
+    Args:
+        operation (str): 'encrypt' or 'decrypt'.
+        algorithm (str): One of ALGORITHMS.
+        mode (str): One of modes.MODES.
+        iv (bytes): IV from the request, or None.
+        key_hex (str): The key (16 hexadecimal characters, or 32/48 for Triple-DES).
+        key_bin (list): The key as a list of bits.
+        data (bytes): The decoded input.
+        input_data, input_format, input_hex, input_text: Input fields saved in the history.
+
+    Returns:
+        tuple: JSON response and HTTP status code.
+    """
+    key = hex_to_bytes(key_hex)
+    if operation == 'encrypt' and iv is None and mode != 'ECB':
+        iv = modes.generate_iv()
+
+    try:
+        start_time = time.time()
+        if operation == 'encrypt':
+            output = modes.encrypt(data, key, mode, iv)
+        else:
+            output = modes.decrypt(data, key, mode, iv)
+        end_time = time.time()
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+    except Exception as e:
+        logger.error(f"{operation.capitalize()}ion failed: {str(e)}")
+        return jsonify({'success': False, 'message': f'{operation.capitalize()}ion failed: {str(e)}'}), 500
+
+    output_hex = bytes_to_hex(output)
+    output_text = output.decode('utf-8', errors='ignore') if operation == 'decrypt' else 'N/A'
+    elapsed_time = float((end_time - start_time) * 1_000)  # Convert to milliseconds
+
+    save_history(
+        operation=operation,
+        key_hex=key_hex,
+        key_binary=bits_to_binary(key_bin),
+        key_base64=bytes_to_base64(key),
+        input_data=input_data,
+        input_format=input_format,
+        input_hex=input_hex,
+        input_text=input_text,
+        output_data=output_hex if operation == 'encrypt' else output_text,
+        output_format='hex' if operation == 'encrypt' else 'text',
+        output_hex=output_hex,
+        output_text=output_text,
+        time_taken=elapsed_time
+    )
+
+    response = {
+        'success': True,
+        'algorithm': algorithm,
+        'mode': mode,
+        'iv': bytes_to_hex(iv) if iv else None,
+        'round_details': [],
+        'time_taken': elapsed_time
+    }
+    if operation == 'encrypt':
+        response['ciphertext'] = output_hex
+    else:
+        response['decrypted_hex'] = output_hex
+        response['decrypted_text'] = output_text
+    return jsonify(response), 200
+
 @app.errorhandler(413)
 def request_entity_too_large(error):
     return jsonify({'success': False, 'message': 'File is too large. Maximum allowed size is 1MB.'}), 413
 
 @app.route('/encrypt', methods=['POST'])
 @limiter.limit("10 per minute")  # Example: 10 requests per minute
+@compressed
 def encrypt():
     """
     Encrypt a message using DES.
 
     Expects multipart/form-data with:
-    - 'key': string (hexadecimal, 16 characters)
-    - 'input_format': string ('hex', 'text', 'binary', 'file')
+    - 'key': string (hexadecimal, 16 characters; 32 or 48 for Triple-DES)
+    - 'algorithm': string ('des', '3des'; optional, defaults to 'des')
+    - 'input_format': string ('hex', 'text', 'binary', 'base64', 'file')
     - 'message': string or file, depending on 'input_format'
+    - 'file_format': string ('hex', 'text', 'binary', 'base64'; optional, defaults to 'hex'):
+      the format of the contents of an uploaded file
+    - 'trace': string ('none', 'summary', 'full'; optional, defaults to 'full')
+    - 'trace_format': string ('bits', 'hex', 'packed'; optional, defaults to 'bits'):
+      how the round details are encoded
+    - 'mode': string ('ECB', 'CBC', 'CFB', 'OFB', 'CTR'; optional). Without a mode
+      the message must be exactly one 64-bit block; with a mode it can be any length.
+    - 'iv': string (hexadecimal, 16 characters; optional, generated for non-ECB modes)
 
     Returns:
-        JSON response with ciphertext, round details, time taken, and success status.
+        JSON response with ciphertext, round details, trace id, time taken, and success status.
+        The trace id gives the round details later through GET /trace/<trace_id>.
     """ 
 
     if 'input_format' not in request.form:     
@@ -208,15 +536,29 @@ def encrypt():
     input_format = request.form['input_format'].lower()
 
     # Retrieve and validate key
+    algorithm = request.form.get('algorithm', 'des').strip().lower()
     key_hex = request.form.get('key', '').strip()
-    if not key_hex or len(key_hex) != 16 or not is_valid_hex(key_hex):
-        return jsonify({'success': False, 'message': 'Key must be exactly 16 hexadecimal characters.'}), 400
+    try:
+        validate_key(key_hex, algorithm)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
 
     try:
-        key_bin = hex_to_bin(key_hex)
+        key_bin = hex_to_bits(key_hex)
     except ValueError:
         return jsonify({'success': False, 'message': 'Invalid hexadecimal key.'}), 400
 
+    try:
+        trace = parse_trace_level(request.form)
+        trace_format = parse_trace_format(request.form)
+        mode, iv = parse_mode(request.form)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+
+    # Triple-DES always runs through the modes layer (ECB unless a mode is given)
+    if algorithm == '3des' and not mode:
+        mode = 'ECB'
+
     # Initialize input variables
     input_data = ''
     input_hex = 'N/A'
@@ -234,26 +576,16 @@ def encrypt():
             filename = secure_filename(file.filename)
             logger.info(f"File uploaded: {filename} from {request.remote_addr}")
 
-            # Process the file (in-memory)
-            try:
-                content = file.read().decode('utf-8').strip()
-            except UnicodeDecodeError:
-                return jsonify({'success': False, 'message': 'File contains invalid UTF-8 characters.'}), 400
-
-            # Ensure content is valid ASCII
+            # Validate and decode the file in a single pass over its chunks
             try:
-                content.encode('ascii')
-            except UnicodeEncodeError:
-                return jsonify({'success': False, 'message': 'File contains non-ASCII characters.'}), 400
-
-            # Directly convert hex to binary without re-conversion
-            try:
-                message_bin = hex_to_bin(content)
-            except Exception as e:
-                return jsonify({'success': False, 'message': f'Failed to convert hex to binary: {str(e)}'}), 400
-
-            input_data = content  # Store hex content as input_data
-            input_hex = content
+                message_bytes = read_file_input(file, request.form.get('file_format', 'hex').strip().lower())
+            except ValueError as ve:
+                return jsonify({'success': False, 'message': f'Invalid file contents: {str(ve)}'}), 400
+            if not mode:
+                message_bin = bytes_to_bits(message_bytes)
+
+            input_hex = bytes_to_hex(message_bytes)
+            input_data = input_hex  # Store the decoded content as hex
             input_text = 'N/A'
         else:
             return jsonify({'success': False, 'message': 'Invalid file type. Only .txt files are allowed.'}), 400
@@ -262,16 +594,19 @@ def encrypt():
         if not message:
             return jsonify({'success': False, 'message': 'Message is required.'}), 400
         try:
-            message_bin = convert_input(message, input_format)
+            if mode:
+                message_bytes = convert_input_bytes(message, input_format)
+            else:
+                message_bin = convert_input(message, input_format)
             input_data = message
             if input_format == 'hex':
                 input_hex = message
                 input_text = 'N/A'
             elif input_format == 'text':
-                input_hex = ascii_to_hex(message)
+                input_hex = bytes_to_hex(text_to_bytes(message))
                 input_text = message
-            elif input_format == 'binary':
-                input_hex = bin_to_hex(message_bin)
+            elif input_format in ('binary', 'base64'):
+                input_hex = bytes_to_hex(message_bytes) if mode else bits_to_hex(message_bin)
                 input_text = 'N/A'
             else:
                 input_hex = 'N/A'
@@ -279,6 +614,10 @@ def encrypt():
         except ValueError as ve:
             return jsonify({'success': False, 'message': str(ve)}), 400
 
+    if mode:
+        return process_mode_request('encrypt', algorithm, mode, iv, key_hex, key_bin, message_bytes,
+                                    input_data, input_format, input_hex, input_text)
+
     # Ensure message is 64 bits (16 hex characters)
     if len(message_bin) != 64:
         return jsonify({'success': False, 'message': 'Message must be exactly 64 bits (16 hexadecimal characters).' }), 400
@@ -286,21 +625,26 @@ def encrypt():
     # Perform encryption
     try:
         start_time = time.time()
-        ciphertext_bin, round_details = des_encrypt(message_bin, key_bin)
+        if trace == TRACE_NONE:
+            ciphertext_bin = des_encrypt(message_bin, key_bin, trace=TRACE_NONE)
+            round_details = []
+        else:
+            ciphertext_bin, round_details = des_encrypt(message_bin, key_bin, trace=trace)
         end_time = time.time()
     except Exception as e:
         logger.error(f"Encryption failed: {str(e)}")
         return jsonify({'success': False, 'message': f'Encryption failed: {str(e)}'}), 500
 
-    ciphertext_hex = bin_to_hex(ciphertext_bin)
+    ciphertext_hex = bits_to_hex(ciphertext_bin)
     elapsed_time = float((end_time - start_time) * 1_000)  # Convert to milliseconds
+    trace_id = uuid.uuid4().hex
 
     # Save history with new fields
     save_history(
         operation='encrypt',
         key_hex=key_hex,
-        key_binary=''.join(str(bit) for bit in key_bin),
-        key_base64=base64.b64encode(bytes.fromhex(key_hex)).decode('utf-8'),
+        key_binary=bits_to_binary(key_bin),
+        key_base64=bytes_to_base64(hex_to_bytes(key_hex)),
         input_data=input_data,
         input_format=input_format,
         input_hex=input_hex,
@@ -310,29 +654,20 @@ def encrypt():
         output_hex=ciphertext_hex,
         output_text='N/A',  # Encrypted data is hex, so text is not applicable
         time_taken=elapsed_time,
-        round_details=round_details
+        round_details=round_details,
+        trace_id=trace_id
     )
 
     # Prepare detailed round details for frontend
-    detailed_rounds = []
-    for round_info in round_details:
-        detailed_rounds.append({
-            'round': round_info['round'],
-            'subkey': round_info['subkey'],
-            'left_before': round_info['left_before'],
-            'right_before': round_info['right_before'],
-            'expanded_right': round_info['expanded_right'],
-            'xor_with_subkey': round_info['xor_with_subkey'],
-            'sbox_details': round_info['sbox_details'],
-            'permutation_output': round_info['permutation_output'],
-            'left_after': round_info['left_after'],
-            'right_after': round_info['right_after']
-        })
+    detailed_rounds = format_round_details(round_details, trace_format)
 
     response = {
         'success': True,
         'ciphertext': ciphertext_hex,
         'round_details': detailed_rounds,  # Updated to include detailed information
+        'trace': trace,
+        'trace_format': trace_format,
+        'trace_id': trace_id,
         'time_taken': elapsed_time
     }
     return jsonify(response), 200
@@ -340,17 +675,28 @@ def encrypt():
 
 @app.route('/decrypt', methods=['POST'])
 @limiter.limit("10 per minute")  # Example: 10 requests per minute
+@compressed
 def decrypt():
     """
     Decrypt a ciphertext using DES.
 
     Expects multipart/form-data with:
-    - 'key': string (hexadecimal, 16 characters)
-    - 'input_format': string ('hex', 'text', 'binary', 'file')
+    - 'key': string (hexadecimal, 16 characters; 32 or 48 for Triple-DES)
+    - 'algorithm': string ('des', '3des'; optional, defaults to 'des')
+    - 'input_format': string ('hex', 'text', 'binary', 'base64', 'file')
     - 'ciphertext': string or file, depending on 'input_format'
+    - 'file_format': string ('hex', 'text', 'binary', 'base64'; optional, defaults to 'hex'):
+      the format of the contents of an uploaded file
+    - 'trace': string ('none', 'summary', 'full'; optional, defaults to 'full')
+    - 'trace_format': string ('bits', 'hex', 'packed'; optional, defaults to 'bits'):
+      how the round details are encoded
+    - 'mode': string ('ECB', 'CBC', 'CFB', 'OFB', 'CTR'; optional). Without a mode
+      the ciphertext must be exactly one 64-bit block.
+    - 'iv': string (hexadecimal, 16 characters; required for non-ECB modes)
 
     Returns:
-        JSON response with decrypted text, round details, time taken, and success status.
+        JSON response with decrypted text, round details, trace id, time taken, and success status.
+        The trace id gives the round details later through GET /trace/<trace_id>.
     """
     if 'input_format' not in request.form:
         return jsonify({'success': False, 'message': 'Input format is required.'}), 400
@@ -358,15 +704,29 @@ def decrypt():
     input_format = request.form['input_format'].lower()
 
     # Retrieve and validate key
+    algorithm = request.form.get('algorithm', 'des').strip().lower()
     key_hex = request.form.get('key', '').strip()
-    if not key_hex or len(key_hex) != 16 or not is_valid_hex(key_hex):
-        return jsonify({'success': False, 'message': 'Key must be exactly 16 hexadecimal characters.'}), 400
+    try:
+        validate_key(key_hex, algorithm)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
 
     try:
-        key_bin = hex_to_bin(key_hex)
+        key_bin = hex_to_bits(key_hex)
     except ValueError:
         return jsonify({'success': False, 'message': 'Invalid hexadecimal key.'}), 400
 
+    try:
+        trace = parse_trace_level(request.form)
+        trace_format = parse_trace_format(request.form)
+        mode, iv = parse_mode(request.form)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+
+    # Triple-DES always runs through the modes layer (ECB unless a mode is given)
+    if algorithm == '3des' and not mode:
+        mode = 'ECB'
+
     # Initialize input variables
     input_data = ''
     input_hex = 'N/A'
@@ -384,26 +744,16 @@ def decrypt():
             filename = secure_filename(file.filename)
             logger.info(f"File uploaded for decryption: {filename} from {request.remote_addr}")
 
-            # Process the file (in-memory)
-            try:
-                content = file.read().decode('utf-8').strip()
-            except UnicodeDecodeError:
-                return jsonify({'success': False, 'message': 'File contains invalid UTF-8 characters.'}), 400
-
-            # Ensure content is valid ASCII
-            try:
-                content.encode('ascii')
-            except UnicodeEncodeError:
-                return jsonify({'success': False, 'message': 'File contains non-ASCII characters.'}), 400
-
-            # Directly convert hex to binary without re-conversion
+            # Validate and decode the file in a single pass over its chunks
             try:
-                message_bin = hex_to_bin(content)
-            except Exception as e:
-                return jsonify({'success': False, 'message': f'Failed to convert hex to binary: {str(e)}'}), 400
-
-            input_data = content  # Store hex content as input_data
-            input_hex = content
+                message_bytes = read_file_input(file, request.form.get('file_format', 'hex').strip().lower())
+            except ValueError as ve:
+                return jsonify({'success': False, 'message': f'Invalid file contents: {str(ve)}'}), 400
+            if not mode:
+                message_bin = bytes_to_bits(message_bytes)
+
+            input_hex = bytes_to_hex(message_bytes)
+            input_data = input_hex  # Store the decoded content as hex
             input_text = 'N/A'
         else:
             return jsonify({'success': False, 'message': 'Invalid file type. Only .txt files are allowed.'}), 400
@@ -412,16 +762,19 @@ def decrypt():
         if not ciphertext:
             return jsonify({'success': False, 'message': 'Ciphertext is required.'}), 400
         try:
-            message_bin = convert_input(ciphertext, input_format)
+            if mode:
+                message_bytes = convert_input_bytes(ciphertext, input_format)
+            else:
+                message_bin = convert_input(ciphertext, input_format)
             input_data = ciphertext  # Store the original ciphertext
             if input_format == 'hex':
                 input_hex = ciphertext
                 input_text = 'N/A'
             elif input_format == 'text':
-                input_hex = ascii_to_hex(ciphertext)
+                input_hex = bytes_to_hex(text_to_bytes(ciphertext))
                 input_text = ciphertext
-            elif input_format == 'binary':
-                input_hex = bin_to_hex(message_bin)
+            elif input_format in ('binary', 'base64'):
+                input_hex = bytes_to_hex(message_bytes) if mode else bits_to_hex(message_bin)
                 input_text = 'N/A'
             else:
                 input_hex = 'N/A'
@@ -429,6 +782,10 @@ def decrypt():
         except ValueError as ve:
             return jsonify({'success': False, 'message': str(ve)}), 400
 
+    if mode:
+        return process_mode_request('decrypt', algorithm, mode, iv, key_hex, key_bin, message_bytes,
+                                    input_data, input_format, input_hex, input_text)
+
     # Ensure ciphertext is 64 bits (16 hex characters)
     if len(message_bin) != 64:
         return jsonify({'success': False, 'message': 'Ciphertext must be exactly 64 bits (16 hexadecimal characters).' }), 400
@@ -436,25 +793,27 @@ def decrypt():
     # Perform decryption
     try:
         start_time = time.time()
-        decrypted_bin, round_details = des_decrypt(message_bin, key_bin)
+        if trace == TRACE_NONE:
+            decrypted_bin = des_decrypt(message_bin, key_bin, trace=TRACE_NONE)
+            round_details = []
+        else:
+            decrypted_bin, round_details = des_decrypt(message_bin, key_bin, trace=trace)
         end_time = time.time()
     except Exception as e:
         logger.error(f"Decryption failed: {str(e)}")
         return jsonify({'success': False, 'message': f'Decryption failed: {str(e)}'}), 500
 
-    decrypted_hex = bin_to_hex(decrypted_bin)
-    try:
-        decrypted_text = bytes.fromhex(decrypted_hex).decode('utf-8', errors='ignore')
-    except ValueError:
-        decrypted_text = 'Unable to decode decrypted text.'
+    decrypted_hex = bits_to_hex(decrypted_bin)
+    decrypted_text = bits_to_bytes(decrypted_bin).decode('utf-8', errors='ignore')
     elapsed_time = float((end_time - start_time)*1_000)  # Convert to milliseconds
+    trace_id = uuid.uuid4().hex
 
     # Save history with new fields
     save_history(
         operation='decrypt',
         key_hex=key_hex,
-        key_binary=''.join(str(bit) for bit in key_bin),
-        key_base64=base64.b64encode(bytes.fromhex(key_hex)).decode('utf-8'),
+        key_binary=bits_to_binary(key_bin),
+        key_base64=bytes_to_base64(hex_to_bytes(key_hex)),
         input_data=input_data,
         input_format=input_format,
         input_hex=input_hex,
@@ -464,34 +823,278 @@ def decrypt():
         output_hex=decrypted_hex,
         output_text=decrypted_text,
         time_taken=elapsed_time,
-        round_details=round_details
+        round_details=round_details,
+        trace_id=trace_id
     )
 
     # Prepare detailed round details for frontend
-    detailed_rounds = []
-    for round_info in round_details:
-        detailed_rounds.append({
-            'round': round_info['round'],
-            'subkey': round_info['subkey'],
-            'left_before': round_info['left_before'],
-            'right_before': round_info['right_before'],
-            'expanded_right': round_info['expanded_right'],
-            'xor_with_subkey': round_info['xor_with_subkey'],
-            'sbox_details': round_info['sbox_details'],
-            'permutation_output': round_info['permutation_output'],
-            'left_after': round_info['left_after'],
-            'right_after': round_info['right_after']
-        })
+    detailed_rounds = format_round_details(round_details, trace_format)
 
     response = {
         'success': True,
         'decrypted_hex': decrypted_hex,
         'decrypted_text': decrypted_text,
         'round_details': detailed_rounds,  # Updated to include detailed information
+        'trace': trace,
+        'trace_format': trace_format,
+        'trace_id': trace_id,
         'time_taken': elapsed_time
     }
     return jsonify(response), 200
 
+# Header carrying the key of the streaming and file endpoints, whose other
+# parameters are in the query string
+KEY_HEADER = 'X-DES-Key'
+
+def request_key():
+    """
+    The hex key of a request whose parameters are in the query string.
+
+    The key is only accepted in the KEY_HEADER header: a URL is kept in server
+    and proxy logs and in the browser history.
+
+    Returns:
+        str: The key as sent (empty if missing).
+
+    Raises:
+        ValueError: If the key is in the query string.
+    """
+    if 'key' in request.args:
+        raise ValueError(f'Send the key in the {KEY_HEADER} header, not in the URL.')
+    return request.headers.get(KEY_HEADER, '').strip()
+
+def start_stream_encryption(params, default_mode):
+    """
+    Set up incremental encryption of the request body.
+
+    Validates the parameters, MIME-sniffs and encrypts the first chunk (so bad
+    input is reported before any output), and returns a generator for the rest.
+    The application-wide upload limit is replaced by STREAM_MAX_CONTENT_LENGTH.
+
+    Args:
+        params: Query parameters ('algorithm', 'mode', 'iv', 'input_format'); the
+            key is read from the KEY_HEADER header.
+        default_mode (str): Mode used when none is given.
+
+    Returns:
+        tuple: (mode, IV bytes or None, generator of ciphertext chunks). The
+            generator raises ValueError if a later chunk is invalid.
+
+    Raises:
+        ValueError: If a parameter or the first chunk is invalid.
+    """
+    # Replace the application-wide 1 MB upload limit for this request only
+    request.max_content_length = STREAM_MAX_CONTENT_LENGTH
+
+    algorithm = params.get('algorithm', 'des').strip().lower()
+    key_hex = request_key()
+    validate_key(key_hex, algorithm)
+    mode, iv = parse_mode(params, default_mode)
+    if iv is None and mode != 'ECB':
+        iv = modes.generate_iv()
+    decoder = StreamDecoder(params.get('input_format', 'hex').strip().lower())
+    encryptor = modes.ModeEncryptor(hex_to_bytes(key_hex), mode, iv)
+
+    stream = request.stream
+    first_chunk = stream.read(FILE_CHUNK_SIZE)
+    if not first_chunk:
+        raise ValueError('Request body is required.')
+    if not is_plain_text(first_chunk):
+        raise ValueError('Invalid content type. Only plain text is allowed.')
+    first_output = encryptor.update(decoder.feed(first_chunk))
+
+    def generate():
+        yield first_output
+        for chunk in iter(lambda: stream.read(FILE_CHUNK_SIZE), b''):
+            output = encryptor.update(decoder.feed(chunk))
+            if output:
+                yield output
+        decoder.finish()
+        yield encryptor.finalize()
+
+    return mode, iv, generate()
+
+@app.route('/encrypt_stream', methods=['POST'])
+@limiter.limit("10 per minute")
+def encrypt_stream():
+    """
+    Encrypt a request body of any size in a mode of operation, streaming the ciphertext back.
+
+    The raw body is read in chunks, decoded and encrypted as it arrives, so memory
+    use does not depend on its size and the 1 MB upload limit does not apply.
+    Only the first chunk is MIME-sniffed.
+
+    Expects the key in the 'X-DES-Key' header (hexadecimal, 16 characters; 32 or 48
+    for Triple-DES) and query parameters:
+    - 'algorithm': string ('des', '3des'; optional, defaults to 'des')
+    - 'mode': string ('ECB', 'CBC', 'CFB', 'OFB', 'CTR'; optional, defaults to 'CBC')
+    - 'iv': string (hexadecimal, 16 characters; optional, generated for non-ECB modes)
+    - 'input_format': string ('hex', 'text', 'binary', 'base64'; optional, defaults to 'hex')
+
+    Returns:
+        The raw ciphertext (application/octet-stream), with the IV in the 'X-IV' header.
+    """
+    try:
+        mode, iv, chunks = start_stream_encryption(request.args, 'CBC')
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+
+    logger.info(f"Streaming {mode} encryption for {request.remote_addr}")
+
+    def generate():
+        try:
+            yield from chunks
+        except ValueError as ve:
+            # The status line is already sent: abort the response so the client sees an incomplete body
+            logger.error(f"Streaming encryption aborted: {str(ve)}")
+            raise
+
+    response = Response(stream_with_context(generate()), mimetype='application/octet-stream')
+    response.headers['X-IV'] = bytes_to_hex(iv) if iv else ''
+    response.headers['X-Mode'] = mode
+    response.headers['Access-Control-Expose-Headers'] = 'X-IV, X-Mode'
+    return response
+
+def stored_file_path(file_id):
+    """
+    Path of a stored CTR ciphertext.
+
+    Args:
+        file_id (str): The id returned by POST /files.
+
+    Returns:
+        str: The file path.
+
+    Raises:
+        ValueError: If the id is malformed or the file does not exist.
+    """
+    if len(file_id) != 32 or not is_hex(file_id):
+        raise ValueError('Invalid file id.')
+    path = os.path.join(STORAGE_DIR, file_id.lower() + '.ctr')
+    if not os.path.isfile(path):
+        raise ValueError('File not found.')
+    return path
+
+@app.route('/files', methods=['POST'])
+@limiter.limit("10 per minute")
+def upload_file():
+    """
+    Encrypt a request body of any size in CTR mode and store the ciphertext.
+
+    The body is read and encrypted chunk by chunk, as in /encrypt_stream. The
+    stored file is the IV followed by the ciphertext (the layout written by
+    `python -m backend.cli encrypt --mode CTR --embed-iv`), so any byte range
+    can later be decrypted on its own.
+
+    Expects the key in the 'X-DES-Key' header (hexadecimal, 16 characters; 32 or 48
+    for Triple-DES) and query parameters:
+    - 'algorithm': string ('des', '3des'; optional, defaults to 'des')
+    - 'iv': string (hexadecimal, 16 characters; optional, generated when omitted)
+    - 'input_format': string ('hex', 'text', 'binary', 'base64'; optional, defaults to 'hex')
+
+    Returns:
+        JSON response with the file id, the IV and the plaintext size.
+    """
+    if request.args.get('mode', 'CTR').strip().upper() != 'CTR':
+        return jsonify({'success': False, 'message': 'Stored files are always encrypted in CTR mode.'}), 400
+    try:
+        _, iv, chunks = start_stream_encryption(request.args, 'CTR')
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+
+    os.makedirs(STORAGE_DIR, exist_ok=True)
+    file_id = uuid.uuid4().hex
+    path = os.path.join(STORAGE_DIR, file_id + '.ctr')
+    size = 0
+    try:
+        with open(path, 'wb') as f:
+            f.write(iv)
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+    except ValueError as ve:
+        os.remove(path)
+        return jsonify({'success': False, 'message': str(ve)}), 400
+    except Exception:
+        # E.g. the client disconnected: do not leave a truncated ciphertext behind
+        os.remove(path)
+        raise
+
+    logger.info(f"Stored encrypted file {file_id} ({size} bytes) for {request.remote_addr}")
+    return jsonify({'success': True, 'file_id': file_id, 'iv': bytes_to_hex(iv), 'size': size}), 201
+
+@app.route('/files/<file_id>', methods=['GET'])
+def download_file(file_id):
+    """
+    Download a stored file (IV followed by the ciphertext), with HTTP Range support.
+    """
+    try:
+        path = stored_file_path(file_id)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 404
+    return send_file(path, mimetype='application/octet-stream', conditional=True)
+
+@app.route('/files/<file_id>/plaintext', methods=['GET'])
+@limiter.limit("100 per minute")
+def download_plaintext(file_id):
+    """
+    Decrypt and download a stored file, or only the byte range asked for.
+
+    A 'Range: bytes=start-end' header (offsets into the plaintext) is answered
+    with 206 Partial Content: only the CTR blocks covering the range are read
+    and decrypted, so the cost does not depend on where the range lies.
+    Multi-range requests are answered with the whole plaintext.
+
+    Expects the key in the 'X-DES-Key' header (hexadecimal, 16 characters; 32 or 48
+    for Triple-DES) and query parameters:
+    - 'algorithm': string ('des', '3des'; optional, defaults to 'des')
+
+    Returns:
+        The plaintext (application/octet-stream).
+    """
+    algorithm = request.args.get('algorithm', 'des').strip().lower()
+    try:
+        key_hex = request_key()
+        validate_key(key_hex, algorithm)
+        path = stored_file_path(file_id)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+    key = hex_to_bytes(key_hex)
+
+    header = modes.BLOCK_SIZE
+    length = os.path.getsize(path) - header
+    start, stop, status = 0, length, 200
+    # Only single byte ranges are served; a server may ignore any other Range header
+    if request.range is not None and request.range.units == 'bytes' and len(request.range.ranges) == 1:
+        byte_range = request.range.range_for_length(length)
+        if byte_range is None:
+            response = jsonify({'success': False, 'message': 'Requested range not satisfiable.'})
+            response.headers['Content-Range'] = f'bytes */{length}'
+            return response, 416
+        (start, stop), status = byte_range, 206
+
+    encrypt_block, _ = modes.block_functions(key)
+    batch = modes.batch_functions(key)
+
+    def generate():
+        with open(path, 'rb') as f:
+            iv = f.read(header)
+            f.seek(header + start)
+            offset = start
+            while offset < stop:
+                chunk = f.read(min(FILE_CHUNK_SIZE, stop - offset))
+                if not chunk:
+                    break
+                yield modes.ctr_crypt_range_with(encrypt_block, chunk, iv, offset, batch)
+                offset += len(chunk)
+
+    response = Response(generate(), status=status, mimetype='application/octet-stream')
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.content_length = stop - start
+    if status == 206:
+        response.headers['Content-Range'] = f'bytes {start}-{stop - 1}/{length}'
+    return response
+
 @app.route('/generate_key', methods=['GET'])
 @limiter.limit("100 per day")  # Example: 100 requests per day
 def generate_key_route():
@@ -502,9 +1105,8 @@ def generate_key_route():
         JSON response with the generated key in hex, binary, and Base64 formats.
     """
     key_hex = ''.join(random.choice('0123456789ABCDEF') for _ in range(16))
-    key_bin = ''.join(bin(int(c, 16))[2:].zfill(4) for c in key_hex)  # Convert each hex char to 4-bit binary
-    key_bytes = bytes.fromhex(key_hex)
-    key_base64 = base64.b64encode(key_bytes).decode('utf-8')
+    key_bin = hex_to_binary(key_hex)
+    key_base64 = bytes_to_base64(hex_to_bytes(key_hex))
 
     logger.info(f"Generated key: {key_hex} ({key_bin}) {key_base64} for {request.remote_addr}")
 
@@ -542,10 +1144,9 @@ def convert_text_to_hex_route():
     text = data['text']
     try:
         # Ensure text is ASCII
-        text.encode('ascii')
-        hex_str = ascii_to_hex(text)
-    except UnicodeEncodeError:
-        return jsonify({'success': False, 'message': 'Text contains non-ASCII characters.'}), 400
+        hex_str = bytes_to_hex(text_to_bytes(text))
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
     except Exception as e:
         return jsonify({'success': False, 'message': f'Conversion failed: {str(e)}'}), 500
 
@@ -567,11 +1168,11 @@ def convert_bin_to_hex_route():
         return jsonify({'success': False, 'message': 'Binary string is required.'}), 400
 
     bin_str = data['binary'].strip()
-    if not is_valid_binary(bin_str) or len(bin_str) != 64:
+    if not is_binary(bin_str) or len(bin_str) != 64:
         return jsonify({'success': False, 'message': 'Binary string must be exactly 64 bits.'}), 400
 
     try:
-        hex_str = bin_to_hex([int(bit) for bit in bin_str])
+        hex_str = bytes_to_hex(binary_to_bytes(bin_str))
     except Exception as e:
         return jsonify({'success': False, 'message': f'Conversion failed: {str(e)}'}), 500
 
@@ -811,6 +1412,7 @@ def generate_report():
 
 @app.route("/history", methods=["GET"])
 @limiter.limit("50 per hour")  # Adjust rate limits as necessary
+@compressed
 def get_history():
     """
     Retrieve the history of encryption, decryption, and key generation operations.
@@ -827,6 +1429,396 @@ def get_history():
         logger.error(f"Failed to retrieve history: {str(e)}")
         return jsonify({"success": False, "message": "Failed to retrieve history."}), 500
 
+def expand_trace(trace_id):
+    """
+    Recompute the full round details of a stored single-block operation.
+
+    DES is deterministic, so the rounds are rebuilt from the key and input
+    saved in the history instead of being kept with every request.
+
+    Args:
+        trace_id (str): The trace id returned by /encrypt or /decrypt.
+
+    Returns:
+        list: The full RoundTrace of each of the 16 rounds.
+
+    Raises:
+        KeyError: If no operation has this trace id.
+    """
+    entry = History.query.filter_by(trace_id=trace_id).first()
+    if entry is None:
+        raise KeyError(trace_id)
+    crypt = des_decrypt if entry.operation == 'decrypt' else des_encrypt
+    _, round_details = crypt(hex_to_bits(entry.input_hex), hex_to_bits(entry.key_hex), trace=TRACE_FULL)
+    return round_details
+
+def get_trace(trace_id, trace):
+    """
+    Round details of a stored operation, from the trace cache when they were expanded recently.
+
+    Args:
+        trace_id (str): The trace id returned by /encrypt or /decrypt.
+        trace (str): 'summary' or 'full'.
+
+    Returns:
+        list: One RoundTrace per round.
+
+    Raises:
+        ValueError: If the trace id is malformed or unknown.
+    """
+    if len(trace_id) != 32 or not is_hex(trace_id):
+        raise ValueError('Invalid trace id.')
+    try:
+        round_details = trace_cache.get(trace_id.lower(), expand_trace)
+    except KeyError:
+        raise ValueError('Trace not found.')
+    if trace == TRACE_SUMMARY:
+        return [round_trace.summary() for round_trace in round_details]
+    return round_details
+
+@app.route('/trace/<trace_id>', methods=['GET'])
+@limiter.limit("60 per minute")
+@compressed
+def trace_details(trace_id):
+    """
+    Round details of an earlier /encrypt or /decrypt, recomputed on demand.
+
+    Expects query parameters:
+    - 'trace': string ('summary', 'full'; optional, defaults to 'full')
+    - 'trace_format': string ('bits', 'hex', 'packed'; optional, defaults to 'bits')
+
+    Returns:
+        JSON response with the round details, formatted as by /encrypt.
+    """
+    try:
+        trace = parse_trace_level(request.args)
+        trace_format = parse_trace_format(request.args)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+    if trace == TRACE_NONE:
+        return jsonify({'success': False, 'message': "Trace must be 'summary' or 'full'."}), 400
+    try:
+        round_details = get_trace(trace_id, trace)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 404
+    return jsonify({
+        'success': True,
+        'trace_id': trace_id,
+        'round_details': format_round_details(round_details, trace_format),
+        'trace': trace,
+        'trace_format': trace_format
+    }), 200
+
+@app.route('/trace/<trace_id>/round/<int:number>', methods=['GET'])
+@limiter.limit("200 per minute")
+@compressed
+def trace_round(trace_id, number):
+    """
+    One round of an earlier /encrypt or /decrypt, recomputed on demand.
+
+    Takes the same query parameters as GET /trace/<trace_id>.
+
+    Returns:
+        JSON response with the round number and the round details of that round only
+        (a one-round list, or a one-round packed dict).
+    """
+    try:
+        trace = parse_trace_level(request.args)
+        trace_format = parse_trace_format(request.args)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+    if trace == TRACE_NONE:
+        return jsonify({'success': False, 'message': "Trace must be 'summary' or 'full'."}), 400
+    try:
+        round_details = get_trace(trace_id, trace)
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 404
+    if not 1 <= number <= len(round_details):
+        return jsonify({'success': False, 'message': f'Round must be from 1 to {len(round_details)}.'}), 404
+    return jsonify({
+        'success': True,
+        'trace_id': trace_id,
+        'round': number,
+        'round_details': format_round_details(round_details[number - 1:number], trace_format),
+        'trace': trace,
+        'trace_format': trace_format
+    }), 200
+
+@app.route('/trace/cache/stats', methods=['GET'])
+def trace_cache_stats():
+    """
+    Report usage of the cache of recomputed round traces.
+
+    Returns:
+        JSON response with cache size, hit/miss/eviction counters and hit rate.
+    """
+    return jsonify({'success': True, 'stats': trace_cache.stats()}), 200
+
+@app.route('/key_cache/stats', methods=['GET'])
+def key_cache_stats():
+    """
+    Report usage of the process-wide key schedule cache.
+
+    Returns:
+        JSON response with cache size, hit/miss/eviction counters and hit rate.
+    """
+    return jsonify({'success': True, 'stats': key_schedule_cache.stats()}), 200
+
+@app.route('/variant/crypt', methods=['POST'])
+@limiter.limit("60 per minute")
+def variant_crypt():
+    """
+    Encrypt or decrypt one block with a DES variant (custom rounds, S-boxes, permutations or shifts).
+
+    Expects form data with:
+    - 'variant': string (JSON object; optional): any of rounds, ip, fp, e, p, s_boxes and
+      shift_schedule, the DES values being used for omitted fields
+    - 'operation': string ('encrypt' or 'decrypt'; optional, defaults to 'encrypt')
+    - 'data': string (hexadecimal, 16 characters)
+    - 'key': string (hexadecimal, 16 characters)
+    - 'trace': string ('none' or 'summary'; optional, defaults to 'summary')
+
+    Returns:
+        JSON response with the output block, the variant's content hash and,
+        for 'summary', L and R after each round.
+    """
+    operation = request.form.get('operation', 'encrypt').strip().lower()
+    if operation not in ('encrypt', 'decrypt'):
+        return jsonify({'success': False, 'message': "Invalid operation. Expected 'encrypt' or 'decrypt'."}), 400
+    data_hex = request.form.get('data', '').strip()
+    key_hex = request.form.get('key', '').strip()
+    if len(data_hex) != 16 or not is_hex(data_hex):
+        return jsonify({'success': False, 'message': 'Data must be 16 hexadecimal characters.'}), 400
+    if len(key_hex) != 16 or not is_hex(key_hex):
+        return jsonify({'success': False, 'message': 'Key must be 16 hexadecimal characters.'}), 400
+    trace = request.form.get('trace', TRACE_SUMMARY).strip().lower()
+    if trace not in (TRACE_NONE, TRACE_SUMMARY):
+        return jsonify({'success': False, 'message': "Invalid trace level. Expected 'none' or 'summary'."}), 400
+    try:
+        variant = get_variant(json.loads(request.form.get('variant') or '{}'))
+    except json.JSONDecodeError:
+        return jsonify({'success': False, 'message': 'Variant must be a JSON object.'}), 400
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+
+    start_time = time.perf_counter()
+    output, states = variant.crypt_states_int(int(data_hex, 16), int(key_hex, 16), decrypt=operation == 'decrypt')
+    response = {
+        'success': True,
+        'result': f'{output:016X}',
+        'variant': variant.digest,
+        'rounds': variant.variant.rounds
+    }
+    if trace == TRACE_SUMMARY:
+        response['round_states'] = [{'round': i, 'left': f'{left:08X}', 'right': f'{right:08X}'}
+                                    for i, (left, right) in enumerate(states)]
+    response['time_taken'] = (time.perf_counter() - start_time) * 1_000  # Convert to milliseconds
+    return jsonify(response), 200
+
+@app.route('/variant/cache/stats', methods=['GET'])
+def variant_cache_stats():
+    """
+    Report usage of the cache of compiled DES variants.
+
+    Returns:
+        JSON response with cache size, hit/miss/eviction counters and hit rate.
+    """
+    return jsonify({'success': True, 'stats': variant_cache.stats()}), 200
+
+SBOX_TABLE_KINDS = ('ddt', 'lat')
+
+@app.route('/analysis/sbox_tables', methods=['GET'])
+@compressed
+def sbox_tables():
+    """
+    Serve the difference distribution and linear approximation tables of the DES S-boxes.
+
+    Query parameters:
+        table (str): 'ddt', 'lat' or 'all' (default).
+        sbox (int): 1 to 8 for a single S-box (default: all eight).
+
+    Returns:
+        JSON response with the requested tables (indexed [sbox][input][output])
+        and the strongest differential and linear approximation of each S-box.
+    """
+    if analysis is None:
+        return jsonify({'success': False, 'message': 'S-box analysis requires NumPy to be installed.'}), 500
+    kind = request.args.get('table', 'all').lower()
+    if kind not in SBOX_TABLE_KINDS + ('all',):
+        return jsonify({'success': False, 'message': "Invalid table. Expected one of: ddt, lat, all."}), 400
+    sbox = request.args.get('sbox')
+    if sbox is not None and sbox not in [str(i) for i in range(1, 9)]:
+        return jsonify({'success': False, 'message': 'Invalid sbox. Expected a number from 1 to 8.'}), 400
+
+    tables = analysis.get_sbox_tables()
+    selected = slice(None) if sbox is None else slice(int(sbox) - 1, int(sbox))
+    response = {'success': True, 'summary': analysis.table_summary(tables)[selected]}
+    for name in SBOX_TABLE_KINDS:
+        if kind in (name, 'all'):
+            response[name] = getattr(tables, name)[selected].tolist()
+    return jsonify(response), 200
+
+# Upper bound on the random inputs of a strict avalanche analysis (each costs 128 encryptions)
+MAX_SAC_SAMPLES = 20000
+
+@app.route('/analysis/avalanche', methods=['POST'])
+@limiter.limit("10 per minute")
+@compressed
+def avalanche_analysis():
+    """
+    Measure the avalanche effect of DES for a plaintext and key.
+
+    Expects form data with:
+    - 'plaintext': string (hexadecimal, 16 characters)
+    - 'key': string (hexadecimal, 16 characters)
+    - 'samples': integer (optional, defaults to 1000; 0 skips the strict avalanche statistics)
+    - 'seed': integer (optional): seed of the random strict avalanche inputs
+    - 'matrix': 'true' to include the 64 x 64 strict avalanche probability matrices
+
+    Returns:
+        JSON response with the Hamming distance of L/R after each round for every
+        flipped plaintext and key bit, and strict avalanche criterion statistics.
+    """
+    if analysis is None:
+        return jsonify({'success': False, 'message': 'Avalanche analysis requires NumPy to be installed.'}), 500
+    plaintext_hex = request.form.get('plaintext', '').strip()
+    key_hex = request.form.get('key', '').strip()
+    if len(plaintext_hex) != 16 or not is_hex(plaintext_hex):
+        return jsonify({'success': False, 'message': 'Plaintext must be 16 hexadecimal characters.'}), 400
+    if len(key_hex) != 16 or not is_hex(key_hex):
+        return jsonify({'success': False, 'message': 'Key must be 16 hexadecimal characters.'}), 400
+    try:
+        samples = int(request.form.get('samples', 1000))
+        seed = request.form.get('seed')
+        seed = int(seed) if seed not in (None, '') else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Samples and seed must be integers.'}), 400
+    if not 0 <= samples <= MAX_SAC_SAMPLES:
+        return jsonify({'success': False, 'message': f'Samples must be between 0 and {MAX_SAC_SAMPLES}.'}), 400
+    if seed is not None and seed < 0:
+        return jsonify({'success': False, 'message': 'Seed must not be negative.'}), 400
+    matrix = request.form.get('matrix', 'false').lower() == 'true'
+
+    start_time = time.perf_counter()
+    response = {'success': True}
+    response.update(analysis.avalanche(int(plaintext_hex, 16), int(key_hex, 16)))
+    if samples:
+        response['sac'] = analysis.strict_avalanche(samples, seed, matrix)
+    response['time_taken'] = (time.perf_counter() - start_time) * 1_000  # Convert to milliseconds
+    return jsonify(response), 200
+
+# Upper bound on the chosen plaintext pairs of a differential attack
+MAX_DIFFERENTIAL_PAIRS = 1000000
+
+@app.route('/analysis/differential', methods=['POST'])
+@limiter.limit("10 per minute")
+def differential_analysis():
+    """
+    Run a differential cryptanalysis experiment on reduced-round DES.
+
+    Expects form data with:
+    - 'rounds': integer (3, 4 or 6; optional, defaults to 3)
+    - 'pairs': integer (optional, defaults to 10000): number of chosen plaintext pairs
+    - 'key': string (hexadecimal, 16 characters; optional): the secret key, random when omitted
+    - 'seed': integer (optional): seed of the random key and plaintexts
+    - 'filter': 'false' to count every pair instead of discarding impossible ones
+
+    Returns:
+        JSON response with the votes for the last round subkey, per S-box, and
+        how much of the subkey was recovered.
+    """
+    if differential is None:
+        return jsonify({'success': False, 'message': 'Differential analysis requires NumPy to be installed.'}), 500
+    key_hex = request.form.get('key', '').strip()
+    if key_hex and (len(key_hex) != 16 or not is_hex(key_hex)):
+        return jsonify({'success': False, 'message': 'Key must be 16 hexadecimal characters.'}), 400
+    try:
+        rounds = int(request.form.get('rounds', 3))
+        pairs = int(request.form.get('pairs', 10000))
+        seed = request.form.get('seed')
+        seed = int(seed) if seed not in (None, '') else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Rounds, pairs and seed must be integers.'}), 400
+    if not 1 <= pairs <= MAX_DIFFERENTIAL_PAIRS:
+        return jsonify({'success': False, 'message': f'Pairs must be between 1 and {MAX_DIFFERENTIAL_PAIRS}.'}), 400
+    if seed is not None and seed < 0:
+        return jsonify({'success': False, 'message': 'Seed must not be negative.'}), 400
+    try:
+        result = differential.differential_attack(rounds, pairs, int(key_hex, 16) if key_hex else None, seed,
+                                                  request.form.get('filter', 'true').lower() != 'false')
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+
+    result['key'] = f"{result['key']:016X}"
+    for name in ('subkey', 'recovered_subkey', 'recovered_mask'):
+        result[name] = f"{result[name]:012X}"
+    result['characteristic']['input_difference'] = f"{result['characteristic']['input_difference']:016X}"
+    # 'success' reports the request; whether the whole subkey was recovered is 'key_recovered'
+    result['key_recovered'] = result.pop('success')
+    return jsonify({'success': True, **result}), 200
+
+# Upper bound on the known pairs of a linear attack, summed over its trials
+MAX_LINEAR_PAIRS = 4000000
+
+@app.route('/analysis/linear', methods=['POST'])
+@limiter.limit("10 per minute")
+def linear_analysis():
+    """
+    Run linear cryptanalysis experiments (Matsui's Algorithms 1 and 2) on reduced-round DES.
+
+    Expects form data with:
+    - 'rounds': integer (optional, defaults to 3): 3 or 4 for Algorithm 1, 4 or 5 for Algorithm 2
+    - 'algorithm': integer (1 or 2; optional, defaults to 1)
+    - 'approximations': string (JSON list; optional): the trail to use instead of the built-in
+      ones, one [sbox, input_mask, output_mask] (S-boxes from 1) or null per round; 'rounds'
+      then defaults to the rounds it covers, plus one for Algorithm 2
+    - 'pairs': integer (optional, defaults to 100000): known pairs per trial
+    - 'trials': integer (optional, defaults to 1): independent attacks, for the success rate
+    - 'key': string (hexadecimal, 16 characters; optional): the secret key, random per trial when omitted
+    - 'seed': integer (optional): seed of the random keys and plaintexts
+
+    Returns:
+        JSON response with the linear trail and its bias, the success rate and
+        the outcome of every trial.
+    """
+    if linear is None:
+        return jsonify({'success': False, 'message': 'Linear analysis requires NumPy to be installed.'}), 500
+    key_hex = request.form.get('key', '').strip()
+    if key_hex and (len(key_hex) != 16 or not is_hex(key_hex)):
+        return jsonify({'success': False, 'message': 'Key must be 16 hexadecimal characters.'}), 400
+    try:
+        rounds = request.form.get('rounds')
+        rounds = int(rounds) if rounds not in (None, '') else None
+        algorithm = int(request.form.get('algorithm', 1))
+        pairs = int(request.form.get('pairs', 100000))
+        trials = int(request.form.get('trials', 1))
+        seed = request.form.get('seed')
+        seed = int(seed) if seed not in (None, '') else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Rounds, algorithm, pairs, trials and seed must be integers.'}), 400
+    if pairs < 1 or trials < 1 or pairs * trials > MAX_LINEAR_PAIRS:
+        return jsonify({'success': False,
+                        'message': f'Pairs and trials must be positive, with at most {MAX_LINEAR_PAIRS} pairs in total.'}), 400
+    if seed is not None and seed < 0:
+        return jsonify({'success': False, 'message': 'Seed must not be negative.'}), 400
+    approximations = request.form.get('approximations', '').strip()
+    try:
+        approximations = linear.approximations_from_list(json.loads(approximations)) if approximations else None
+        result = linear.linear_attack(rounds, algorithm, pairs, trials, int(key_hex, 16) if key_hex else None, seed,
+                                      approximations)
+    except json.JSONDecodeError:
+        return jsonify({'success': False, 'message': 'Approximations must be a JSON list.'}), 400
+    except ValueError as ve:
+        return jsonify({'success': False, 'message': str(ve)}), 400
+
+    for name in ('plaintext_mask', 'ciphertext_mask'):
+        result['trail'][name] = f"{result['trail'][name]:016X}"
+    for trial in result['results']:
+        trial['key'] = f"{trial['key']:016X}"
+        # 'success' reports the request; the outcome of each attack is 'key_recovered'
+        trial['key_recovered'] = trial.pop('success')
+    return jsonify({'success': True, **result}), 200
+
 # Initialize OpenAI client (ensure API key is set securely)
 
 @app.route('/chat', methods=['POST'])
@@ -0,0 +1,238 @@
+# backend/batch_des.py
+
+import numpy as np
+from .des import IP_TABLES, FP_TABLES, E_TABLES, SP_TABLES
+from .key_expansion import PC1_TABLES, PC2_TABLES, SHIFT_SCHEDULE, get_key_schedule
+
+# Lookup tables as NumPy arrays (one row per input byte, or per S-box for SP)
+IP_LOOKUP = np.array(IP_TABLES, dtype=np.uint64)
+FP_LOOKUP = np.array(FP_TABLES, dtype=np.uint64)
+E_LOOKUP = np.array(E_TABLES, dtype=np.uint64)
+SP_LOOKUP = np.array(SP_TABLES, dtype=np.uint64)
+PC1_LOOKUP = np.array(PC1_TABLES, dtype=np.uint64)
+PC2_LOOKUP = np.array(PC2_TABLES, dtype=np.uint64)
+
+MASK_6 = np.uint64(0x3F)
+MASK_8 = np.uint64(0xFF)
+MASK_28 = np.uint64(0xFFFFFFF)
+MASK_32 = np.uint64(0xFFFFFFFF)
+
+def permute_array(values, lookup):
+    """
+    Apply a byte-indexed permutation to every element of an array.
+
+    Args:
+        values (np.ndarray): uint64 array of input values.
+        lookup (np.ndarray): Lookup tables of shape (input bytes, 256).
+
+    Returns:
+        np.ndarray: uint64 array of permuted values.
+    """
+    nbytes = lookup.shape[0]
+    result = np.zeros(values.shape, dtype=np.uint64)
+    for i in range(nbytes):
+        result |= lookup[i][(values >> np.uint64(8 * (nbytes - 1 - i))) & MASK_8]
+    return result
+
+def feistel_array(right, subkey):
+    """
+    Vectorized Feistel (F) function using the merged S-box/P tables.
+
+    Args:
+        right (np.ndarray): uint64 array of 32-bit right halves.
+        subkey (np.uint64 or np.ndarray): 48-bit round key, shared or one per block.
+
+    Returns:
+        np.ndarray: uint64 array of 32-bit F outputs.
+    """
+    x = permute_array(right, E_LOOKUP) ^ subkey
+    result = SP_LOOKUP[7][x & MASK_6]
+    for i in range(7):
+        result |= SP_LOOKUP[i][(x >> np.uint64(42 - 6 * i)) & MASK_6]
+    return result
+
+def key_schedules(keys):
+    """
+    Compute the round keys for an array of 64-bit keys.
+
+    Args:
+        keys (np.ndarray): uint64 array of keys.
+
+    Returns:
+        np.ndarray: uint64 array of shape (16, len(keys)) in encryption order.
+    """
+    keys = np.asarray(keys, dtype=np.uint64)
+    key_permuted = permute_array(keys, PC1_LOOKUP)
+    c = key_permuted >> np.uint64(28)
+    d = key_permuted & MASK_28
+    round_keys = np.empty((len(SHIFT_SCHEDULE),) + keys.shape, dtype=np.uint64)
+    for i, shift in enumerate(SHIFT_SCHEDULE):
+        shift, back = np.uint64(shift), np.uint64(28 - shift)
+        c = ((c << shift) | (c >> back)) & MASK_28
+        d = ((d << shift) | (d >> back)) & MASK_28
+        round_keys[i] = permute_array((c << np.uint64(28)) | d, PC2_LOOKUP)
+    return round_keys
+
+def _round_keys(key, decrypt, rounds=16):
+    """
+    Resolve a key argument to round keys in application order.
+
+    Args:
+        key (int, bytes or np.ndarray): A single 64-bit key, or one key per block.
+        decrypt (bool): Whether to reverse the round key order.
+        rounds (int): Number of rounds (1 to 16) for reduced-round DES.
+
+    Returns:
+        np.ndarray: Shape (rounds,) for a single key, (rounds, n) for an array of keys.
+
+    Raises:
+        ValueError: If the round count is out of range.
+    """
+    if not 1 <= rounds <= len(SHIFT_SCHEDULE):
+        raise ValueError(f"The number of rounds must be between 1 and {len(SHIFT_SCHEDULE)}.")
+    if isinstance(key, (bytes, bytearray)):
+        key = int.from_bytes(key, 'big')
+    if isinstance(key, int):
+        round_keys = np.array(get_key_schedule(key).forward[:rounds], dtype=np.uint64)
+    else:
+        round_keys = key_schedules(key)[:rounds]
+    return round_keys[::-1] if decrypt else round_keys
+
+def stage_arrays(stages):
+    """
+    Convert per-stage round key sequences into uint64 arrays for `crypt_blocks`.
+
+    Args:
+        stages (list): Round keys (16 48-bit integers) for each stage.
+
+    Returns:
+        list: One uint64 array of shape (16,) per stage.
+    """
+    return [np.array(round_keys, dtype=np.uint64) for round_keys in stages]
+
+def crypt_blocks(blocks, stages):
+    """
+    Run one or more chained DES operations on an array of 64-bit blocks.
+
+    Args:
+        blocks (np.ndarray): uint64 array of input blocks.
+        stages (list): Round keys for each stage, each of shape (rounds,) or (rounds, n).
+            One stage is single DES; three stages are Triple-DES.
+
+    Returns:
+        np.ndarray: uint64 array of output blocks.
+    """
+    blocks = permute_array(np.asarray(blocks, dtype=np.uint64), IP_LOOKUP)
+    left = blocks >> np.uint64(32)
+    right = blocks & MASK_32
+    for round_keys in stages:
+        for subkey in round_keys:
+            left, right = right, left ^ feistel_array(right, subkey)
+        # Undo the last swap: R16 + L16 feeds the Final Permutation (or the next stage)
+        left, right = right, left
+    return permute_array((left << np.uint64(32)) | right, FP_LOOKUP)
+
+def crypt_states(blocks, round_keys):
+    """
+    Run DES rounds on an array of 64-bit blocks, keeping only L and R after every round.
+
+    The round-state counterpart of `des.des_crypt_states_int`: no Final
+    Permutation and no per-step trace, just two uint64 arrays per round.
+
+    Args:
+        blocks (np.ndarray): uint64 array of input blocks.
+        round_keys (np.ndarray): Round keys in application order, shape (rounds,) or (rounds, n).
+
+    Returns:
+        tuple: (left, right) uint64 arrays of shape (rounds + 1, n); row 0 is the
+            state after the Initial Permutation, row r the state after round r.
+    """
+    blocks = permute_array(np.asarray(blocks, dtype=np.uint64), IP_LOOKUP)
+    left = np.empty((len(round_keys) + 1,) + blocks.shape, dtype=np.uint64)
+    right = np.empty_like(left)
+    left[0] = blocks >> np.uint64(32)
+    right[0] = blocks & MASK_32
+    for i, subkey in enumerate(round_keys):
+        left[i + 1] = right[i]
+        right[i + 1] = left[i] ^ feistel_array(right[i], subkey)
+    return left, right
+
+def crypt_bytes(data, stages):
+    """
+    Run chained DES operations on every block of a buffer.
+
+    Same interface as `bitslice_des.crypt_bytes`, so the two engines are interchangeable.
+
+    Args:
+        data (bytes): Buffer whose length is a multiple of 8.
+        stages (list): Round keys (16 48-bit integers) for each stage.
+
+    Returns:
+        bytes: The processed blocks.
+    """
+    return blocks_to_bytes(crypt_blocks(bytes_to_blocks(data), stage_arrays(stages)))
+
+def encrypt_blocks(blocks, key, rounds=16):
+    """
+    Encrypt an array of 64-bit blocks with DES.
+
+    Args:
+        blocks (np.ndarray): uint64 array of plaintext blocks.
+        key (int, bytes or np.ndarray): A single 64-bit key, or a uint64 array with one key per block.
+        rounds (int): Number of rounds, for reduced-round DES (the first `rounds` round keys are used).
+
+    Returns:
+        np.ndarray: uint64 array of ciphertext blocks.
+    """
+    return crypt_blocks(blocks, [_round_keys(key, False, rounds)])
+
+def decrypt_blocks(blocks, key, rounds=16):
+    """
+    Decrypt an array of 64-bit blocks with DES.
+
+    Args:
+        blocks (np.ndarray): uint64 array of ciphertext blocks.
+        key (int, bytes or np.ndarray): A single 64-bit key, or a uint64 array with one key per block.
+        rounds (int): Number of rounds, for reduced-round DES.
+
+    Returns:
+        np.ndarray: uint64 array of plaintext blocks.
+    """
+    return crypt_blocks(blocks, [_round_keys(key, True, rounds)])
+
+def counter_blocks(start, count):
+    """
+    Build consecutive CTR counter blocks, wrapping modulo 2**64.
+
+    Args:
+        start (int): The initial 64-bit counter block.
+        count (int): Number of counter blocks.
+
+    Returns:
+        np.ndarray: uint64 array of counter blocks.
+    """
+    return np.arange(count, dtype=np.uint64) + np.uint64(start)
+
+def bytes_to_blocks(data):
+    """
+    View a buffer of whole 8-byte blocks as a uint64 array.
+
+    Args:
+        data (bytes): Buffer whose length is a multiple of 8.
+
+    Returns:
+        np.ndarray: uint64 array of big-endian blocks.
+    """
+    return np.frombuffer(data, dtype='>u8').astype(np.uint64)
+
+def blocks_to_bytes(blocks):
+    """
+    Pack a uint64 array of blocks into big-endian bytes.
+
+    Args:
+        blocks (np.ndarray): uint64 array of blocks.
+
+    Returns:
+        bytes: The packed blocks.
+    """
+    return blocks.astype('>u8').tobytes()
@@ -0,0 +1,133 @@
+# backend/benchmark.py
+
+import argparse
+import os
+import time
+from .des import DESCipher, des_crypt_bits
+from .key_expansion import generate_keys, get_key_schedule
+from .modes import split_blocks, join_blocks
+from .utils import int_to_bits, bits_to_int
+from . import bitslice_des
+
+try:
+    from . import batch_des
+except ImportError:  # NumPy is optional
+    batch_des = None
+
+# The list-based engine is slow, so it only encrypts a sample of the blocks
+LIST_ENGINE_SAMPLE = 256
+
+def _list_engine(data, key):
+    """
+    Encrypt blocks with the original list-of-bits engine (`des.des_crypt_bits`).
+    """
+    round_keys = generate_keys(int_to_bits(key, 64))
+    return join_blocks([bits_to_int(des_crypt_bits(int_to_bits(block, 64), round_keys))
+                        for block in split_blocks(data)])
+
+def _int_engine(data, key):
+    """
+    Encrypt blocks one at a time with the integer engine.
+    """
+    return DESCipher(key).encrypt_blocks(data)
+
+def _bitslice_engine(data, key):
+    """
+    Encrypt all blocks in one pass of the bitsliced engine.
+    """
+    return bitslice_des.crypt_bytes(data, [get_key_schedule(key).forward])
+
+def _numpy_engine(data, key):
+    """
+    Encrypt all blocks with the NumPy batch engine.
+    """
+    return batch_des.crypt_bytes(data, [get_key_schedule(key).forward])
+
+def available_engines():
+    """
+    List the engines that can be benchmarked in this environment.
+
+    Returns:
+        dict: Engine name -> function(data, key) encrypting whole blocks.
+    """
+    engines = {
+        'list': _list_engine,
+        'int': _int_engine,
+        'bitslice': _bitslice_engine,
+    }
+    if batch_des is not None:
+        engines['numpy'] = _numpy_engine
+    return engines
+
+def benchmark_engines(blocks=4096, repeat=3, engines=None):
+    """
+    Measure the throughput of the DES engines on random data.
+
+    Every engine encrypts the same blocks under the same key, and the outputs
+    are checked against the integer engine.
+
+    Args:
+        blocks (int): Number of 64-bit blocks per run.
+        repeat (int): Number of runs; the fastest one is reported.
+        engines (list): Engine names to run (default: all available engines).
+
+    Returns:
+        list: One dict per engine with 'engine', 'blocks', 'seconds' and 'blocks_per_second'.
+
+    Raises:
+        ValueError: If an engine is unknown or produces a different ciphertext.
+    """
+    available = available_engines()
+    engines = engines or list(available)
+    for name in engines:
+        if name not in available:
+            raise ValueError(f"Unknown or unavailable engine '{name}'. Expected one of: {', '.join(available)}.")
+
+    key = int.from_bytes(os.urandom(8), 'big')
+    data = os.urandom(8 * blocks)
+    expected = _int_engine(data, key)
+
+    results = []
+    for name in engines:
+        count = min(blocks, LIST_ENGINE_SAMPLE) if name == 'list' else blocks
+        sample = data[:8 * count]
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = available[name](sample, key)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if output != expected[:8 * count]:
+            raise ValueError(f"Engine '{name}' produced a different ciphertext.")
+        results.append({
+            'engine': name,
+            'blocks': count,
+            'seconds': best,
+            'blocks_per_second': count / best if best else float('inf')
+        })
+    return results
+
+def format_results(results):
+    """
+    Format benchmark results as a text table, with speedups relative to the list engine.
+
+    Args:
+        results (list): Output of `benchmark_engines`.
+
+    Returns:
+        str: The table.
+    """
+    baseline = next((r['blocks_per_second'] for r in results if r['engine'] == 'list'), None)
+    lines = [f"{'engine':<10}{'blocks':>8}{'seconds':>12}{'blocks/s':>14}{'speedup':>10}"]
+    for r in results:
+        speedup = f"{r['blocks_per_second'] / baseline:.1f}x" if baseline else '-'
+        lines.append(f"{r['engine']:<10}{r['blocks']:>8}{r['seconds']:>12.4f}{r['blocks_per_second']:>14,.0f}{speedup:>10}")
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the throughput of the DES engines.')
+    parser.add_argument('--blocks', type=int, default=4096, help='number of 64-bit blocks per run')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per engine')
+    parser.add_argument('--engines', nargs='+', help='engines to run (default: all available)')
+    args = parser.parse_args()
+    print(format_results(benchmark_engines(args.blocks, args.repeat, args.engines)))
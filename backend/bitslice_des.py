@@ -0,0 +1,248 @@
+# backend/bitslice_des.py
+
+from .des import IP, FP, E, P, S_BOX
+from .triple_des import key_stages
+
+# Bitsliced DES: bit j of the state is stored for N blocks at once in one Python
+# integer (a "slice"), block 0 in the most significant position. Permutations
+# become free renamings of slices and every S-box becomes a boolean circuit,
+# so a single pass of 16 rounds processes all N blocks in parallel.
+
+# bytes.translate tables: byte value -> b'1'/b'0' for bit k (0 = most significant)
+_BIT_TO_ASCII = [bytes(0x31 if (value >> (7 - k)) & 1 else 0x30 for value in range(256)) for k in range(8)]
+# b'0'/b'1' -> byte value 0/1
+_ASCII_TO_BIT = bytes.maketrans(b'01', b'\x00\x01')
+
+def _compile_sbox_circuit(sbox):
+    """
+    Build a two-level AND/OR circuit for one S-box.
+
+    The 6 input bits are split into halves (b1 b2 b3) and (b4 b5 b6). Each of
+    the 4 output bits is OR over the 8 minterms `a` of the first half of
+    (minterm a AND an OR of minterms of the second half).
+
+    Args:
+        sbox (list): 4 rows of 16 values.
+
+    Returns:
+        list: For each output bit, a list of (a, tuple of second-half minterms) terms.
+    """
+    circuit = []
+    for out_bit in range(4):
+        terms = []
+        for a in range(8):
+            minterms = []
+            for c in range(8):
+                value = (a << 3) | c
+                row = ((value >> 4) & 0b10) | (value & 1)
+                column = (value >> 1) & 0xF
+                if (sbox[row][column] >> (3 - out_bit)) & 1:
+                    minterms.append(c)
+            if minterms:
+                terms.append((a, tuple(minterms)))
+        circuit.append(terms)
+    return circuit
+
+# Boolean circuits for S1 to S8
+SBOX_CIRCUITS = [_compile_sbox_circuit(sbox) for sbox in S_BOX]
+
+def _minterms(x0, x1, x2, mask):
+    """
+    All 8 minterms of three slices, indexed by the 3-bit value (x0 most significant).
+    """
+    n0, n1, n2 = x0 ^ mask, x1 ^ mask, x2 ^ mask
+    pairs = (n0 & n1, n0 & x1, x0 & n1, x0 & x1)
+    minterms = []
+    for pair in pairs:
+        minterms.append(pair & n2)
+        minterms.append(pair & x2)
+    return minterms
+
+def _sbox(circuit, bits, mask):
+    """
+    Evaluate a bitsliced S-box.
+
+    Args:
+        circuit (list): Circuit from SBOX_CIRCUITS.
+        bits (list): 6 input slices.
+        mask (int): Slice with every block bit set.
+
+    Returns:
+        list: 4 output slices.
+    """
+    first = _minterms(bits[0], bits[1], bits[2], mask)
+    second = _minterms(bits[3], bits[4], bits[5], mask)
+    outputs = []
+    for terms in circuit:
+        result = 0
+        for a, minterms in terms:
+            if len(minterms) == 8:
+                result |= first[a]
+                continue
+            inner = 0
+            for c in minterms:
+                inner |= second[c]
+            result |= first[a] & inner
+        outputs.append(result)
+    return outputs
+
+def _crypt_slices(slices, stages, mask):
+    """
+    Run chained DES operations on a bitsliced state.
+
+    Args:
+        slices (list): 64 slices of the input blocks.
+        stages (list): Round keys (16 48-bit integers) for each stage.
+        mask (int): Slice with every block bit set.
+
+    Returns:
+        list: 64 slices of the output blocks.
+    """
+    # Initial Permutation is a renaming of slices
+    block = [slices[i - 1] for i in IP]
+    left, right = block[:32], block[32:]
+
+    for round_keys in stages:
+        for subkey in round_keys:
+            # Expansion and XOR with the subkey (a subkey bit of 1 complements the slice)
+            x = [right[i - 1] ^ mask if (subkey >> (47 - j)) & 1 else right[i - 1]
+                 for j, i in enumerate(E)]
+            sbox_output = []
+            for k in range(8):
+                sbox_output.extend(_sbox(SBOX_CIRCUITS[k], x[6 * k:6 * k + 6], mask))
+            left, right = right, [l ^ sbox_output[i - 1] for l, i in zip(left, P)]
+        # Undo the last swap: R16 + L16 feeds the Final Permutation (or the next stage)
+        left, right = right, left
+
+    block = left + right
+    return [block[i - 1] for i in FP]
+
+def to_slices(data):
+    """
+    Transpose whole 8-byte blocks into 64 bit slices.
+
+    Args:
+        data (bytes): Buffer of N blocks (length 8 * N).
+
+    Returns:
+        list: 64 integers; slice j holds bit j + 1 of every block.
+    """
+    slices = []
+    for column in range(8):
+        # Byte `column` of every block, then one bit of each of those bytes
+        column_bytes = data[column::8]
+        for k in range(8):
+            slices.append(int(column_bytes.translate(_BIT_TO_ASCII[k]), 2))
+    return slices
+
+def from_slices(slices, count):
+    """
+    Transpose 64 bit slices back into whole 8-byte blocks.
+
+    Args:
+        slices (list): 64 slices.
+        count (int): Number of blocks N.
+
+    Returns:
+        bytes: Buffer of N blocks.
+    """
+    output = bytearray(8 * count)
+    for column in range(8):
+        # Spread each slice to one byte per block, then merge the 8 bits of the column
+        value = 0
+        for k in range(8):
+            spread = format(slices[8 * column + k], f'0{count}b').encode('ascii').translate(_ASCII_TO_BIT)
+            value |= int.from_bytes(spread, 'big') << (7 - k)
+        output[column::8] = value.to_bytes(count, 'big')
+    return bytes(output)
+
+def crypt_bytes(data, stages):
+    """
+    Run chained DES operations on every block of a buffer in one bitsliced pass.
+
+    Args:
+        data (bytes): Buffer whose length is a multiple of 8.
+        stages (list): Round keys (16 48-bit integers) for each stage.
+
+    Returns:
+        bytes: The processed blocks.
+
+    Raises:
+        ValueError: If the buffer length is not a multiple of 8.
+    """
+    if len(data) % 8:
+        raise ValueError("Data length must be a multiple of 8 bytes.")
+    data = bytes(data)
+    count = len(data) // 8
+    if not count:
+        return b''
+    mask = (1 << count) - 1
+    return from_slices(_crypt_slices(to_slices(data), stages, mask), count)
+
+def encrypt_bytes(data, key):
+    """
+    Encrypt every 8-byte block of a buffer (ECB, no padding).
+
+    Args:
+        data (bytes): Buffer whose length is a multiple of 8.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+
+    Returns:
+        bytes: The ciphertext blocks.
+    """
+    return crypt_bytes(data, key_stages(key)[0])
+
+def decrypt_bytes(data, key):
+    """
+    Decrypt every 8-byte block of a buffer (ECB, no padding).
+
+    Args:
+        data (bytes): Buffer whose length is a multiple of 8.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+
+    Returns:
+        bytes: The plaintext blocks.
+    """
+    return crypt_bytes(data, key_stages(key)[1])
+
+def des_encrypt(block, key):
+    """
+    Encrypt a 64-bit block with the bitsliced engine.
+
+    Same arguments as `des.des_encrypt` with trace 'none'.
+
+    Args:
+        block (list): A list of 64 bits representing the plaintext.
+        key (list): A list of 64 bits representing the key.
+
+    Returns:
+        list: The ciphertext as a list of 64 bits.
+    """
+    return _crypt_bit_list(block, key, decrypt=False)
+
+def des_decrypt(block, key):
+    """
+    Decrypt a 64-bit block with the bitsliced engine.
+
+    Same arguments as `des.des_decrypt` with trace 'none'.
+
+    Args:
+        block (list): A list of 64 bits representing the ciphertext.
+        key (list): A list of 64 bits representing the key.
+
+    Returns:
+        list: The plaintext as a list of 64 bits.
+    """
+    return _crypt_bit_list(block, key, decrypt=True)
+
+def _crypt_bit_list(block, key, decrypt):
+    """
+    Run a single bit-list block through the bitsliced engine (a slice width of 1).
+
+    Raises:
+        ValueError: If the block or key is not 64 bits.
+    """
+    if len(block) != 64 or len(key) != 64:
+        raise ValueError("Block and key must be exactly 64 bits.")
+    forward, reverse = key_stages(int(''.join(str(bit) for bit in key), 2))
+    return _crypt_slices(list(block), reverse if decrypt else forward, 1)
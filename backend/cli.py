@@ -0,0 +1,373 @@
+# backend/cli.py
+
+import argparse
+import mmap
+import os
+import sys
+import tempfile
+import time
+import traceback
+from . import modes
+from .benchmark import benchmark_engines, format_results, available_engines
+from .conversions import hex_to_bytes, bytes_to_hex, is_hex, hex_to_int
+from .key_search import KeySpace, search_keys, format_search_result, SEARCH_ENGINES, DEFAULT_CHUNK_BITS
+from .parallel import ParallelCipher, DEFAULT_CHUNK_SIZE, PARALLEL_THRESHOLD
+
+try:
+    from . import mitm
+except ImportError:  # NumPy is optional
+    mitm = None
+
+# Key bundle sizes in bytes: DES, Triple-DES keying options 2 and 1
+KEY_SIZES = (8, 16, 24)
+
+def read_key_file(path):
+    """
+    Read a key from a file holding either hexadecimal text or raw key bytes.
+
+    Args:
+        path (str): Path to the key file.
+
+    Returns:
+        bytes: 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+
+    Raises:
+        ValueError: If the file does not contain a key of a supported size.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    text = content.strip()
+    if text.isascii() and is_hex(text.decode('ascii')) and len(text) in (2 * size for size in KEY_SIZES):
+        return hex_to_bytes(text.decode('ascii'))
+    if len(content) in KEY_SIZES:
+        return content
+    raise ValueError("Key file must contain 16, 32 or 48 hexadecimal characters, or 8, 16 or 24 raw bytes.")
+
+def resolve_key(args):
+    """
+    Get the key from --key or --key-file.
+
+    Raises:
+        ValueError: If the key is missing or invalid.
+    """
+    if args.key_file:
+        return read_key_file(args.key_file)
+    key = hex_to_bytes(args.key.strip())
+    if len(key) not in KEY_SIZES:
+        raise ValueError("Key must be 16, 32 or 48 hexadecimal characters.")
+    return key
+
+def _map_input(f):
+    """
+    Memory-map an input file read-only (an empty file cannot be mapped).
+    """
+    size = os.fstat(f.fileno()).st_size
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+def _crypt_mapped(cipher, fin, fout, args, encrypting, mode, iv):
+    """
+    Run the cipher from one open file into another through memory maps.
+
+    Returns:
+        tuple: (IV, or the one read from the input, bytes read, bytes written)
+    """
+    src = _map_input(fin)
+    offset = 0
+    if not encrypting and args.embed_iv:
+        # The IV was written in front of the ciphertext
+        if len(src) < modes.BLOCK_SIZE:
+            raise ValueError("Input is too short to contain an IV.")
+        iv = bytes(src[:modes.BLOCK_SIZE])
+        offset = modes.BLOCK_SIZE
+    view = memoryview(src)[offset:]
+    bytes_in = len(view)
+    header = iv if encrypting and args.embed_iv else b''
+    size = len(header) + (modes.output_size(bytes_in, mode, not args.no_padding) if encrypting else bytes_in)
+
+    fout.truncate(size)
+    dst = mmap.mmap(fout.fileno(), size) if size else bytearray()
+    target = memoryview(dst)[len(header):]
+    try:
+        dst[:len(header)] = header
+        if encrypting:
+            written = cipher.encrypt_into(view, target, mode, iv, not args.no_padding)
+        else:
+            written = cipher.decrypt_into(view, target, mode, iv, not args.no_padding)
+    except BaseException as error:
+        # Frames of the traceback still hold views of the maps, which could not be closed
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        # Views must be released before their maps can be closed
+        target.release()
+        view.release()
+        if isinstance(dst, mmap.mmap):
+            dst.flush()
+            dst.close()
+        if isinstance(src, mmap.mmap):
+            src.close()
+    fout.truncate(len(header) + written)
+    return iv, bytes_in, len(header) + written
+
+def _replace_output(temp_path, output):
+    """
+    Move a completed temporary file over the output file.
+
+    The output keeps its permissions if it exists; otherwise it gets the
+    permissions a plain open() would have given it.
+    """
+    if os.path.exists(output):
+        mode = os.stat(output).st_mode & 0o7777
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(temp_path, mode)
+    os.replace(temp_path, output)
+
+def _crypt_file(args, encrypting):
+    """
+    Encrypt or decrypt a file through memory maps on both sides.
+
+    The output is written to a temporary file next to it, sized for the worst
+    case, written in place through the map and truncated to the bytes actually
+    produced. It replaces the output file only once complete, so a failed run
+    (a wrong key with padding, an interrupt) leaves no truncated output behind.
+
+    Returns:
+        dict: Summary of the run.
+    """
+    key = resolve_key(args)
+    mode = args.mode.upper()
+    iv = hex_to_bytes(args.iv) if args.iv else None
+    if mode == 'ECB':
+        if iv is not None or args.embed_iv:
+            raise ValueError("ECB mode does not use an IV.")
+    elif iv is None and encrypting:
+        iv = modes.generate_iv()
+    if os.path.exists(args.output) and os.path.samefile(args.input, args.output):
+        raise ValueError("Input and output must be different files.")
+
+    cipher = ParallelCipher(key, args.workers, args.chunk_size, args.threshold, args.engine)
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(args.output) + '.',
+                                     dir=os.path.dirname(os.path.abspath(args.output)))
+    try:
+        start = time.perf_counter()
+        with os.fdopen(fd, 'w+b') as fout, cipher, open(args.input, 'rb') as fin:
+            iv, bytes_in, bytes_out = _crypt_mapped(cipher, fin, fout, args, encrypting, mode, iv)
+        elapsed = time.perf_counter() - start
+        _replace_output(temp_path, args.output)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return {
+        'operation': 'encrypt' if encrypting else 'decrypt',
+        'mode': mode,
+        'iv': bytes_to_hex(iv) if iv else None,
+        'bytes_in': bytes_in,
+        'bytes_out': bytes_out,
+        'seconds': elapsed,
+        'workers': cipher.workers
+    }
+
+def format_summary(summary):
+    """
+    Format the throughput summary of an encrypt/decrypt run.
+
+    Args:
+        summary (dict): Output of `_crypt_file`.
+
+    Returns:
+        str: One line per field.
+    """
+    seconds = summary['seconds']
+    rate = summary['bytes_in'] / seconds if seconds else float('inf')
+    lines = [
+        f"operation : {summary['operation']} ({summary['mode']})",
+        f"iv        : {summary['iv'] or '-'}",
+        f"input     : {summary['bytes_in']:,} bytes",
+        f"output    : {summary['bytes_out']:,} bytes",
+        f"workers   : {summary['workers']}",
+        f"time      : {seconds:.3f} s",
+        f"throughput: {rate / 1e6:.2f} MB/s ({rate / modes.BLOCK_SIZE:,.0f} blocks/s)"
+    ]
+    return '\n'.join(lines)
+
+def _check_blocks(blocks):
+    """
+    Validate hexadecimal plaintext/ciphertext blocks given on the command line.
+
+    Raises:
+        ValueError: If a block is not 16 hexadecimal characters.
+    """
+    if any(len(block) != 16 or not is_hex(block) for block in blocks):
+        raise ValueError("Plaintexts and ciphertexts must be 16 hexadecimal characters.")
+
+def _parse_pairs(pairs):
+    """
+    Parse PLAINTEXT:CIPHERTEXT options into integer pairs.
+
+    Raises:
+        ValueError: If a pair is malformed.
+    """
+    parsed = [pair.split(':') for pair in pairs]
+    if any(len(pair) != 2 for pair in parsed):
+        raise ValueError("Known pairs must be given as PLAINTEXT:CIPHERTEXT.")
+    _check_blocks([block for pair in parsed for block in pair])
+    return [(hex_to_int(p), hex_to_int(c)) for p, c in parsed]
+
+def _key_space(base, unknown_bits, mask):
+    """
+    Build a KeySpace from --unknown-bits or --mask.
+    """
+    if mask:
+        return KeySpace(hex_to_int(base), hex_to_int(mask))
+    return KeySpace.lowest_bits(hex_to_int(base), unknown_bits)
+
+def _progress(tested, total, seconds):
+    """
+    Print the progress of a key search, overwriting the previous line.
+    """
+    rate = tested / seconds if seconds else 0
+    print(f"\r{tested:,} / {total:,} keys ({100 * tested / total:.1f}%), {rate:,.0f} keys/s",
+          end='', file=sys.stderr, flush=True)
+
+def _search(args):
+    """
+    Run a known-plaintext key search, reporting progress on stderr.
+
+    Returns:
+        dict: Output of `search_keys`.
+    """
+    _check_blocks([args.plaintext, args.ciphertext] + ([args.complement_ciphertext] if args.complement_ciphertext else []))
+    space = _key_space(args.base_key, args.unknown_bits, args.mask)
+    result = search_keys(hex_to_int(args.plaintext), hex_to_int(args.ciphertext), space,
+                         hex_to_int(args.complement_ciphertext) if args.complement_ciphertext else None,
+                         _parse_pairs(args.pair), args.workers, args.chunk_bits, args.engine, not args.all,
+                         None if args.quiet else _progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    return result
+
+def _meet_in_the_middle(args):
+    """
+    Run the meet-in-the-middle attack on double DES, reporting progress on stderr.
+
+    Returns:
+        dict: Output of `mitm.meet_in_the_middle`.
+    """
+    if mitm is None:
+        raise ValueError("The meet-in-the-middle attack requires NumPy to be installed.")
+    _check_blocks([args.plaintext, args.ciphertext])
+    result = mitm.meet_in_the_middle(hex_to_int(args.plaintext), hex_to_int(args.ciphertext),
+                                     _key_space(args.key1_base, args.unknown_bits, args.mask),
+                                     _key_space(args.key2_base, args.unknown_bits, args.mask),
+                                     _parse_pairs(args.pair), args.memory_limit << 20, args.table_dir,
+                                     args.chunk_bits, None if args.quiet else _progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    return result
+
+def build_parser():
+    """
+    Build the argument parser for the encrypt, decrypt, bench, keysearch and mitm subcommands.
+    """
+    parser = argparse.ArgumentParser(prog='python -m backend.cli',
+                                     description='Encrypt and decrypt files with DES or Triple-DES.')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    for name in ('encrypt', 'decrypt'):
+        sub = subcommands.add_parser(name, help=f'{name} a file')
+        sub.add_argument('input', help='input file')
+        sub.add_argument('output', help='output file (overwritten)')
+        key = sub.add_mutually_exclusive_group(required=True)
+        key.add_argument('--key', help='key as 16, 32 or 48 hexadecimal characters')
+        key.add_argument('--key-file', help='file holding the key as hexadecimal text or raw bytes')
+        sub.add_argument('--mode', default='CBC', type=str.upper, choices=modes.MODES,
+                         help='mode of operation (default: CBC)')
+        sub.add_argument('--iv', help='IV as 16 hexadecimal characters (generated when encrypting without one)')
+        sub.add_argument('--embed-iv', action='store_true',
+                         help='write the IV in front of the ciphertext / read it from there')
+        sub.add_argument('--no-padding', action='store_true', help='do not add/remove PKCS#7 padding (ECB, CBC)')
+        sub.add_argument('--workers', type=int, default=1,
+                         help='worker processes for parallelizable modes (0: one per CPU; default: 1)')
+        sub.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='bytes per parallel task')
+        sub.add_argument('--threshold', type=int, default=PARALLEL_THRESHOLD,
+                         help='minimum input size in bytes for parallel processing')
+        sub.add_argument('--engine', choices=modes.BATCH_THRESHOLDS, help='batch engine (default: numpy if installed)')
+        sub.add_argument('--quiet', action='store_true', help='do not print the throughput summary')
+
+    bench = subcommands.add_parser('bench', help='compare the throughput of the DES engines')
+    bench.add_argument('--blocks', type=int, default=4096, help='number of 64-bit blocks per run')
+    bench.add_argument('--repeat', type=int, default=3, help='number of runs per engine')
+    bench.add_argument('--engines', nargs='+', choices=list(available_engines()), help='engines to run (default: all)')
+
+    search = subcommands.add_parser('keysearch', help='search a reduced key space with a known plaintext')
+    search.add_argument('--plaintext', required=True, help='known plaintext block (16 hexadecimal characters)')
+    search.add_argument('--ciphertext', required=True, help='its ciphertext block')
+    search.add_argument('--base-key', required=True, help='the known key bits, as a 16-character hexadecimal key')
+    unknown = search.add_mutually_exclusive_group(required=True)
+    unknown.add_argument('--unknown-bits', type=int, help='number of unknown key bits, lowest non-parity bits first')
+    unknown.add_argument('--mask', help='mask of the unknown key bits (16 hexadecimal characters)')
+    search.add_argument('--complement-ciphertext',
+                        help='ciphertext of the complemented plaintext, to test K and ~K per encryption')
+    search.add_argument('--pair', action='append', default=[], metavar='PLAINTEXT:CIPHERTEXT',
+                        help='further known pair used to discard false positives (repeatable)')
+    search.add_argument('--workers', type=int, default=1, help='worker processes (0: one per CPU; default: 1)')
+    search.add_argument('--chunk-bits', type=int, default=DEFAULT_CHUNK_BITS,
+                        help=f'log2 of the keys per task (default: {DEFAULT_CHUNK_BITS})')
+    search.add_argument('--engine', choices=SEARCH_ENGINES, help='search engine (default: numpy if installed)')
+    search.add_argument('--all', action='store_true', help='search the whole space instead of stopping at the first key')
+    search.add_argument('--quiet', action='store_true', help='do not print progress')
+
+    double = subcommands.add_parser('mitm', help='meet-in-the-middle attack on double DES over reduced key spaces')
+    double.add_argument('--plaintext', required=True, help='known plaintext block (16 hexadecimal characters)')
+    double.add_argument('--ciphertext', required=True, help='its double DES ciphertext block')
+    double.add_argument('--key1-base', required=True, help='the known bits of K1, as a 16-character hexadecimal key')
+    double.add_argument('--key2-base', required=True, help='the known bits of K2, as a 16-character hexadecimal key')
+    unknown = double.add_mutually_exclusive_group(required=True)
+    unknown.add_argument('--unknown-bits', type=int, help='number of unknown bits of each key, lowest non-parity bits first')
+    unknown.add_argument('--mask', help='mask of the unknown bits of each key (16 hexadecimal characters)')
+    double.add_argument('--pair', action='append', default=[], metavar='PLAINTEXT:CIPHERTEXT',
+                        help='further known pair used to discard false positives (repeatable)')
+    double.add_argument('--memory-limit', type=int, default=(mitm.DEFAULT_MEMORY_LIMIT if mitm else 256 << 20) >> 20,
+                        help='MiB of table kept in memory; larger tables are memory-mapped from a file')
+    double.add_argument('--table-dir', help='directory for the table file (default: system temporary directory)')
+    double.add_argument('--chunk-bits', type=int, default=DEFAULT_CHUNK_BITS,
+                        help=f'log2 of the keys per batch (default: {DEFAULT_CHUNK_BITS})')
+    double.add_argument('--quiet', action='store_true', help='do not print progress')
+    return parser
+
+def main(argv=None):
+    """
+    Entry point of `python -m backend.cli`.
+
+    Returns:
+        int: Process exit status.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == 'bench':
+            print(format_results(benchmark_engines(args.blocks, args.repeat, args.engines)))
+            return 0
+        if args.command == 'mitm':
+            result = _meet_in_the_middle(args)
+            print(mitm.format_mitm_result(result))
+            return 0 if result['keys'] else 2
+        if args.workers == 0:
+            args.workers = None  # One per CPU
+        if args.command == 'keysearch':
+            result = _search(args)
+            print(format_search_result(result))
+            return 0 if result['keys'] else 2
+        summary = _crypt_file(args, encrypting=args.command == 'encrypt')
+    except (ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(format_summary(summary), file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
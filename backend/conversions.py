@@ -0,0 +1,392 @@
+# backend/conversions.py
+
+import base64
+import binascii
+
+# Conversions between the representations used by the API: bytes, integers,
+# hexadecimal, base64, binary strings ('0101...') and bit lists ([0, 1, 0, 1, ...]).
+# Everything runs through C-level primitives (int.from_bytes, bytes.fromhex,
+# binascii, str.translate), so conversions take linear time at any length.
+
+# str.translate table deleting every binary digit: what is left is invalid
+_BINARY_DIGITS = {ord('0'): None, ord('1'): None}
+# str.translate table deleting every hexadecimal digit
+_HEX_DIGITS = {ord(c): None for c in '0123456789abcdefABCDEF'}
+# b'0'/b'1' -> byte value 0/1, and back
+_ASCII_TO_BIT = bytes.maketrans(b'01', b'\x00\x01')
+_BIT_TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+
+def is_hex(hex_str):
+    """
+    Check that a string is a non-empty run of hexadecimal digits.
+
+    Unlike int(hex_str, 16), signs, '0x' prefixes, underscores and whitespace are rejected.
+
+    Args:
+        hex_str (str): String to validate.
+
+    Returns:
+        bool: True if every character is a hexadecimal digit.
+    """
+    return bool(hex_str) and not hex_str.translate(_HEX_DIGITS)
+
+def is_binary(bin_str):
+    """
+    Check that a string only contains binary digits.
+
+    Args:
+        bin_str (str): String to validate.
+
+    Returns:
+        bool: True if every character is '0' or '1'.
+    """
+    return not bin_str.translate(_BINARY_DIGITS)
+
+def bytes_to_int(data):
+    """
+    Interpret a buffer as a big-endian unsigned integer.
+
+    Args:
+        data (bytes-like): The buffer.
+
+    Returns:
+        int: The integer value.
+    """
+    return int.from_bytes(data, 'big')
+
+def int_to_bytes(value, length):
+    """
+    Encode an unsigned integer as big-endian bytes.
+
+    Args:
+        value (int): The integer.
+        length (int): Output length in bytes.
+
+    Returns:
+        bytes: The encoded integer.
+
+    Raises:
+        ValueError: If the value does not fit in `length` bytes.
+    """
+    try:
+        return value.to_bytes(length, 'big')
+    except OverflowError:
+        raise ValueError(f"Value does not fit in {length} bytes.")
+
+def hex_to_bytes(hex_str):
+    """
+    Decode a hexadecimal string of any even length.
+
+    Args:
+        hex_str (str): Hexadecimal string.
+
+    Returns:
+        bytes: The decoded bytes.
+
+    Raises:
+        ValueError: If the string has an odd length or non-hexadecimal characters.
+    """
+    try:
+        return binascii.unhexlify(hex_str)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid hexadecimal input (an even number of hex characters is required).")
+
+def bytes_to_hex(data):
+    """
+    Encode a buffer as upper-case hexadecimal.
+
+    Args:
+        data (bytes-like): The buffer.
+
+    Returns:
+        str: Two hexadecimal characters per byte.
+    """
+    return binascii.hexlify(data).decode('ascii').upper()
+
+def hex_to_int(hex_str):
+    """
+    Parse a hexadecimal string of any length.
+
+    Raises:
+        ValueError: If the string contains non-hexadecimal characters.
+    """
+    if not is_hex(hex_str):
+        raise ValueError("Invalid hexadecimal input.")
+    return int(hex_str, 16)
+
+def int_to_hex(value, digits):
+    """
+    Format an unsigned integer as upper-case hexadecimal, zero-padded to `digits` characters.
+    """
+    return format(value, f'0{digits}X')
+
+def base64_to_bytes(b64_str):
+    """
+    Decode standard base64 (with padding).
+
+    Args:
+        b64_str (str or bytes): Base64 text.
+
+    Returns:
+        bytes: The decoded bytes.
+
+    Raises:
+        ValueError: If the input is not valid base64.
+    """
+    try:
+        return base64.b64decode(b64_str, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid base64 input.")
+
+def bytes_to_base64(data):
+    """
+    Encode a buffer as standard base64 text.
+    """
+    return base64.b64encode(data).decode('ascii')
+
+def binary_to_bytes(bin_str):
+    """
+    Decode a binary string whose length is a multiple of 8.
+
+    Args:
+        bin_str (str): Binary string, most significant bit first.
+
+    Returns:
+        bytes: The decoded bytes.
+
+    Raises:
+        ValueError: If the string has other characters or is not a whole number of bytes.
+    """
+    if not is_binary(bin_str) or len(bin_str) % 8:
+        raise ValueError("Binary input must be a whole number of bytes (a multiple of 8 bits).")
+    return int(bin_str, 2).to_bytes(len(bin_str) // 8, 'big') if bin_str else b''
+
+def bytes_to_binary(data):
+    """
+    Encode a buffer as a binary string of 8 characters per byte.
+    """
+    return format(int.from_bytes(data, 'big'), f'0{8 * len(data)}b') if len(data) else ''
+
+def binary_to_bits(bin_str):
+    """
+    Convert a binary string to a list of bits.
+
+    Raises:
+        ValueError: If the string contains characters other than '0' and '1'.
+    """
+    if not is_binary(bin_str):
+        raise ValueError("Invalid binary input.")
+    return list(bin_str.encode('ascii').translate(_ASCII_TO_BIT))
+
+def bits_to_binary(bits):
+    """
+    Convert a list of bits to a binary string.
+    """
+    return bytes(bits).translate(_BIT_TO_ASCII).decode('ascii')
+
+def bytes_to_bits(data):
+    """
+    Convert a buffer to a list of bits, most significant bit of the first byte first.
+    """
+    return list(bytes_to_binary(data).encode('ascii').translate(_ASCII_TO_BIT))
+
+def bits_to_bytes(bits):
+    """
+    Convert a list of bits (a multiple of 8) to bytes.
+
+    Raises:
+        ValueError: If the number of bits is not a multiple of 8.
+    """
+    return binary_to_bytes(bits_to_binary(bits))
+
+def hex_to_bits(hex_str):
+    """
+    Convert a hexadecimal string of any length to a list of 4 bits per digit.
+
+    Raises:
+        ValueError: If the string contains non-hexadecimal characters.
+    """
+    return binary_to_bits(format(hex_to_int(hex_str), f'0{4 * len(hex_str)}b'))
+
+def bits_to_hex(bits):
+    """
+    Convert a list of bits to upper-case hexadecimal, one digit per 4 bits (rounded up).
+    """
+    if not bits:
+        return ''
+    return int_to_hex(int(bits_to_binary(bits), 2), (len(bits) + 3) // 4)
+
+def hex_to_binary(hex_str):
+    """
+    Convert a hexadecimal string to a binary string of 4 characters per digit.
+
+    Raises:
+        ValueError: If the string contains non-hexadecimal characters.
+    """
+    return format(hex_to_int(hex_str), f'0{4 * len(hex_str)}b')
+
+def text_to_bytes(text):
+    """
+    Encode ASCII text.
+
+    Raises:
+        ValueError: If the text contains non-ASCII characters.
+    """
+    try:
+        return text.encode('ascii')
+    except UnicodeEncodeError:
+        raise ValueError("Text contains non-ASCII characters.")
+
+# Input formats understood by StreamDecoder
+INPUT_FORMATS = ('hex', 'binary', 'text', 'base64')
+
+# Characters per decoding unit for each format (2 hex digits -> 1 byte,
+# 8 binary digits -> 1 byte, 4 base64 characters -> 3 bytes, 1 character -> 1 byte)
+_UNIT_CHARS = {'hex': 2, 'binary': 8, 'base64': 4, 'text': 1}
+
+_WHITESPACE = b' \t\r\n\x0b\x0c'
+
+class StreamDecoder:
+    """
+    Incremental decoder for hex, binary, text and base64 input.
+
+    Each chunk is validated and decoded in the same pass; only the trailing
+    characters of an incomplete unit (an odd hex digit, a partial byte of
+    binary, a partial base64 quantum) are carried over to the next chunk.
+
+    Usage:
+        decoder = StreamDecoder('hex')
+        for chunk in chunks:
+            process(decoder.feed(chunk))
+        process(decoder.finish())
+    """
+
+    __slots__ = ('input_format', 'ignore_whitespace', 'length', '_pending', '_padded')
+
+    def __init__(self, input_format, ignore_whitespace=True):
+        """
+        Args:
+            input_format (str): One of INPUT_FORMATS.
+            ignore_whitespace (bool): Skip ASCII whitespace (e.g. line breaks in a file).
+                Never applied to text input, where whitespace is data.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"Unsupported input format '{input_format}'. Expected one of: {', '.join(INPUT_FORMATS)}.")
+        self.input_format = input_format
+        self.ignore_whitespace = ignore_whitespace and input_format != 'text'
+        self.length = 0  # Decoded bytes so far
+        self._pending = b''
+        self._padded = False
+
+    def feed(self, chunk):
+        """
+        Validate and decode the next chunk of input.
+
+        Args:
+            chunk (str or bytes-like): The next characters of the input.
+
+        Returns:
+            bytes: The bytes decoded from every complete unit seen so far.
+
+        Raises:
+            ValueError: If the chunk contains invalid characters.
+        """
+        if isinstance(chunk, str):
+            try:
+                chunk = chunk.encode('ascii')
+            except UnicodeEncodeError:
+                raise ValueError("Input contains non-ASCII characters.")
+        else:
+            chunk = bytes(chunk)
+            if not chunk.isascii():
+                raise ValueError("Input contains non-ASCII characters.")
+        if self.ignore_whitespace:
+            chunk = chunk.translate(None, _WHITESPACE)
+        if not chunk:
+            return b''
+        if self.input_format == 'text':
+            self.length += len(chunk)
+            return chunk
+
+        data = self._pending + chunk if self._pending else chunk
+        usable = len(data) - len(data) % _UNIT_CHARS[self.input_format]
+        self._pending = data[usable:]
+        decoded = self._decode(data[:usable]) if usable else b''
+        self.length += len(decoded)
+        return decoded
+
+    def finish(self):
+        """
+        Check that the input ended on a whole unit.
+
+        Returns:
+            bytes: Always empty; every complete unit was already returned by `feed`.
+
+        Raises:
+            ValueError: If characters of an incomplete unit are left over.
+        """
+        if self._pending:
+            if self.input_format == 'hex':
+                raise ValueError("Invalid hexadecimal input (an even number of hex characters is required).")
+            if self.input_format == 'binary':
+                raise ValueError("Binary input must be a whole number of bytes (a multiple of 8 bits).")
+            raise ValueError("Invalid base64 input (length must be a multiple of 4).")
+        return b''
+
+    def _decode(self, data):
+        """
+        Decode whole units of the current format.
+        """
+        if self.input_format == 'hex':
+            try:
+                return binascii.unhexlify(data)
+            except binascii.Error:
+                raise ValueError("Invalid hexadecimal input.")
+        if self.input_format == 'binary':
+            if data.translate(None, b'01'):
+                raise ValueError("Invalid binary input.")
+            return int(data, 2).to_bytes(len(data) // 8, 'big')
+        # Padding may only close the last quantum of the input
+        if self._padded:
+            raise ValueError("Invalid base64 input (data after padding).")
+        self._padded = data.endswith(b'=')
+        return base64_to_bytes(data)
+
+def decode_input(data, input_format):
+    """
+    Decode a complete input in one of INPUT_FORMATS to bytes.
+
+    Args:
+        data (str or bytes-like): The input.
+        input_format (str): One of INPUT_FORMATS.
+
+    Returns:
+        bytes: The decoded input.
+
+    Raises:
+        ValueError: If the format is unsupported or the input is invalid.
+    """
+    decoder = StreamDecoder(input_format, ignore_whitespace=False)
+    return decoder.feed(data) + decoder.finish()
+
+def decode_stream(chunks, input_format):
+    """
+    Decode an iterable of input chunks, yielding bytes as soon as they are complete.
+
+    Args:
+        chunks (iterable): str or bytes chunks, e.g. from a file or request stream.
+        input_format (str): One of INPUT_FORMATS.
+
+    Yields:
+        bytes: Decoded data (possibly empty for chunks shorter than a unit).
+
+    Raises:
+        ValueError: If the format is unsupported or the input is invalid.
+    """
+    decoder = StreamDecoder(input_format)
+    for chunk in chunks:
+        yield decoder.feed(chunk)
+    decoder.finish()
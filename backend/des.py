@@ -1,7 +1,8 @@
 # backend/des.py
 
-from .key_expansion import generate_keys
-from .utils import permute, shift_left, xor
+import struct
+from .key_expansion import get_key_schedule
+from .utils import permute, shift_left, xor, bits_to_int, int_to_bits, compile_permutation, permute_int
 
 # Initial Permutation (IP) Table
 IP = [
@@ -111,6 +112,49 @@ S_BOX = [
     ]
 ]
 
+# Trace levels for des_encrypt/des_decrypt
+TRACE_NONE = 'none'
+TRACE_SUMMARY = 'summary'
+TRACE_FULL = 'full'
+TRACE_LEVELS = (TRACE_NONE, TRACE_SUMMARY, TRACE_FULL)
+
+# Wire formats of round traces: bit lists, a hex string per field, or one hex string per round
+TRACE_FORMAT_BITS = 'bits'
+TRACE_FORMAT_HEX = 'hex'
+TRACE_FORMAT_PACKED = 'packed'
+TRACE_FORMATS = (TRACE_FORMAT_BITS, TRACE_FORMAT_HEX, TRACE_FORMAT_PACKED)
+
+# Byte-indexed lookup tables for the integer engine
+IP_TABLES = compile_permutation(IP, 64)
+FP_TABLES = compile_permutation(FP, 64)
+E_TABLES = compile_permutation(E, 32)
+P_TABLES = compile_permutation(P, 32)
+
+def compile_sp_tables(s_boxes, p_tables):
+    """
+    Merge the S-boxes with the P permutation into 64-entry lookup tables.
+
+    Args:
+        s_boxes (list): Eight S-boxes, each 4 rows of 16 values.
+        p_tables (list): Byte-indexed tables for P, as built by `compile_permutation`.
+
+    Returns:
+        list: Eight tables mapping a 6-bit S-box input to its 32-bit output after P.
+    """
+    sp_tables = []
+    for i, sbox in enumerate(s_boxes):
+        lookup = []
+        for value in range(64):
+            # Row from the outer bits, column from the middle 4 bits
+            row = ((value >> 4) & 0b10) | (value & 1)
+            column = (value >> 1) & 0xF
+            lookup.append(permute_int(sbox[row][column] << (28 - 4 * i), p_tables))
+        sp_tables.append(lookup)
+    return sp_tables
+
+# S-box + P lookup tables (SP1 to SP8)
+SP_TABLES = compile_sp_tables(S_BOX, P_TABLES)
+
 def initial_permutation(block):
     """
     Apply the Initial Permutation (IP) to the input block.
@@ -155,11 +199,11 @@ def feistel(right, subkey):
     # Permutation (P)
     p_result = permute(sbox_output, P)
     return {
-        'expanded_right': expanded_right.copy(),
-        'xor_with_subkey': xor_result.copy(),
-        'sbox_output': sbox_output.copy(),
-        'sbox_details': sbox_details.copy(),
-        'permutation_output': p_result.copy()
+        'expanded_right': expanded_right,
+        'xor_with_subkey': xor_result,
+        'sbox_output': sbox_output,
+        'sbox_details': sbox_details,
+        'permutation_output': p_result
     }
 
 def s_box_substitution(x):
@@ -195,120 +239,634 @@ def s_box_substitution(x):
         })
     return output, sbox_details
 
-def des_encrypt(block, key):
+def des_crypt_bits(block, round_keys):
     """
-    Encrypt a 64-bit block using DES.
+    Run DES on bit lists through `feistel` and `s_box_substitution`.
+
+    The original list-of-bits engine, kept as the reference the integer,
+    bitsliced and NumPy engines are benchmarked and checked against.
 
     Args:
-        block (list): A list of 64 bits representing the plaintext.
-        key (list): A list of 64 bits representing the key.
+        block (list): A list of 64 bits.
+        round_keys (list): 16 round keys as lists of 48 bits, in the order they are applied.
 
     Returns:
-        tuple: (ciphertext as list of 64 bits, round details as list of dicts)
+        list: The output block as a list of 64 bits.
     """
-    # Initial Permutation
     permuted_block = initial_permutation(block)
     left = permuted_block[:32]
     right = permuted_block[32:]
+    for subkey in round_keys:
+        left, right = right, xor(left, feistel(right, subkey)['permutation_output'])
+    return final_permutation(right + left)
+
+def des_rounds_int(left, right, round_keys, e_tables=E_TABLES, sp_tables=SP_TABLES):
+    """
+    Apply DES rounds to the two 32-bit halves of a block.
+
+    This is the one round function shared by every integer engine: expansion
+    and XOR with the subkey, then S-box substitution and permutation (P) in
+    one lookup per S-box. Callers that need each round's state pass one
+    round key at a time.
+
+    Args:
+        left (int): The 32-bit left half.
+        right (int): The 32-bit right half.
+        round_keys (iterable): Round keys as 48-bit integers, in the order they are applied.
+        e_tables, sp_tables (list): Compiled tables; the DES ones by default.
+
+    Returns:
+        tuple: (left, right) after the last round, without the final swap undone.
+    """
+    e0, e1, e2, e3 = e_tables
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = sp_tables
+
+    for subkey in round_keys:
+        x = (e0[right >> 24] | e1[(right >> 16) & 0xFF] |
+             e2[(right >> 8) & 0xFF] | e3[right & 0xFF]) ^ subkey
+        left, right = right, left ^ (
+            sp0[x >> 42] | sp1[(x >> 36) & 0x3F] | sp2[(x >> 30) & 0x3F] | sp3[(x >> 24) & 0x3F] |
+            sp4[(x >> 18) & 0x3F] | sp5[(x >> 12) & 0x3F] | sp6[(x >> 6) & 0x3F] | sp7[x & 0x3F])
+    return left, right
+
+def des_crypt_int(block, round_keys, ip_tables=IP_TABLES, e_tables=E_TABLES, sp_tables=SP_TABLES,
+                  fp_tables=FP_TABLES):
+    """
+    Run the 16 DES rounds on a 64-bit integer block.
+
+    Encryption and decryption differ only in the order of the round keys.
+
+    Args:
+        block (int): The 64-bit input block.
+        round_keys (list): 16 round keys as 48-bit integers, in the order they are applied.
+        ip_tables, e_tables, sp_tables, fp_tables (list): Compiled tables; the
+            DES ones by default, or those of a `variants.CompiledVariant`.
+
+    Returns:
+        int: The 64-bit output block.
+    """
+    ip0, ip1, ip2, ip3, ip4, ip5, ip6, ip7 = ip_tables
+
+    # Initial Permutation
+    block = (ip0[block >> 56] | ip1[(block >> 48) & 0xFF] | ip2[(block >> 40) & 0xFF] |
+             ip3[(block >> 32) & 0xFF] | ip4[(block >> 24) & 0xFF] | ip5[(block >> 16) & 0xFF] |
+             ip6[(block >> 8) & 0xFF] | ip7[block & 0xFF])
+    left, right = des_rounds_int(block >> 32, block & 0xFFFFFFFF, round_keys, e_tables, sp_tables)
+
+    # Final Permutation of R16 + L16
+    block = (right << 32) | left
+    fp0, fp1, fp2, fp3, fp4, fp5, fp6, fp7 = fp_tables
+    return (fp0[block >> 56] | fp1[(block >> 48) & 0xFF] | fp2[(block >> 40) & 0xFF] |
+            fp3[(block >> 32) & 0xFF] | fp4[(block >> 24) & 0xFF] | fp5[(block >> 16) & 0xFF] |
+            fp6[(block >> 8) & 0xFF] | fp7[block & 0xFF])
+
+def des_encrypt_int(block, key):
+    """
+    Encrypt a 64-bit integer block using the integer engine.
+
+    Args:
+        block (int): The 64-bit plaintext.
+        key (int): The 64-bit key.
+
+    Returns:
+        int: The 64-bit ciphertext.
+    """
+    return des_crypt_int(block, get_key_schedule(key).forward)
+
+def des_decrypt_int(block, key):
+    """
+    Decrypt a 64-bit integer block using the integer engine.
+
+    Args:
+        block (int): The 64-bit ciphertext.
+        key (int): The 64-bit key.
+
+    Returns:
+        int: The 64-bit plaintext.
+    """
+    return des_crypt_int(block, get_key_schedule(key).reverse)
+
+class DESCipher:
+    """
+    A DES key compiled once for repeated use.
+
+    Holds the round keys for both directions, so encrypting or decrypting a
+    block costs only the 16 rounds. Blocks are 64-bit integers or 8-byte
+    buffers; runs of blocks are iterables of integers or buffers whose
+    length is a multiple of 8.
+    """
+
+    __slots__ = ('forward', 'reverse')
+
+    def __init__(self, key):
+        """
+        Args:
+            key (int, bytes or list): The key as a 64-bit integer, 8 bytes or a list of 64 bits.
+
+        Raises:
+            ValueError: If the key is not 64 bits.
+        """
+        if isinstance(key, list):
+            if len(key) != 64:
+                raise ValueError("Key must be exactly 64 bits.")
+            key = bits_to_int(key)
+        elif not isinstance(key, int):
+            if len(key) != 8:
+                raise ValueError("Key must be exactly 8 bytes.")
+            key = int.from_bytes(key, 'big')
+        elif not 0 <= key < 1 << 64:
+            raise ValueError("Key must be a 64-bit value.")
+        self.forward, self.reverse = get_key_schedule(key)
+
+    @classmethod
+    def from_round_keys(cls, forward, reverse):
+        """
+        Build a cipher from already compiled round keys (e.g. sent to a worker process).
+
+        Args:
+            forward (tuple): 16 48-bit round keys in encryption order.
+            reverse (tuple): The same round keys in decryption order.
+
+        Returns:
+            DESCipher: The cipher.
+        """
+        cipher = cls.__new__(cls)
+        cipher.forward, cipher.reverse = tuple(forward), tuple(reverse)
+        return cipher
+
+    def encrypt_block(self, block):
+        """
+        Encrypt one block.
+
+        Args:
+            block (int or bytes): 64-bit integer or 8-byte buffer.
+
+        Returns:
+            int or bytes: The ciphertext block, of the same type as the input.
+        """
+        return _crypt_one(block, self.forward)
+
+    def decrypt_block(self, block):
+        """
+        Decrypt one block.
+
+        Args:
+            block (int or bytes): 64-bit integer or 8-byte buffer.
+
+        Returns:
+            int or bytes: The plaintext block, of the same type as the input.
+        """
+        return _crypt_one(block, self.reverse)
+
+    def encrypt_blocks(self, blocks):
+        """
+        Encrypt a run of independent blocks (ECB, no padding).
+
+        Args:
+            blocks (iterable or bytes): 64-bit integers, or a buffer whose length is a multiple of 8.
+
+        Returns:
+            list or bytes: Ciphertext integers, or bytes for buffer input.
+        """
+        return _crypt_many(blocks, self.forward)
+
+    def decrypt_blocks(self, blocks):
+        """
+        Decrypt a run of independent blocks (ECB, no padding).
+
+        Args:
+            blocks (iterable or bytes): 64-bit integers, or a buffer whose length is a multiple of 8.
+
+        Returns:
+            list or bytes: Plaintext integers, or bytes for buffer input.
+        """
+        return _crypt_many(blocks, self.reverse)
+
+    def encrypt_into(self, src, dst):
+        """
+        Encrypt the blocks of one buffer into another (ECB, no padding).
+
+        Args:
+            src (bytes-like): Any buffer (bytes, bytearray, memoryview, mmap)
+                whose length is a multiple of 8.
+            dst (bytes-like): Writable buffer of at least len(src) bytes; may be src itself.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        return _crypt_into(src, dst, self.forward)
+
+    def decrypt_into(self, src, dst):
+        """
+        Decrypt the blocks of one buffer into another (ECB, no padding).
+
+        Args:
+            src (bytes-like): Any buffer whose length is a multiple of 8.
+            dst (bytes-like): Writable buffer of at least len(src) bytes; may be src itself.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        return _crypt_into(src, dst, self.reverse)
+
+def _crypt_one(block, round_keys):
+    """
+    Run one integer or 8-byte block through `des_crypt_int`.
+
+    Raises:
+        ValueError: If a buffer block is not 8 bytes.
+    """
+    if isinstance(block, int):
+        return des_crypt_int(block, round_keys)
+    if len(block) != 8:
+        raise ValueError("Block must be exactly 8 bytes.")
+    return des_crypt_int(int.from_bytes(block, 'big'), round_keys).to_bytes(8, 'big')
+
+def _crypt_many(blocks, round_keys):
+    """
+    Run integer blocks, or the 8-byte blocks of a buffer, through `des_crypt_int`.
+
+    Raises:
+        ValueError: If a buffer length is not a multiple of 8.
+    """
+    if isinstance(blocks, (list, tuple)):
+        return [des_crypt_int(block, round_keys) for block in blocks]
+    try:
+        view = memoryview(blocks)
+    except TypeError:
+        return [des_crypt_int(block, round_keys) for block in blocks]
+    output = bytearray(view.nbytes)
+    _crypt_into(view, output, round_keys)
+    return bytes(output)
+
+# Blocks unpacked at a time by `_crypt_into`, bounding its temporary memory
+INTO_BATCH_BLOCKS = 4096
+
+def _crypt_into(src, dst, round_keys):
+    """
+    Run the 8-byte blocks of a buffer through `des_crypt_int` into a writable buffer.
+
+    Blocks are read with `struct.unpack_from` and written with `struct.pack_into`
+    a batch at a time, so no copy of the whole input or output is made.
+
+    Raises:
+        ValueError: If the source length is not a multiple of 8 or the destination is too small.
+    """
+    src = memoryview(src).cast('B')
+    dst = memoryview(dst).cast('B')
+    length = src.nbytes
+    if length % 8:
+        raise ValueError("Data length must be a multiple of 8 bytes.")
+    if dst.nbytes < length:
+        raise ValueError("Output buffer is too small.")
+    for offset in range(0, length, 8 * INTO_BATCH_BLOCKS):
+        count = min(INTO_BATCH_BLOCKS, (length - offset) // 8)
+        layout = f'>{count}Q'
+        struct.pack_into(layout, dst, offset,
+                         *[des_crypt_int(block, round_keys) for block in struct.unpack_from(layout, src, offset)])
+    return length
+
+def des_crypt_states_int(block, round_keys, ip_tables=IP_TABLES, e_tables=E_TABLES, sp_tables=SP_TABLES,
+                         fp_tables=FP_TABLES):
+    """
+    Run the DES rounds on a 64-bit integer block, recording L and R after each round.
+
+    Args:
+        block (int): The 64-bit input block.
+        round_keys (list): Round keys as 48-bit integers, in the order they are applied.
+        ip_tables, e_tables, sp_tables, fp_tables (list): Compiled tables, as for `des_crypt_int`.
 
-    # Key Schedule
-    round_keys = generate_keys(key)
+    Returns:
+        tuple: (64-bit output block, list of (left, right) 32-bit integer pairs,
+            starting with the state after the Initial Permutation)
+    """
+    block = permute_int(block, ip_tables)
+    left = block >> 32
+    right = block & 0xFFFFFFFF
+    states = [(left, right)]
+
+    for subkey in round_keys:
+        left, right = des_rounds_int(left, right, (subkey,), e_tables, sp_tables)
+        states.append((left, right))
+
+    return permute_int((right << 32) | left, fp_tables), states
+
+# Width in bits of every packed RoundTrace field, in trace order
+ROUND_TRACE_FIELDS = (
+    ('subkey', 48),
+    ('left_before', 32),
+    ('right_before', 32),
+    ('expanded_right', 48),
+    ('xor_with_subkey', 48),
+    ('sbox_output', 32),
+    ('permutation_output', 32),
+    ('left_after', 32),
+    ('right_after', 32)
+)
+ROUND_TRACE_WIDTHS = dict(ROUND_TRACE_FIELDS)
+
+# S-box outputs indexed by the 6-bit input (row from the outer bits, column from the middle 4)
+S_BOX_LOOKUP = [[sbox[((value >> 4) & 0b10) | (value & 1)][(value >> 1) & 0xF] for value in range(64)]
+                for sbox in S_BOX]
+
+class RoundTrace:
+    """
+    Intermediate values of one DES round, each packed into an integer.
+
+    A summary trace only has L and R before and after the round; the other
+    fields are None. Bit lists and the S-box breakdown are derived on demand,
+    so a round costs ten integers instead of ~350 list items and eight dicts.
+    """
+
+    __slots__ = ('round',) + tuple(name for name, _ in ROUND_TRACE_FIELDS)
+
+    def __init__(self, number, left_before, right_before, left_after, right_after, subkey=None,
+                 expanded_right=None, xor_with_subkey=None, sbox_output=None, permutation_output=None):
+        """
+        Args:
+            number (int): The round number, from 1.
+            left_before, right_before, left_after, right_after (int): 32-bit halves.
+            subkey, expanded_right, xor_with_subkey (int): 48-bit values (full traces only).
+            sbox_output, permutation_output (int): 32-bit values (full traces only).
+        """
+        self.round = number
+        self.left_before = left_before
+        self.right_before = right_before
+        self.left_after = left_after
+        self.right_after = right_after
+        self.subkey = subkey
+        self.expanded_right = expanded_right
+        self.xor_with_subkey = xor_with_subkey
+        self.sbox_output = sbox_output
+        self.permutation_output = permutation_output
+
+    @property
+    def full(self):
+        """
+        Whether every intermediate value was recorded.
+        """
+        return self.subkey is not None
+
+    def fields(self):
+        """
+        Names of the recorded fields, in trace order.
+        """
+        return [name for name, _ in ROUND_TRACE_FIELDS if getattr(self, name) is not None]
+
+    def bits(self, field):
+        """
+        One field as a list of bits (most significant bit first).
+
+        Raises:
+            ValueError: If the field is unknown or was not recorded.
+        """
+        if field not in ROUND_TRACE_WIDTHS or getattr(self, field) is None:
+            raise ValueError(f"Field '{field}' is not part of this round trace.")
+        return int_to_bits(getattr(self, field), ROUND_TRACE_WIDTHS[field])
+
+    @property
+    def sbox_details(self):
+        """
+        Input, row, column and output of each S-box, as built by `s_box_substitution`.
+        """
+        details = []
+        for i in range(8):
+            block = (self.xor_with_subkey >> (42 - 6 * i)) & 0x3F
+            details.append({
+                'sbox': f'S{i+1}',
+                'input': format(block, '06b'),
+                'row': ((block >> 4) & 0b10) | (block & 1),
+                'column': (block >> 1) & 0xF,
+                'output': format((self.sbox_output >> (28 - 4 * i)) & 0xF, '04b')
+            })
+        return details
+
+    def summary(self):
+        """
+        The summary trace of this round: L and R before and after it only.
+        """
+        return RoundTrace(self.round, self.left_before, self.right_before, self.left_after, self.right_after)
+
+    def to_dict(self):
+        """
+        The round as a dict of bit lists, the format the frontend and reports use.
+        """
+        round_info = {'round': self.round}
+        for field in self.fields():
+            round_info[field] = self.bits(field)
+            if field == 'sbox_output':
+                round_info['sbox_details'] = self.sbox_details
+        return round_info
+
+    def to_hex(self):
+        """
+        The round as a dict of zero-padded hexadecimal strings, for storage and compact responses.
+        """
+        round_info = {'round': self.round}
+        for field in self.fields():
+            round_info[field] = format(getattr(self, field), f'0{ROUND_TRACE_WIDTHS[field] // 4}X')
+        return round_info
+
+    def to_packed(self):
+        """
+        All recorded fields concatenated in trace order, as one hexadecimal string.
+        """
+        return ''.join(format(getattr(self, field), f'0{ROUND_TRACE_WIDTHS[field] // 4}X') for field in self.fields())
+
+    @classmethod
+    def from_packed(cls, number, packed, fields):
+        """
+        Rebuild a round trace from the output of `to_packed`.
+
+        Args:
+            number (int): The round number.
+            packed (str): The packed hexadecimal string.
+            fields (list): The recorded fields, in trace order.
+
+        Raises:
+            ValueError: If a field is unknown or the string does not match the fields.
+        """
+        values = {}
+        offset = 0
+        for field in fields:
+            if field not in ROUND_TRACE_WIDTHS:
+                raise ValueError(f"Unknown round trace field '{field}'.")
+            digits = ROUND_TRACE_WIDTHS[field] // 4
+            values[field] = int(packed[offset:offset + digits], 16)
+            offset += digits
+        if offset != len(packed):
+            raise ValueError("Packed round trace length does not match its fields.")
+        try:
+            return cls(number, **values)
+        except TypeError:
+            raise ValueError("A round trace needs L/R before and after the round.")
+
+    @classmethod
+    def from_hex(cls, round_info):
+        """
+        Rebuild a round trace from the output of `to_hex`.
+
+        Raises:
+            ValueError: If a field is missing or not hexadecimal.
+        """
+        values = {field: int(value, 16) for field, value in round_info.items()
+                  if field in ROUND_TRACE_WIDTHS}
+        try:
+            return cls(round_info['round'], **values)
+        except (KeyError, TypeError):
+            raise ValueError("A round trace needs 'round' and L/R before and after the round.")
+
+def pack_round_details(round_details):
+    """
+    Serialize round traces in the packed wire format.
+
+    Args:
+        round_details (list): RoundTrace objects of one run (all full or all summary).
+
+    Returns:
+        dict: 'fields' ([name, bit width] pairs, in packing order) and 'rounds'
+            (one hexadecimal string per round, the fields concatenated).
+    """
+    fields = round_details[0].fields() if round_details else []
+    return {
+        'fields': [[field, ROUND_TRACE_WIDTHS[field]] for field in fields],
+        'rounds': [round_trace.to_packed() for round_trace in round_details]
+    }
+
+def unpack_round_details(packed):
+    """
+    Rebuild round traces from the output of `pack_round_details`.
+
+    Raises:
+        ValueError: If the packed data is malformed.
+    """
+    try:
+        fields = dict(packed['fields'])
+        rounds = packed['rounds']
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Packed round details need 'fields' ([name, bit width] pairs) and 'rounds'.")
+    for field, width in fields.items():
+        if ROUND_TRACE_WIDTHS.get(field) != width:
+            raise ValueError(f"Unknown round trace field '{field}' ({width} bits).")
+    if not isinstance(rounds, list) or not all(isinstance(round_packed, str) for round_packed in rounds):
+        raise ValueError("Packed rounds must be a list of hexadecimal strings.")
+    return [RoundTrace.from_packed(i + 1, round_packed, fields) for i, round_packed in enumerate(rounds)]
+
+def _summary_trace(block, round_keys):
+    """
+    Run DES on a bit-list block and collect only L and R for each round.
+
+    Args:
+        block (list): A list of 64 bits.
+        round_keys (list): 16 round keys as 48-bit integers, in the order they are applied.
+
+    Returns:
+        tuple: (output as list of 64 bits, list of RoundTrace)
+    """
+    output, states = des_crypt_states_int(bits_to_int(block), round_keys)
+    round_details = []
+    for i in range(len(round_keys)):
+        round_details.append(RoundTrace(i + 1, *states[i], *states[i + 1]))
+    return int_to_bits(output, 64), round_details
+
+def _full_trace(block, round_keys):
+    """
+    Run DES on a bit-list block and collect every intermediate value of each round.
+
+    Args:
+        block (list): A list of 64 bits.
+        round_keys (list): 16 round keys as 48-bit integers, in the order they are applied.
+
+    Returns:
+        tuple: (output as list of 64 bits, list of RoundTrace)
+    """
+    # Initial Permutation
+    permuted_block = permute_int(bits_to_int(block), IP_TABLES)
+    left = permuted_block >> 32
+    right = permuted_block & 0xFFFFFFFF
 
     round_details = []
 
-    for i in range(16):
-        round_number = i + 1
-        feistel_output = feistel(right, round_keys[i])
-
-        # Extract S-box details
-        sbox_output, sbox_details = s_box_substitution(feistel_output['xor_with_subkey'])
-
-        # Update feistel_output with S-box details
-        feistel_output['sbox_output'] = sbox_output
-        feistel_output['sbox_details'] = sbox_details
-
-        # XOR with left
-        new_right = xor(left, feistel_output['permutation_output'])
-
-        # Collect round details
-        round_info = {
-            'round': round_number,
-            'subkey': round_keys[i].copy(),
-            'left_before': left.copy(),
-            'right_before': right.copy(),
-            'expanded_right': feistel_output['expanded_right'],
-            'xor_with_subkey': feistel_output['xor_with_subkey'],
-            'sbox_output': feistel_output['sbox_output'],
-            'sbox_details': feistel_output['sbox_details'],
-            'permutation_output': feistel_output['permutation_output'],
-            'left_after': right.copy(),
-            'right_after': new_right.copy()
-        }
-        round_details.append(round_info)
+    for i, subkey in enumerate(round_keys):
+        expanded_right = permute_int(right, E_TABLES)
+        x = expanded_right ^ subkey
+        sbox_output = 0
+        for j in range(8):
+            sbox_output |= S_BOX_LOOKUP[j][(x >> (42 - 6 * j)) & 0x3F] << (28 - 4 * j)
+        _, new_right = des_rounds_int(left, right, (subkey,))
+        permutation_output = left ^ new_right
+
+        round_details.append(RoundTrace(i + 1, left, right, right, new_right, subkey, expanded_right, x,
+                                        sbox_output, permutation_output))
 
         # Update left and right for next round
         left = right
         right = new_right
 
-    combined = right + left
-    final_block = final_permutation(combined)
-    return final_block, round_details
+    return int_to_bits(permute_int((right << 32) | left, FP_TABLES), 64), round_details
 
-def des_decrypt(block, key):
+def _run(block, key, trace, decrypt):
     """
-    Decrypt a 64-bit block using DES.
+    Run DES on a bit-list block at the requested trace level.
 
     Args:
-        block (list): A list of 64 bits representing the ciphertext.
+        block (list): A list of 64 bits.
         key (list): A list of 64 bits representing the key.
+        trace (str): One of TRACE_LEVELS.
+        decrypt (bool): Whether to apply the round keys in reverse order.
 
     Returns:
-        tuple: (plaintext as list of 64 bits, round details as list of dicts)
+        list or tuple: The output block alone for TRACE_NONE, otherwise
+            (output block, list of RoundTrace).
+
+    Raises:
+        ValueError: If the trace level is unknown or the block or key is not 64 bits.
     """
-    # Initial Permutation
-    permuted_block = initial_permutation(block)
-    left = permuted_block[:32]
-    right = permuted_block[32:]
+    if trace not in TRACE_LEVELS:
+        raise ValueError(f"Unsupported trace level '{trace}'. Expected one of: {', '.join(TRACE_LEVELS)}.")
+    if len(block) != 64 or len(key) != 64:
+        raise ValueError("Block and key must be exactly 64 bits.")
+
+    schedule = get_key_schedule(bits_to_int(key))
+    round_keys = schedule.reverse if decrypt else schedule.forward
+    if trace == TRACE_FULL:
+        return _full_trace(block, round_keys)
+    if trace == TRACE_SUMMARY:
+        return _summary_trace(block, round_keys)
+    return int_to_bits(des_crypt_int(bits_to_int(block), round_keys), 64)
+
+def des_encrypt(block, key, trace=TRACE_FULL):
+    """
+    Encrypt a 64-bit block using DES.
 
-    # Key Schedule (reverse for decryption)
-    round_keys = generate_keys(key)[::-1]
+    Args:
+        block (list): A list of 64 bits representing the plaintext.
+        key (list): A list of 64 bits representing the key.
+        trace (str): How much round detail to collect:
+            'none' runs the integer engine and returns only the ciphertext,
+            'summary' records L and R for each round,
+            'full' records every intermediate value (default).
 
-    round_details = []
+    Returns:
+        list or tuple: The ciphertext as a list of 64 bits for 'none', otherwise
+            (ciphertext as list of 64 bits, round details as list of RoundTrace).
+    """
+    return _run(block, key, trace, decrypt=False)
 
-    for i in range(16):
-        round_number = i + 1
-        feistel_output = feistel(right, round_keys[i])
-
-        # Extract S-box details
-        sbox_output, sbox_details = s_box_substitution(feistel_output['xor_with_subkey'])
-
-        # Update feistel_output with S-box details
-        feistel_output['sbox_output'] = sbox_output
-        feistel_output['sbox_details'] = sbox_details
-
-        # XOR with left
-        new_right = xor(left, feistel_output['permutation_output'])
-
-        # Collect round details
-        round_info = {
-            'round': round_number,
-            'subkey': round_keys[i].copy(),
-            'left_before': left.copy(),
-            'right_before': right.copy(),
-            'expanded_right': feistel_output['expanded_right'],
-            'xor_with_subkey': feistel_output['xor_with_subkey'],
-            'sbox_output': feistel_output['sbox_output'],
-            'sbox_details': feistel_output['sbox_details'],
-            'permutation_output': feistel_output['permutation_output'],
-            'left_after': right.copy(),
-            'right_after': new_right.copy()
-        }
-        round_details.append(round_info)
+def des_decrypt(block, key, trace=TRACE_FULL):
+    """
+    Decrypt a 64-bit block using DES.
 
-        # Update left and right for next round
-        left = right
-        right = new_right
+    Args:
+        block (list): A list of 64 bits representing the ciphertext.
+        key (list): A list of 64 bits representing the key.
+        trace (str): How much round detail to collect:
+            'none' runs the integer engine and returns only the plaintext,
+            'summary' records L and R for each round,
+            'full' records every intermediate value (default).
 
-    combined = right + left
-    final_block = final_permutation(combined)
-    return final_block, round_details
+    Returns:
+        list or tuple: The plaintext as a list of 64 bits for 'none', otherwise
+            (plaintext as list of 64 bits, round details as list of RoundTrace).
+    """
+    return _run(block, key, trace, decrypt=True)
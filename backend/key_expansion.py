@@ -1,6 +1,8 @@
 # backend/key_expansion.py
 
-from .utils import permute, shift_left
+import os
+from collections import namedtuple
+from .utils import permute, shift_left, compile_permutation, permute_int, LRUCache
 
 # Permuted Choice 1 (PC-1) Table
 PC1 = [
@@ -60,3 +62,74 @@ def generate_keys(key):
         round_key = permute(combined, PC2)
         round_keys.append(round_key)
     return round_keys
+
+# Byte-indexed lookup tables for the integer key schedule
+PC1_TABLES = compile_permutation(PC1, 64)
+PC2_TABLES = compile_permutation(PC2, 56)
+
+def generate_keys_int(key, shift_schedule=SHIFT_SCHEDULE):
+    """
+    Generate 16 round keys from a 64-bit integer key.
+
+    Integer counterpart of `generate_keys`: C and D are rotated as 28-bit
+    integers and PC-1/PC-2 are applied through byte-indexed lookup tables.
+
+    Args:
+        key (int): The 64-bit key.
+        shift_schedule (list): Left rotation of C and D before each round key;
+            one round key is generated per entry (e.g. for a `variants.DESVariant`).
+
+    Returns:
+        list: A list of 16 round keys (one per shift), each a 48-bit integer.
+    """
+    key_permuted = permute_int(key, PC1_TABLES)
+    C = key_permuted >> 28
+    D = key_permuted & 0xFFFFFFF
+
+    round_keys = []
+    for shift in shift_schedule:
+        # Perform 28-bit left rotations
+        C = ((C << shift) | (C >> (28 - shift))) & 0xFFFFFFF
+        D = ((D << shift) | (D >> (28 - shift))) & 0xFFFFFFF
+        round_keys.append(permute_int((C << 28) | D, PC2_TABLES))
+    return round_keys
+
+# Compiled key schedule: round keys in encryption order and in decryption order
+KeySchedule = namedtuple('KeySchedule', ['forward', 'reverse'])
+
+# Process-wide cache of compiled key schedules, keyed by the 64-bit key value
+key_schedule_cache = LRUCache(maxsize=int(os.environ.get('DES_KEY_CACHE_SIZE', 1024)))
+
+def compile_key_schedule(key):
+    """
+    Build the key schedule for a 64-bit integer key in both directions.
+
+    Args:
+        key (int): The 64-bit key.
+
+    Returns:
+        KeySchedule: Tuples of 16 48-bit round keys for encryption and decryption.
+    """
+    round_keys = tuple(generate_keys_int(key))
+    return KeySchedule(round_keys, round_keys[::-1])
+
+def get_key_schedule(key):
+    """
+    Return the compiled key schedule for a key, using the process-wide cache.
+
+    Args:
+        key (int): The 64-bit key.
+
+    Returns:
+        KeySchedule: Tuples of 16 48-bit round keys for encryption and decryption.
+    """
+    return key_schedule_cache.get(key, compile_key_schedule)
+
+def configure_key_cache(maxsize):
+    """
+    Change the number of key schedules kept in the process-wide cache.
+
+    Args:
+        maxsize (int): Maximum number of cached key schedules.
+    """
+    key_schedule_cache.resize(maxsize)
@@ -0,0 +1,392 @@
+# backend/key_search.py
+
+import os
+import time
+from itertools import islice
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .des import des_crypt_int, des_encrypt_int
+from .key_expansion import generate_keys_int
+
+try:
+    import numpy as np
+    from . import batch_des
+except ImportError:  # NumPy is optional
+    np = None
+    batch_des = None
+
+# Known-plaintext exhaustive key search over reduced DES key spaces.
+#
+# The key schedule only selects and moves key bits (PC-1, rotations, PC-2), so
+# it is linear: the round keys of K ^ D are the round keys of K XORed with the
+# round keys of D. Flipping one key bit therefore XORs a fixed set of 16 round
+# key deltas, and walking the candidates in Gray-code order updates the
+# schedule with 16 XORs instead of recomputing it for every key.
+
+KEY_MASK = (1 << 64) - 1
+# The low bit of every key byte is a parity bit, ignored by PC-1
+PARITY_MASK = 0x0101010101010101
+EFFECTIVE_KEY_MASK = KEY_MASK ^ PARITY_MASK
+
+# Candidates per task: 2**chunk_bits keys share one full key schedule computation
+DEFAULT_CHUNK_BITS = 16
+
+SEARCH_ENGINES = ('int', 'numpy')
+DEFAULT_SEARCH_ENGINE = 'numpy' if batch_des is not None else 'int'
+
+# Round key deltas (16 48-bit integers) of every single key bit, by bit index (0 = least significant)
+ROUND_KEY_DELTAS = tuple(tuple(generate_keys_int(1 << bit)) for bit in range(64))
+
+class KeySpace:
+    """
+    Reduced DES key space: a base key whose bits under `mask` are unknown.
+
+    Candidate keys are numbered 0 .. size - 1; the bits of a candidate's
+    number are deposited into the unknown positions, lowest bit first.
+    """
+
+    __slots__ = ('base', 'mask', 'positions')
+
+    def __init__(self, base, mask):
+        """
+        Args:
+            base (int or bytes): The known part of the key (bits under `mask` are ignored).
+            mask (int or bytes): 64-bit mask of the unknown key bits.
+
+        Raises:
+            ValueError: If the mask is empty or covers parity bits.
+        """
+        base = _key_to_int(base)
+        mask = _key_to_int(mask)
+        if not mask:
+            raise ValueError("At least one key bit must be unknown.")
+        if mask & PARITY_MASK:
+            raise ValueError("Unknown bits must not include parity bits (the low bit of each key byte).")
+        self.base = base & ~mask & KEY_MASK
+        self.mask = mask
+        self.positions = tuple(bit for bit in range(64) if (mask >> bit) & 1)
+
+    @classmethod
+    def lowest_bits(cls, base, count):
+        """
+        Key space whose `count` least significant non-parity key bits are unknown.
+
+        Args:
+            base (int or bytes): The known part of the key.
+            count (int): Number of unknown bits (1 to 56).
+
+        Raises:
+            ValueError: If the count is out of range.
+        """
+        if not 1 <= count <= 56:
+            raise ValueError("The number of unknown key bits must be between 1 and 56.")
+        bits = [bit for bit in range(64) if (EFFECTIVE_KEY_MASK >> bit) & 1][:count]
+        return cls(base, sum(1 << bit for bit in bits))
+
+    @property
+    def bits(self):
+        """
+        Number of unknown key bits.
+        """
+        return len(self.positions)
+
+    @property
+    def size(self):
+        """
+        Number of candidate keys.
+        """
+        return 1 << len(self.positions)
+
+    @property
+    def complement_closed(self):
+        """
+        Whether the complement of every candidate is itself a candidate,
+        i.e. every non-parity key bit is unknown.
+        """
+        return not EFFECTIVE_KEY_MASK & ~self.mask
+
+    def key(self, index):
+        """
+        Candidate key number `index`.
+        """
+        key = self.base
+        for bit in self.positions:
+            if index & 1:
+                key |= 1 << bit
+            index >>= 1
+        return key
+
+    def prefixes(self, low_bits):
+        """
+        Split the candidates into chunks of 2**low_bits keys differing only in
+        their `low_bits` lowest unknown bits.
+
+        Args:
+            low_bits (int): Number of unknown bits enumerated inside a chunk.
+
+        Yields:
+            int: The first key of each chunk (low unknown bits all 0), in candidate order.
+        """
+        high = self.positions[low_bits:]
+        if not high:
+            yield self.base
+            return
+        chunk_space = KeySpace(self.base, sum(1 << bit for bit in high))
+        for index in range(chunk_space.size):
+            yield chunk_space.key(index)
+
+    def __contains__(self, key):
+        return (key & EFFECTIVE_KEY_MASK & ~self.mask) == (self.base & EFFECTIVE_KEY_MASK)
+
+    def __len__(self):
+        return self.size
+
+# Everything a task needs besides the prefix key of its chunk
+SearchContext = namedtuple('SearchContext', ['plaintext', 'target', 'complement_target',
+                                             'low_masks', 'low_deltas', 'flips', 'engine'])
+
+def _key_to_int(value):
+    """
+    Accept a key (or mask) as an integer or 8 bytes.
+
+    Raises:
+        ValueError: If a buffer is not 8 bytes.
+    """
+    if isinstance(value, int):
+        return value & KEY_MASK
+    if len(value) != 8:
+        raise ValueError("Keys and key masks must be exactly 8 bytes.")
+    return int.from_bytes(value, 'big')
+
+def _gray_flips(bits):
+    """
+    Index of the bit that changes at each step of a `bits`-bit Gray code
+    (the trailing zero count of the step number).
+    """
+    return [(step & -step).bit_length() - 1 for step in range(1, 1 << bits)]
+
+def _search_chunk_int(context, prefix):
+    """
+    Test the 2**len(low_masks) keys sharing a prefix, one at a time in Gray-code order.
+
+    Returns:
+        list: Matching keys (complement keys already complemented).
+    """
+    plaintext, target, complement_target, low_masks, low_deltas, flips, _ = context
+    round_keys = generate_keys_int(prefix)
+    key = prefix
+    matches = []
+    output = des_crypt_int(plaintext, round_keys)
+    if output == target or output == complement_target:
+        matches.append(key if output == target else key ^ KEY_MASK)
+    for bit in flips:
+        key ^= low_masks[bit]
+        round_keys = [subkey ^ delta for subkey, delta in zip(round_keys, low_deltas[bit])]
+        output = des_crypt_int(plaintext, round_keys)
+        if output == target or output == complement_target:
+            matches.append(key if output == target else key ^ KEY_MASK)
+    return matches
+
+def chunk_schedules(prefix, low_masks, low_deltas):
+    """
+    Keys and round keys of the 2**len(low_masks) candidates sharing a prefix, as arrays.
+
+    The schedules are built by doubling: each unknown bit appends a copy of
+    the schedules so far XORed with that bit's round key deltas, so the
+    candidates come out in counting order of the low bits.
+
+    Args:
+        prefix (int): The candidate whose low unknown bits are all 0.
+        low_masks (tuple): Key mask of each low unknown bit.
+        low_deltas (tuple): Round key deltas of each low unknown bit.
+
+    Returns:
+        tuple: (uint64 array of keys, uint64 array of shape (16, len(keys)) in encryption order)
+    """
+    schedules = np.array(generate_keys_int(prefix), dtype=np.uint64)[:, None]
+    keys = np.array([prefix], dtype=np.uint64)
+    for mask, deltas in zip(low_masks, low_deltas):
+        schedules = np.concatenate([schedules, schedules ^ np.array(deltas, dtype=np.uint64)[:, None]], axis=1)
+        keys = np.concatenate([keys, keys ^ np.uint64(mask)])
+    return keys, schedules
+
+def _search_chunk_numpy(context, prefix):
+    """
+    Test the 2**len(low_masks) keys sharing a prefix in one batch.
+
+    Returns:
+        list: Matching keys (complement keys already complemented).
+    """
+    plaintext, target, complement_target, low_masks, low_deltas, _, _ = context
+    keys, schedules = chunk_schedules(prefix, low_masks, low_deltas)
+    output = batch_des.crypt_blocks(np.full(len(keys), plaintext, dtype=np.uint64), [schedules])
+    matches = [int(key) for key in keys[output == np.uint64(target)]]
+    if complement_target >= 0:
+        matches += [int(key) ^ KEY_MASK for key in keys[output == np.uint64(complement_target)]]
+    return matches
+
+def _search_chunk(context, prefix):
+    """
+    Test every key of the chunk starting at `prefix` with the context's engine.
+    """
+    if context.engine == 'numpy':
+        return _search_chunk_numpy(context, prefix)
+    return _search_chunk_int(context, prefix)
+
+# Search context of the key search a worker process was started for
+_worker_context = None
+
+def _init_worker(context):
+    """
+    Pool initializer: keep the search context so tasks only carry a prefix key.
+    """
+    global _worker_context
+    _worker_context = context
+
+def _worker_search_chunk(prefix):
+    return _search_chunk(_worker_context, prefix)
+
+def _pair_to_int(block):
+    """
+    Accept a plaintext or ciphertext block as an integer or 8 bytes.
+    """
+    if isinstance(block, int):
+        return block
+    if len(block) != 8:
+        raise ValueError("Plaintext and ciphertext blocks must be exactly 8 bytes.")
+    return int.from_bytes(block, 'big')
+
+def search_keys(plaintext, ciphertext, space, complement_ciphertext=None, extra_pairs=(), workers=1,
+                chunk_bits=DEFAULT_CHUNK_BITS, engine=None, stop_on_first=True, progress=None):
+    """
+    Exhaustively search a reduced key space for the keys mapping a known plaintext to its ciphertext.
+
+    With `complement_ciphertext` (the encryption of the complemented plaintext
+    under the same key), the complementation property E_~K(~P) = ~E_K(P) lets
+    every trial encryption E_K(P) test both K and ~K. The search then covers
+    the space and its complement for the price of the space alone; for a
+    complement-closed space (every key bit unknown) only half of it is enumerated.
+
+    Candidates are split into chunks of 2**chunk_bits keys sharing a prefix.
+    With several workers the chunks run in a process pool; with `stop_on_first`
+    no new chunks are started once a key is found.
+
+    Args:
+        plaintext (int or bytes): Known 64-bit plaintext block.
+        ciphertext (int or bytes): Its 64-bit ciphertext.
+        space (KeySpace): Candidate keys.
+        complement_ciphertext (int or bytes): Optional ciphertext of the complemented plaintext.
+        extra_pairs (list): Further (plaintext, ciphertext) pairs used to discard false positives.
+        workers (int): Number of worker processes (None: one per CPU; 1: run inline).
+        chunk_bits (int): log2 of the number of candidates per task.
+        engine (str): 'numpy' (batched) or 'int' (one key at a time); defaults to NumPy when installed.
+        stop_on_first (bool): Stop after the first chunk containing a key.
+        progress (callable): Called as progress(tested, total, seconds) after every chunk.
+
+    Returns:
+        dict: 'keys' (matching keys as integers), 'tested' (keys covered), 'total'
+            (keys in the searched space), 'encryptions', 'seconds', 'keys_per_second'
+            and 'complete' (whether the whole space was searched).
+
+    Raises:
+        ValueError: If an argument is invalid.
+    """
+    engine = engine or DEFAULT_SEARCH_ENGINE
+    if engine not in SEARCH_ENGINES:
+        raise ValueError(f"Unsupported search engine '{engine}'. Expected one of: {', '.join(SEARCH_ENGINES)}.")
+    if engine == 'numpy' and batch_des is None:
+        raise ValueError("The 'numpy' search engine requires NumPy to be installed.")
+    if chunk_bits < 0:
+        raise ValueError("Chunk bits must not be negative.")
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Worker count must be at least 1.")
+
+    plaintext = _pair_to_int(plaintext)
+    extra_pairs = [(_pair_to_int(p), _pair_to_int(c)) for p, c in extra_pairs]
+    complement_target = -1
+    searched = space
+    if complement_ciphertext is not None:
+        complement_target = _pair_to_int(complement_ciphertext) ^ KEY_MASK
+        if space.complement_closed:
+            # ~K is a candidate for every K: fixing the top unknown bit covers the whole space
+            searched = KeySpace(space.base, space.mask ^ (1 << space.positions[-1]))
+
+    low = searched.positions[:chunk_bits]
+    context = SearchContext(plaintext, _pair_to_int(ciphertext), complement_target,
+                            tuple(1 << bit for bit in low), tuple(ROUND_KEY_DELTAS[bit] for bit in low),
+                            _gray_flips(len(low)) if engine == 'int' else None, engine)
+    prefixes = searched.prefixes(len(low))
+    chunk = 1 << len(low)
+    chunks = searched.size // chunk
+    # Keys decided by one trial encryption
+    per_encryption = 2 if complement_target >= 0 else 1
+    total = space.size if space.complement_closed else space.size * per_encryption
+
+    keys = []
+    done = 0
+    start = time.perf_counter()
+
+    def collect(matches):
+        nonlocal done
+        done += 1
+        keys.extend(key for key in matches
+                    if all(des_encrypt_int(p, key) == c for p, c in extra_pairs))
+        if progress is not None:
+            progress(done * chunk * per_encryption, total, time.perf_counter() - start)
+
+    if workers == 1 or chunks == 1:
+        for prefix in prefixes:
+            collect(_search_chunk(context, prefix))
+            if keys and stop_on_first:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(context,)) as executor:
+            # Keep a couple of chunks queued per worker, no more, so an early exit is quick
+            pending = {executor.submit(_worker_search_chunk, prefix) for prefix in islice(prefixes, 2 * workers)}
+            try:
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future.result())
+                    if keys and stop_on_first:
+                        break
+                    pending.update(executor.submit(_worker_search_chunk, prefix)
+                                   for prefix in islice(prefixes, len(finished)))
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    seconds = time.perf_counter() - start
+    encryptions = done * chunk
+    tested = encryptions * per_encryption
+    return {
+        'keys': sorted(set(keys)),
+        'tested': tested,
+        'total': total,
+        'encryptions': encryptions,
+        'seconds': seconds,
+        'keys_per_second': tested / seconds if seconds else float('inf'),
+        'complete': done == chunks
+    }
+
+def format_search_result(result):
+    """
+    Format the outcome of `search_keys`, one line per field.
+
+    Args:
+        result (dict): Output of `search_keys`.
+
+    Returns:
+        str: The report.
+    """
+    keys = ', '.join(format(key, '016X') for key in result['keys']) or 'none'
+    lines = [
+        f"keys found : {keys}",
+        f"tested     : {result['tested']:,} of {result['total']:,} keys"
+        f"{'' if result['complete'] else ' (stopped early)'}",
+        f"encryptions: {result['encryptions']:,}",
+        f"time       : {result['seconds']:.3f} s",
+        f"rate       : {result['keys_per_second']:,.0f} keys/s"
+    ]
+    return '\n'.join(lines)
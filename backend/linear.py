@@ -0,0 +1,378 @@
+# backend/linear.py
+
+import math
+import time
+from collections import namedtuple
+import numpy as np
+from . import batch_des
+from .des import E, P
+from .key_expansion import generate_keys_int
+from .analysis import get_sbox_tables, sbox_lookup, popcount
+
+# Linear cryptanalysis of reduced-round DES (Matsui).
+#
+# A one-round approximation picks an S-box j and masks a (6-bit input) and b
+# (4-bit output): a.x = b.S(x) holds for (32 + LAT[j][a][b]) of the 64 inputs.
+# Through E and P this becomes alpha.R ^ beta.F(R, K) = kappa.K, and chaining
+# rounds so that every intermediate half cancels gives a linear relation
+# between plaintext, ciphertext and key bits whose bias follows the piling-up
+# lemma: 2^(m-1) times the product of the m round biases.
+#
+# Algorithm 1 counts the relation over N known pairs and reads one key bit
+# (the XOR of the key masks) from the majority. Algorithm 2 runs an r-1 round
+# relation into the last round, guesses the 6 subkey bits of the S-box it
+# passes through, and keeps the guess with the most biased count.
+#
+# Masks are 64-bit values on the state after the Initial Permutation:
+# plaintext masks apply to L0 R0, ciphertext masks to R(r) L(r), i.e. the
+# ciphertext with its Final Permutation undone.
+
+# Known pairs encrypted and counted at a time
+LINEAR_BATCH = 1 << 18
+
+# One round of a linear trail: an S-box (0-based) with its input and output masks
+Approximation = namedtuple('Approximation', ['sbox', 'input_mask', 'output_mask'])
+
+# A chained approximation over `rounds` rounds: the approximations (None for
+# rounds without one), the text masks, the subkey mask of every round and the bias
+LinearTrail = namedtuple('LinearTrail', ['approximations', 'rounds', 'plaintext_mask', 'ciphertext_mask',
+                                         'key_masks', 'bias'])
+
+def round_masks(approximation):
+    """
+    Masks of a one-round approximation alpha.R ^ beta.F(R, K) = kappa.K.
+
+    Args:
+        approximation (Approximation): S-box and masks.
+
+    Returns:
+        tuple: (alpha, beta, kappa): 32-bit mask on the round input R, 32-bit
+            mask on the F output and 48-bit mask on the round key.
+    """
+    sbox, a, b = approximation
+    alpha = beta = 0
+    for k in range(6):
+        if (a >> (5 - k)) & 1:
+            # E duplicates some bits of R: a bit feeding two selected positions cancels out
+            alpha ^= 1 << (32 - E[6 * sbox + k])
+    for k in range(4):
+        if (b >> (3 - k)) & 1:
+            beta ^= 1 << (31 - P.index(4 * sbox + k + 1))
+    return alpha, beta, a << (42 - 6 * sbox)
+
+def linear_trail(approximations):
+    """
+    Chain one-round approximations into a linear trail.
+
+    Args:
+        approximations (list): An Approximation (or (sbox, input_mask, output_mask)
+            tuple) or None for every round.
+
+    Returns:
+        LinearTrail: The trail with its text masks and piling-up bias.
+
+    Raises:
+        ValueError: If an approximation is out of range or the rounds do not
+            chain (an intermediate half would remain in the relation).
+    """
+    rounds = len(approximations)
+    if rounds < 2:
+        raise ValueError("A linear trail needs at least two rounds.")
+    if not any(approximations):
+        raise ValueError("A linear trail needs at least one approximation.")
+    lat = get_sbox_tables().lat
+    # masks[t + 1] is the mask on R(t) for t = -1 .. rounds, where R(-1) = L0 and R(t - 1) = L(t)
+    masks = [0] * (rounds + 2)
+    key_masks = []
+    bias = 0.5
+    normalized = []
+    for i, approximation in enumerate(approximations, 1):
+        if approximation is None:
+            normalized.append(None)
+            key_masks.append(0)
+            continue
+        approximation = Approximation(*approximation)
+        if not (0 <= approximation.sbox < 8 and 0 < approximation.input_mask < 64 and
+                0 < approximation.output_mask < 16):
+            raise ValueError(f"Invalid approximation for round {i}: {tuple(approximation)}.")
+        alpha, beta, kappa = round_masks(approximation)
+        # Round i: alpha.R(i-1) ^ beta.(L(i-1) ^ R(i)) = kappa.K(i), with L(i-1) = R(i-2)
+        masks[i] ^= alpha
+        masks[i - 1] ^= beta
+        masks[i + 1] ^= beta
+        normalized.append(approximation)
+        key_masks.append(kappa)
+        bias *= 2 * lat[approximation.sbox][approximation.input_mask][approximation.output_mask] / 64
+    if any(masks[2:rounds]):
+        raise ValueError("The approximations do not chain: an intermediate half does not cancel.")
+    return LinearTrail(tuple(normalized), rounds, (masks[0] << 32) | masks[1],
+                       (masks[rounds + 1] << 32) | masks[rounds], tuple(key_masks), float(bias))
+
+def approximations_from_list(spec):
+    """
+    Read the per-round approximations of a trail from a parsed JSON list.
+
+    Args:
+        spec (list): One [sbox, input_mask, output_mask] list per round, S-boxes
+            numbered from 1 as in `format_approximation`, or None for a round
+            without an approximation.
+
+    Returns:
+        list: Approximation (0-based S-box) or None per round, for `linear_trail`.
+
+    Raises:
+        ValueError: If the list is malformed.
+    """
+    if not isinstance(spec, list):
+        raise ValueError("Approximations must be a list with one entry per round.")
+    approximations = []
+    for i, entry in enumerate(spec, 1):
+        if entry is None:
+            approximations.append(None)
+            continue
+        if (not isinstance(entry, list) or len(entry) != 3 or
+                not all(isinstance(value, int) and not isinstance(value, bool) for value in entry)):
+            raise ValueError(f"The approximation of round {i} must be null or [sbox, input_mask, output_mask].")
+        if not 1 <= entry[0] <= 8:
+            raise ValueError(f"The S-box of round {i} must be from 1 to 8.")
+        approximations.append(Approximation(entry[0] - 1, entry[1], entry[2]))
+    return approximations
+
+# Matsui's best approximation of S5 (LAT -20), and the best trails built on it
+S5_APPROXIMATION = Approximation(4, 0b010000, 0b1111)
+
+TRAILS = {
+    3: linear_trail([S5_APPROXIMATION, None, S5_APPROXIMATION]),
+    4: linear_trail([Approximation(0, 0b011011, 0b0100), S5_APPROXIMATION, None, S5_APPROXIMATION]),
+}
+
+def key_parity(key, trail):
+    """
+    The key bit a trail reveals: the parity of its key masks over the round keys of `key`.
+    """
+    masked = 0
+    for round_key, mask in zip(generate_keys_int(key), trail.key_masks):
+        masked ^= round_key & mask
+    return bin(masked).count('1') & 1
+
+def _parity(values):
+    return popcount(values) & np.uint64(1)
+
+def known_pairs(pairs, key, rounds, rng):
+    """
+    Generate random known plaintext/ciphertext pairs in batches.
+
+    Args:
+        pairs (int): Number of pairs.
+        key (int): 64-bit key.
+        rounds (int): Number of DES rounds.
+        rng (np.random.Generator): Source of the plaintexts.
+
+    Yields:
+        tuple: (L0 R0, R(r) L(r)) uint64 arrays of at most LINEAR_BATCH pairs.
+    """
+    round_keys = np.array(generate_keys_int(key)[:rounds], dtype=np.uint64)
+    for first in range(0, pairs, LINEAR_BATCH):
+        plaintexts = rng.integers(0, 1 << 64, min(LINEAR_BATCH, pairs - first), dtype=np.uint64, endpoint=False)
+        left, right = batch_des.crypt_states(plaintexts, round_keys)
+        yield (left[0] << np.uint64(32)) | right[0], (right[-1] << np.uint64(32)) | left[-1]
+
+def last_round_sbox(trail):
+    """
+    The S-box through which a trail's L mask enters the F output of the next round.
+
+    Args:
+        trail (LinearTrail): Trail over the rounds before the last one.
+
+    Returns:
+        tuple: (S-box, 4-bit output mask).
+
+    Raises:
+        ValueError: If the mask involves more than one S-box, or none.
+    """
+    mask = trail.ciphertext_mask & 0xFFFFFFFF
+    outputs = 0
+    for position in range(32):
+        if (mask >> (31 - position)) & 1:
+            outputs |= 1 << (32 - P[position])
+    sboxes = [j for j in range(8) if (outputs >> (28 - 4 * j)) & 0xF]
+    if len(sboxes) != 1:
+        raise ValueError("Algorithm 2 needs a trail whose last mask goes through exactly one S-box.")
+    return sboxes[0], (outputs >> (28 - 4 * sboxes[0])) & 0xF
+
+def algorithm1(trail, pairs, key, rng):
+    """
+    Matsui's Algorithm 1: recover the key parity of `trail` from known pairs.
+
+    Args:
+        trail (LinearTrail): Trail over every round of the cipher.
+        pairs (int): Number of known pairs.
+        key (int): The secret 64-bit key.
+        rng (np.random.Generator): Source of the plaintexts.
+
+    Returns:
+        dict: 'key_parity' (the real bit), 'guessed_parity', 'bias_estimate'
+            (measured bias, signed like `trail.bias`) and 'success'.
+    """
+    plaintext_mask, ciphertext_mask = np.uint64(trail.plaintext_mask), np.uint64(trail.ciphertext_mask)
+    zeros = 0
+    for states, outputs in known_pairs(pairs, key, trail.rounds, rng):
+        zeros += len(states) - int(_parity((states & plaintext_mask) ^ (outputs & ciphertext_mask)).sum())
+    # The relation is text parity = key parity with probability 1/2 + bias
+    deviation = zeros / pairs - 0.5
+    guessed = int((deviation > 0) != (trail.bias > 0))
+    real = key_parity(key, trail)
+    return {
+        'key_parity': real,
+        'guessed_parity': guessed,
+        'bias_estimate': -deviation if real else deviation,
+        'success': guessed == real
+    }
+
+def algorithm2(trail, pairs, key, rng):
+    """
+    Matsui's Algorithm 2: recover 6 bits of the last round key and the key parity of `trail`.
+
+    The cipher has trail.rounds + 1 rounds. Each pair only matters through
+    the 6 bits of E(L(r)) entering the last-round S-box and the parity of the
+    known text bits, so pairs are counted into 128 bins and every subkey guess
+    is then evaluated on the bins.
+
+    Args:
+        trail (LinearTrail): Trail over every round but the last.
+        pairs (int): Number of known pairs.
+        key (int): The secret 64-bit key.
+        rng (np.random.Generator): Source of the plaintexts.
+
+    Returns:
+        dict: 'sbox', 'best' (6-bit subkey guess), 'correct', 'rank' of the correct
+            guess, 'key_parity', 'guessed_parity', 'bias_estimate' and 'success'.
+    """
+    rounds = trail.rounds + 1
+    sbox, output_mask = last_round_sbox(trail)
+    # The trail ends on L(r-1) = R(r) ^ F(L(r), K(r)) and R(r-1) = L(r)
+    known_mask = np.uint64(((trail.ciphertext_mask & 0xFFFFFFFF) << 32) | (trail.ciphertext_mask >> 32))
+    plaintext_mask = np.uint64(trail.plaintext_mask)
+    shift = np.uint64(42 - 6 * sbox)
+    bins = np.zeros(128, dtype=np.int64)
+    for states, outputs in known_pairs(pairs, key, rounds, rng):
+        inputs = (batch_des.permute_array(outputs & batch_des.MASK_32, batch_des.E_LOOKUP) >> shift) & batch_des.MASK_6
+        parity = _parity((states & plaintext_mask) ^ (outputs & known_mask))
+        bins += np.bincount((inputs << np.uint64(1) | parity).astype(np.intp), minlength=128)
+    bins = bins.reshape(64, 2)
+
+    # F parity for every (guess, input), then the pairs whose whole relation has parity 0
+    x = np.arange(64)
+    f_parity = popcount(sbox_lookup()[sbox][x[None, :] ^ x[:, None]] & np.uint8(output_mask)) & 1
+    zeros = bins[x[None, :], f_parity].sum(axis=1)
+    deviations = zeros / pairs - 0.5
+    best = int(np.argmax(np.abs(deviations)))
+    correct = (generate_keys_int(key)[rounds - 1] >> int(shift)) & 0x3F
+    guessed = int((deviations[best] > 0) != (trail.bias > 0))
+    real = key_parity(key, trail)
+    return {
+        'sbox': f'S{sbox + 1}',
+        'best': best,
+        'correct': correct,
+        'rank': int((np.abs(deviations) > abs(deviations[correct])).sum()) + 1,
+        'key_parity': real,
+        'guessed_parity': guessed,
+        'bias_estimate': float(-deviations[correct] if real else deviations[correct]),
+        'success': best == correct and guessed == real
+    }
+
+def expected_success(bias, pairs):
+    """
+    Matsui's estimate of the Algorithm 1 success rate: Phi(2 sqrt(N) |bias|).
+    """
+    return 0.5 * (1 + math.erf(2 * math.sqrt(pairs) * abs(bias) / math.sqrt(2)))
+
+def format_approximation(approximation):
+    """
+    Short label of a round approximation, e.g. 'S5(16, 15)' or '-'.
+    """
+    if approximation is None:
+        return '-'
+    return f'S{approximation.sbox + 1}({approximation.input_mask}, {approximation.output_mask})'
+
+def linear_attack(rounds=None, algorithm=1, pairs=100000, trials=1, key=None, seed=None, approximations=None):
+    """
+    Run a known-plaintext linear attack on reduced-round DES, possibly several times.
+
+    Algorithm 1 uses a trail over every round, Algorithm 2 a trail over every
+    round but the last: the chosen `approximations`, or else the trail of
+    TRAILS for the round count.
+
+    Args:
+        rounds (int): Rounds of the attacked cipher (default: 3, or the rounds
+            the approximations cover, plus one for Algorithm 2).
+        algorithm (int): 1 or 2.
+        pairs (int): Known pairs per trial.
+        trials (int): Number of independent attacks.
+        key (int): The secret 64-bit key of every trial (random per trial when None).
+        seed (int): Seed for the random keys and plaintexts.
+        approximations (list): Approximation, (sbox, input_mask, output_mask) tuple
+            or None for every round of the trail (see `linear_trail`).
+
+    Returns:
+        dict: 'rounds', 'algorithm', 'pairs', 'trials', 'trail' (approximations,
+            masks and bias), 'expected_success' (Algorithm 1 only), 'success_rate',
+            'key_bit_success_rate', 'mean_bias_estimate', 'results' (one dict per
+            trial with its key) and 'time_taken' (in milliseconds).
+
+    Raises:
+        ValueError: If the combination of rounds and algorithm is not supported,
+            the approximations do not form a usable trail, or the number of pairs
+            or trials is invalid.
+    """
+    if algorithm not in (1, 2):
+        raise ValueError("Algorithm must be 1 or 2.")
+    if approximations is not None:
+        trail = linear_trail(approximations)
+        trail_rounds = trail.rounds
+        if rounds is not None and rounds != trail_rounds + algorithm - 1:
+            raise ValueError(f"Algorithm {algorithm} with a trail of {trail_rounds} rounds attacks "
+                             f"{trail_rounds + algorithm - 1} rounds, not {rounds}.")
+        if trail_rounds + algorithm - 1 > 16:
+            raise ValueError("The attacked cipher can have at most 16 rounds.")
+        if algorithm == 2:
+            last_round_sbox(trail)
+    else:
+        rounds = 3 if rounds is None else rounds
+        trail_rounds = rounds if algorithm == 1 else rounds - 1
+        if trail_rounds not in TRAILS:
+            supported = ', '.join(str(r if algorithm == 1 else r + 1) for r in TRAILS)
+            raise ValueError(f"Unsupported round count for Algorithm {algorithm}. Expected one of: {supported}.")
+        trail = TRAILS[trail_rounds]
+    rounds = trail_rounds + algorithm - 1
+    if pairs < 1 or trials < 1:
+        raise ValueError("The number of pairs and trials must be at least 1.")
+    attack = algorithm1 if algorithm == 1 else algorithm2
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+
+    results = []
+    for _ in range(trials):
+        trial_key = key if key is not None else int(rng.integers(0, 1 << 64, dtype=np.uint64, endpoint=False))
+        result = attack(trail, pairs, trial_key, rng)
+        result['key'] = trial_key
+        results.append(result)
+
+    return {
+        'rounds': rounds,
+        'algorithm': algorithm,
+        'pairs': pairs,
+        'trials': trials,
+        'trail': {
+            'approximations': [format_approximation(approximation) for approximation in trail.approximations],
+            'plaintext_mask': trail.plaintext_mask,
+            'ciphertext_mask': trail.ciphertext_mask,
+            'bias': trail.bias
+        },
+        'expected_success': expected_success(trail.bias, pairs) if algorithm == 1 else None,
+        'success_rate': sum(result['success'] for result in results) / trials,
+        'key_bit_success_rate': sum(result['guessed_parity'] == result['key_parity'] for result in results) / trials,
+        'mean_bias_estimate': sum(result['bias_estimate'] for result in results) / trials,
+        'results': results,
+        'time_taken': (time.perf_counter() - start) * 1_000  # Convert to milliseconds
+    }
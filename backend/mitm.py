@@ -0,0 +1,273 @@
+# backend/mitm.py
+
+import os
+import tempfile
+import time
+import numpy as np
+from . import batch_des
+from .des import des_encrypt_int, des_decrypt_int
+from .key_search import ROUND_KEY_DELTAS, DEFAULT_CHUNK_BITS, KEY_MASK, chunk_schedules, _pair_to_int
+
+# Meet-in-the-middle attack on double DES, C = E_K2(E_K1(P)), over reduced key spaces.
+#
+# Instead of trying every (K1, K2) pair, E_K1(P) is computed once for every K1
+# and indexed; then D_K2(C) is computed once for every K2 and looked up. A
+# match in the middle gives a candidate pair, checked against further known
+# pairs. The cost drops from |K1| * |K2| double encryptions to |K1| + |K2|
+# single ones, paid for with a table of |K1| entries.
+
+# Bytes per table entry
+ENTRY_BYTES = 8
+
+# Tables larger than this (in bytes) are memory-mapped from a file, sorted in runs of at most this size
+DEFAULT_MEMORY_LIMIT = int(os.environ.get('DES_MITM_MEMORY_LIMIT', 256 << 20))
+
+def double_encrypt_int(block, key1, key2):
+    """
+    Encrypt a 64-bit block with double DES: E_K2(E_K1(block)).
+    """
+    return des_encrypt_int(des_encrypt_int(block, key1), key2)
+
+def double_decrypt_int(block, key1, key2):
+    """
+    Decrypt a 64-bit block with double DES: D_K1(D_K2(block)).
+    """
+    return des_decrypt_int(des_decrypt_int(block, key2), key1)
+
+class MiddleTable:
+    """
+    Sorted index of the middle values E_K1(P) for every K1 of a key space.
+
+    Each entry is a single uint64: the middle value with its low b bits
+    replaced by the b-bit number of its key in the space (b = unknown key
+    bits). Sorting the entries sorts the middle values by their high 64 - b
+    bits; a lookup returns every key sharing those bits, and the caller
+    confirms the full value by recomputing E_K1(P) for the few hits.
+
+    A table of at most `memory_limit` bytes is kept in memory as one sorted
+    array. A larger table is written to a temporary memory-mapped file as
+    consecutive runs of at most `memory_limit` bytes, each sorted on its own,
+    so sorting never needs more than one run in memory. Lookups then
+    binary-search every run: less memory, more time per lookup.
+
+    Use it as a context manager (or call `close`) to delete the file.
+    """
+
+    __slots__ = ('space', 'plaintext', 'entries', 'run_entries', 'path', 'seconds')
+
+    def __init__(self, plaintext, space, memory_limit=DEFAULT_MEMORY_LIMIT, directory=None,
+                 chunk_bits=DEFAULT_CHUNK_BITS, progress=None):
+        """
+        Args:
+            plaintext (int or bytes): The known plaintext block.
+            space (KeySpace): Candidates for K1.
+            memory_limit (int): Maximum bytes of table held in memory.
+            directory (str): Directory for the table file (default: the system temporary directory).
+            chunk_bits (int): log2 of the keys encrypted per batch.
+            progress (callable): Called as progress(done, total, seconds) after every batch.
+
+        Raises:
+            ValueError: If the memory limit or chunk bits are invalid.
+        """
+        if memory_limit < ENTRY_BYTES:
+            raise ValueError(f"The memory limit must be at least {ENTRY_BYTES} bytes.")
+        if chunk_bits < 0:
+            raise ValueError("Chunk bits must not be negative.")
+        self.space = space
+        self.plaintext = _pair_to_int(plaintext)
+        self.path = None
+        start = time.perf_counter()
+
+        low = space.positions[:chunk_bits]
+        low_masks = tuple(1 << bit for bit in low)
+        low_deltas = tuple(ROUND_KEY_DELTAS[bit] for bit in low)
+        chunk = 1 << len(low)
+        # Runs are a power of two entries, so they always end on a chunk boundary
+        self.run_entries = min(space.size, max(chunk, 1 << ((memory_limit // ENTRY_BYTES).bit_length() - 1)))
+        if self.run_entries < space.size:
+            fd, self.path = tempfile.mkstemp(prefix='mitm-', suffix='.table', dir=directory)
+            os.close(fd)
+        try:
+            if self.path is None:
+                self.entries = np.empty(space.size, dtype=np.uint64)
+            else:
+                self.entries = np.memmap(self.path, dtype=np.uint64, mode='w+', shape=(space.size,))
+
+            middle_mask = np.uint64(KEY_MASK ^ ((1 << space.bits) - 1))
+            blocks = np.full(chunk, self.plaintext, dtype=np.uint64)
+            for number, prefix in enumerate(space.prefixes(len(low))):
+                _, schedules = chunk_schedules(prefix, low_masks, low_deltas)
+                first = number * chunk
+                self.entries[first:first + chunk] = ((batch_des.crypt_blocks(blocks, [schedules]) & middle_mask) |
+                                                     np.arange(first, first + chunk, dtype=np.uint64))
+                if (first + chunk) % self.run_entries == 0:
+                    self.entries[first + chunk - self.run_entries:first + chunk].sort()
+                if progress is not None:
+                    progress(first + chunk, space.size, time.perf_counter() - start)
+            if self.path is not None:
+                self.entries.flush()
+        except BaseException:
+            # E.g. the disk filled up or the build was interrupted: do not leave the table file behind
+            self.close()
+            raise
+        self.seconds = time.perf_counter() - start
+
+    @property
+    def nbytes(self):
+        """
+        Size of the table in bytes.
+        """
+        return self.entries.nbytes
+
+    @property
+    def runs(self):
+        """
+        Number of independently sorted runs.
+        """
+        return self.space.size // self.run_entries
+
+    @property
+    def on_disk(self):
+        """
+        Whether the table is memory-mapped from a file.
+        """
+        return self.path is not None
+
+    def lookup(self, middles):
+        """
+        Find the K1 candidates whose middle value may equal each of `middles`.
+
+        Args:
+            middles (np.ndarray): uint64 array of middle values, e.g. D_K2(C) for a batch of K2.
+
+        Yields:
+            tuple: (position in `middles`, K1 candidate) for every entry sharing
+                the high bits of the middle value; the low bits are not checked.
+        """
+        index_mask = (1 << self.space.bits) - 1
+        # Sorted queries make the binary searches of neighbouring values share their path
+        order = np.argsort(middles)
+        low = middles[order] & np.uint64(KEY_MASK ^ index_mask)
+        high = low | np.uint64(index_mask)
+        for first in range(0, self.space.size, self.run_entries):
+            run = self.entries[first:first + self.run_entries]
+            left = np.searchsorted(run, low, 'left')
+            right = np.searchsorted(run, high, 'right')
+            for i in np.nonzero(right > left)[0]:
+                for entry in run[left[i]:right[i]]:
+                    yield int(order[i]), self.space.key(int(entry) & index_mask)
+
+    def close(self):
+        """
+        Release the table and delete its file, if it has one.
+        """
+        self.entries = None
+        if self.path is not None:
+            os.remove(self.path)
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def meet_in_the_middle(plaintext, ciphertext, space1, space2, extra_pairs=(), memory_limit=DEFAULT_MEMORY_LIMIT,
+                       directory=None, chunk_bits=DEFAULT_CHUNK_BITS, progress=None):
+    """
+    Recover double DES keys (K1, K2) from a known plaintext/ciphertext pair.
+
+    Args:
+        plaintext (int or bytes): Known 64-bit plaintext block.
+        ciphertext (int or bytes): Its double DES ciphertext.
+        space1 (KeySpace): Candidates for K1 (the table side).
+        space2 (KeySpace): Candidates for K2 (the lookup side).
+        extra_pairs (list): Further (plaintext, ciphertext) pairs used to discard false positives.
+        memory_limit (int): Maximum bytes of table held in memory; larger tables go to a file.
+        directory (str): Directory for the table file.
+        chunk_bits (int): log2 of the keys processed per batch.
+        progress (callable): Called as progress(done, total, seconds) with done/total
+            counting the keys of both spaces.
+
+    Returns:
+        dict: 'keys' (list of (K1, K2) integer pairs), 'candidates' (middle matches checked),
+            'table_entries', 'table_bytes', 'runs', 'on_disk', 'build_seconds',
+            'probe_seconds', 'seconds', 'operations' (single DES operations) and
+            'brute_force_operations' / 'brute_force_seconds' (the estimated cost
+            of trying every key pair instead).
+
+    Raises:
+        ValueError: If an argument is invalid.
+    """
+    plaintext = _pair_to_int(plaintext)
+    ciphertext = _pair_to_int(ciphertext)
+    extra_pairs = [(_pair_to_int(p), _pair_to_int(c)) for p, c in extra_pairs]
+    total = space1.size + space2.size
+    table_progress = None
+    if progress is not None:
+        table_progress = lambda done, _, seconds: progress(done, total, seconds)
+
+    keys = []
+    candidates = 0
+    with MiddleTable(plaintext, space1, memory_limit, directory, chunk_bits, table_progress) as table:
+        start = time.perf_counter()
+        low = space2.positions[:chunk_bits]
+        low_masks = tuple(1 << bit for bit in low)
+        low_deltas = tuple(ROUND_KEY_DELTAS[bit] for bit in low)
+        chunk = 1 << len(low)
+        blocks = np.full(chunk, ciphertext, dtype=np.uint64)
+        for number, prefix in enumerate(space2.prefixes(len(low))):
+            keys2, schedules = chunk_schedules(prefix, low_masks, low_deltas)
+            middles = batch_des.crypt_blocks(blocks, [schedules[::-1]])
+            for position, key1 in table.lookup(middles):
+                candidates += 1
+                key2 = int(keys2[position])
+                if (des_encrypt_int(plaintext, key1) == int(middles[position]) and
+                        all(double_encrypt_int(p, key1, key2) == c for p, c in extra_pairs)):
+                    keys.append((key1, key2))
+            if progress is not None:
+                progress(space1.size + (number + 1) * chunk, total, table.seconds + time.perf_counter() - start)
+        probe_seconds = time.perf_counter() - start
+        build_seconds = table.seconds
+        table_bytes, runs, on_disk = table.nbytes, table.runs, table.on_disk
+
+    # Brute force needs two DES operations per key pair, at the rate measured while building the table
+    brute_force_operations = 2 * space1.size * space2.size
+    rate = space1.size / build_seconds if build_seconds else float('inf')
+    return {
+        'keys': sorted(keys),
+        'candidates': candidates,
+        'table_entries': space1.size,
+        'table_bytes': table_bytes,
+        'runs': runs,
+        'on_disk': on_disk,
+        'build_seconds': build_seconds,
+        'probe_seconds': probe_seconds,
+        'seconds': build_seconds + probe_seconds,
+        'operations': total,
+        'brute_force_operations': brute_force_operations,
+        'brute_force_seconds': brute_force_operations / rate
+    }
+
+def format_mitm_result(result):
+    """
+    Format the outcome of `meet_in_the_middle`, including the memory/time trade-off.
+
+    Args:
+        result (dict): Output of `meet_in_the_middle`.
+
+    Returns:
+        str: The report.
+    """
+    keys = ', '.join(f"{key1:016X}/{key2:016X}" for key1, key2 in result['keys']) or 'none'
+    storage = f"memory-mapped file, {result['runs']} sorted runs" if result['on_disk'] else 'in memory'
+    lines = [
+        f"keys found  : {keys}",
+        f"table       : {result['table_entries']:,} entries, {result['table_bytes'] / 2**20:.1f} MiB ({storage})",
+        f"build       : {result['build_seconds']:.3f} s",
+        f"probe       : {result['probe_seconds']:.3f} s ({result['candidates']:,} middle matches checked)",
+        f"operations  : {result['operations']:,} DES operations",
+        f"brute force : {result['brute_force_operations']:,} DES operations, "
+        f"~{result['brute_force_seconds']:,.0f} s without a table"
+    ]
+    return '\n'.join(lines)
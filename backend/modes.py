@@ -0,0 +1,763 @@
+# backend/modes.py
+
+import os
+import struct
+from functools import partial
+from .des import DESCipher
+from collections import namedtuple
+from .triple_des import key_stages, tdes_crypt_int
+from . import bitslice_des
+
+try:
+    from . import batch_des
+except ImportError:  # NumPy is optional; the bitsliced engine is pure Python
+    batch_des = None
+
+# DES block size in bytes
+BLOCK_SIZE = 8
+
+# Supported modes of operation
+MODES = ('ECB', 'CBC', 'CFB', 'OFB', 'CTR')
+
+# Modes that process whole blocks and therefore need PKCS#7 padding.
+# CFB, OFB and CTR turn DES into a stream cipher and keep the input length.
+PADDED_MODES = ('ECB', 'CBC')
+
+BLOCK_MASK = (1 << 64) - 1
+
+# Batch engines for runs of independent blocks, with the number of blocks
+# from which each one outperforms the per-block integer engine
+BATCH_THRESHOLDS = {'numpy': 64, 'bitslice': 128}
+DEFAULT_BATCH_ENGINE = 'numpy' if batch_des is not None else 'bitslice'
+
+# Batch encrypt/decrypt functions over whole-block buffers
+BatchFunctions = namedtuple('BatchFunctions', ['encrypt', 'decrypt', 'min_blocks'])
+
+def pkcs7_pad(data, block_size=BLOCK_SIZE):
+    """
+    Pad data to a multiple of the block size using PKCS#7.
+
+    Args:
+        data (bytes): Data to pad.
+        block_size (int): Block size in bytes.
+
+    Returns:
+        bytes: Padded data (always at least one byte longer than the input).
+    """
+    pad_length = block_size - len(data) % block_size
+    return bytes(data) + bytes([pad_length]) * pad_length
+
+def pkcs7_unpad(data, block_size=BLOCK_SIZE):
+    """
+    Remove PKCS#7 padding.
+
+    Args:
+        data (bytes): Padded data.
+        block_size (int): Block size in bytes.
+
+    Returns:
+        bytes: Data without padding.
+
+    Raises:
+        ValueError: If the padding is invalid.
+    """
+    if not data or len(data) % block_size:
+        raise ValueError("Padded data length must be a non-zero multiple of the block size.")
+    pad_length = data[-1]
+    if not 1 <= pad_length <= block_size or data[-pad_length:] != bytes([pad_length]) * pad_length:
+        raise ValueError("Invalid PKCS#7 padding.")
+    return bytes(data[:-pad_length])
+
+def generate_iv():
+    """
+    Generate a random IV (or initial counter block for CTR).
+
+    Returns:
+        bytes: 8 random bytes.
+    """
+    return os.urandom(BLOCK_SIZE)
+
+def split_blocks(data):
+    """
+    Unpack the whole 64-bit blocks of a buffer into integers in one call.
+
+    Args:
+        data (bytes-like): Input buffer; a trailing partial block is ignored.
+
+    Returns:
+        tuple: Blocks as 64-bit integers.
+    """
+    count = len(data) // BLOCK_SIZE
+    return struct.unpack_from(f'>{count}Q', data)
+
+def join_blocks(blocks):
+    """
+    Pack 64-bit integer blocks into a buffer in one call.
+
+    Args:
+        blocks (list): Blocks as 64-bit integers.
+
+    Returns:
+        bytes: The packed blocks.
+    """
+    return struct.pack(f'>{len(blocks)}Q', *blocks)
+
+def xor_bytes(data, keystream):
+    """
+    XOR data with the start of a keystream as two big integers.
+
+    Args:
+        data (bytes-like): Input data.
+        keystream (bytes-like): Keystream at least as long as the data.
+
+    Returns:
+        bytes: data XOR keystream, with the length of data.
+    """
+    length = len(data)
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream[:length], 'big')).to_bytes(length, 'big')
+
+def block_functions(key):
+    """
+    Build the block encrypt/decrypt functions for a key.
+
+    An 8-byte key (or a 64-bit integer) selects single DES; a 16 or 24-byte
+    key bundle selects Triple-DES (keying option 2 or 1).
+
+    Args:
+        key (bytes or int): The key.
+
+    Returns:
+        tuple: (encrypt_block, decrypt_block) callables over 64-bit integers.
+
+    Raises:
+        ValueError: If the key has an unsupported size.
+    """
+    return stage_block_functions(*key_stages(key))
+
+def stage_block_functions(forward, reverse):
+    """
+    Build the block encrypt/decrypt functions from already compiled stages.
+
+    Args:
+        forward (tuple): Round keys of each stage for encryption (see `key_stages`).
+        reverse (tuple): Round keys of each stage for decryption.
+
+    Returns:
+        tuple: (encrypt_block, decrypt_block) callables over 64-bit integers.
+    """
+    if len(forward) == 1:
+        cipher = DESCipher.from_round_keys(forward[0], reverse[0])
+        return cipher.encrypt_block, cipher.decrypt_block
+    return partial(tdes_crypt_int, stages=forward), partial(tdes_crypt_int, stages=reverse)
+
+def batch_functions(key, engine=None):
+    """
+    Build batch encrypt/decrypt functions for a key.
+
+    Args:
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        engine (str): 'numpy' or 'bitslice'; defaults to NumPy when it is installed.
+
+    Returns:
+        BatchFunctions: Callables over whole-block buffers and the minimum
+            number of blocks worth batching.
+
+    Raises:
+        ValueError: If the engine is unknown or unavailable.
+    """
+    forward, reverse = key_stages(key)
+    return stage_batch_functions(forward, reverse, engine)
+
+def stage_batch_functions(forward, reverse, engine=None):
+    """
+    Build batch encrypt/decrypt functions from already compiled stages.
+
+    Args:
+        forward (tuple): Round keys of each stage for encryption (see `key_stages`).
+        reverse (tuple): Round keys of each stage for decryption.
+        engine (str): 'numpy' or 'bitslice'; defaults to NumPy when it is installed.
+
+    Returns:
+        BatchFunctions: Callables over whole-block buffers and the minimum
+            number of blocks worth batching.
+
+    Raises:
+        ValueError: If the engine is unknown or unavailable.
+    """
+    engine = engine or DEFAULT_BATCH_ENGINE
+    if engine not in BATCH_THRESHOLDS:
+        raise ValueError(f"Unsupported batch engine '{engine}'. Expected one of: {', '.join(BATCH_THRESHOLDS)}.")
+    if engine == 'numpy' and batch_des is None:
+        raise ValueError("The 'numpy' batch engine requires NumPy to be installed.")
+    module = batch_des if engine == 'numpy' else bitslice_des
+    return BatchFunctions(partial(module.crypt_bytes, stages=forward),
+                          partial(module.crypt_bytes, stages=reverse),
+                          BATCH_THRESHOLDS[engine])
+
+def _iv_to_int(mode, iv):
+    """
+    Validate the IV for a mode and return it as a 64-bit integer (None for ECB).
+
+    Raises:
+        ValueError: If the IV is missing, unexpected or not 8 bytes.
+    """
+    if mode == 'ECB':
+        if iv is not None:
+            raise ValueError("ECB mode does not use an IV.")
+        return None
+    if iv is None:
+        raise ValueError(f"{mode} mode requires an IV.")
+    if len(iv) != BLOCK_SIZE:
+        raise ValueError("IV must be exactly 8 bytes (16 hexadecimal characters).")
+    return int.from_bytes(iv, 'big')
+
+def _check_mode(mode):
+    """
+    Normalize a mode name.
+
+    Raises:
+        ValueError: If the mode is not supported.
+    """
+    mode = mode.upper()
+    if mode not in MODES:
+        raise ValueError(f"Unsupported mode '{mode}'. Expected one of: {', '.join(MODES)}.")
+    return mode
+
+def _crypt_buffer(crypt, batch_crypt, min_blocks, data):
+    """
+    Apply a block function independently to every whole block of a buffer.
+
+    Buffers of at least `min_blocks` blocks go through the batch function.
+
+    Args:
+        crypt (callable): Per-block function over 64-bit integers.
+        batch_crypt (callable): Batch function over whole-block buffers, or None.
+        min_blocks (int): Minimum number of blocks for the batch function.
+        data (bytes): Buffer whose length is a multiple of 8.
+
+    Returns:
+        bytes: The processed blocks.
+    """
+    if batch_crypt is not None and len(data) >= min_blocks * BLOCK_SIZE:
+        return batch_crypt(data)
+    return join_blocks([crypt(block) for block in split_blocks(data)])
+
+def _counter_bytes(iv, count):
+    """
+    Consecutive CTR counter blocks starting at `iv`, wrapping modulo 2**64.
+    """
+    if batch_des is not None:
+        return batch_des.blocks_to_bytes(batch_des.counter_blocks(iv, count))
+    return join_blocks([(iv + i) & BLOCK_MASK for i in range(count)])
+
+def _keystream(crypt, batch_crypt, min_blocks, mode, iv, count):
+    """
+    Generate `count` keystream blocks for OFB or CTR mode as bytes.
+    """
+    if mode == 'CTR':
+        return _crypt_buffer(crypt, batch_crypt, min_blocks, _counter_bytes(iv, count))
+    stream = []
+    for _ in range(count):
+        iv = crypt(iv)
+        stream.append(iv)
+    return join_blocks(stream)
+
+def _block_count(length):
+    """
+    Number of blocks needed to cover `length` bytes.
+    """
+    return (length + BLOCK_SIZE - 1) // BLOCK_SIZE
+
+def encrypt_with(encrypt_block, data, mode='ECB', iv=None, batch=None, padding=True):
+    """
+    Encrypt data in a mode of operation using any 64-bit block function.
+
+    Args:
+        encrypt_block (callable): Encrypts one 64-bit integer block.
+        data (bytes): Plaintext of any length.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        batch (BatchFunctions): Optional batch functions, used for the
+            independent blocks of ECB and CTR.
+        padding (bool): Whether to PKCS#7 pad ECB and CBC input. Without
+            padding the input must be whole blocks (used to process chunks).
+
+    Returns:
+        bytes: The ciphertext. ECB and CBC output is PKCS#7 padded.
+
+    Raises:
+        ValueError: If the mode or IV is invalid, or unpadded input is not whole blocks.
+    """
+    mode = _check_mode(mode)
+    iv = _iv_to_int(mode, iv)
+    batch_encrypt, min_blocks = (batch.encrypt, batch.min_blocks) if batch else (None, 0)
+
+    if mode in PADDED_MODES:
+        if padding:
+            data = pkcs7_pad(data)
+        elif len(data) % BLOCK_SIZE:
+            raise ValueError(f"Unpadded {mode} input length must be a multiple of 8 bytes.")
+
+    if mode == 'ECB':
+        return _crypt_buffer(encrypt_block, batch_encrypt, min_blocks, data)
+
+    if mode == 'CBC':
+        out = []
+        for block in split_blocks(data):
+            iv = encrypt_block(block ^ iv)
+            out.append(iv)
+        return join_blocks(out)
+
+    if mode == 'CFB':
+        out = []
+        for block in split_blocks(data):
+            iv = block ^ encrypt_block(iv)
+            out.append(iv)
+        result = join_blocks(out)
+        tail = data[len(result):]
+        if tail:
+            result += xor_bytes(tail, join_blocks([encrypt_block(iv)]))
+        return result
+
+    # OFB and CTR: XOR the whole buffer with the keystream at once
+    return xor_bytes(data, _keystream(encrypt_block, batch_encrypt, min_blocks, mode, iv, _block_count(len(data))))
+
+def decrypt_with(encrypt_block, decrypt_block, data, mode='ECB', iv=None, batch=None, padding=True):
+    """
+    Decrypt data in a mode of operation using any 64-bit block functions.
+
+    Args:
+        encrypt_block (callable): Encrypts one 64-bit integer block (used by CFB, OFB, CTR).
+        decrypt_block (callable): Decrypts one 64-bit integer block (used by ECB, CBC).
+        data (bytes): Ciphertext.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        batch (BatchFunctions): Optional batch functions, used for the
+            independent blocks of ECB, CBC, CFB and CTR.
+        padding (bool): Whether to remove PKCS#7 padding from ECB and CBC output.
+
+    Returns:
+        bytes: The plaintext, with PKCS#7 padding removed for ECB and CBC.
+
+    Raises:
+        ValueError: If the mode, IV, ciphertext length or padding is invalid.
+    """
+    mode = _check_mode(mode)
+    iv = _iv_to_int(mode, iv)
+    batch_encrypt, batch_decrypt, min_blocks = batch if batch else (None, None, 0)
+
+    if mode in PADDED_MODES:
+        if (padding and not data) or len(data) % BLOCK_SIZE:
+            raise ValueError(f"{mode} ciphertext length must be a non-zero multiple of 8 bytes.")
+        plain = _crypt_buffer(decrypt_block, batch_decrypt, min_blocks, data)
+        if mode == 'CBC' and data:
+            # Every block is XORed with the previous ciphertext block (the IV for the first)
+            plain = xor_bytes(plain, iv.to_bytes(BLOCK_SIZE, 'big') + data[:-BLOCK_SIZE])
+        return pkcs7_unpad(plain) if padding else plain
+
+    count = _block_count(len(data))
+    if mode == 'CFB':
+        # Keystream inputs are the IV followed by the previous ciphertext blocks
+        inputs = iv.to_bytes(BLOCK_SIZE, 'big') + data[:(count - 1) * BLOCK_SIZE] if count else b''
+        return xor_bytes(data, _crypt_buffer(encrypt_block, batch_encrypt, min_blocks, inputs))
+
+    return xor_bytes(data, _keystream(encrypt_block, batch_encrypt, min_blocks, mode, iv, count))
+
+def encrypt(data, key, mode='ECB', iv=None, engine=None, padding=True):
+    """
+    Encrypt data of any length with DES or Triple-DES in a mode of operation.
+
+    Args:
+        data (bytes): Plaintext.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+        padding (bool): Whether to PKCS#7 pad ECB and CBC input.
+
+    Returns:
+        bytes: The ciphertext.
+    """
+    encrypt_block, _ = block_functions(key)
+    return encrypt_with(encrypt_block, data, mode, iv, batch_functions(key, engine), padding)
+
+def decrypt(data, key, mode='ECB', iv=None, engine=None, padding=True):
+    """
+    Decrypt data with DES or Triple-DES in a mode of operation.
+
+    Args:
+        data (bytes): Ciphertext.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+        padding (bool): Whether to remove PKCS#7 padding from ECB and CBC output.
+
+    Returns:
+        bytes: The plaintext.
+    """
+    encrypt_block, decrypt_block = block_functions(key)
+    return decrypt_with(encrypt_block, decrypt_block, data, mode, iv, batch_functions(key, engine), padding)
+
+def ctr_counter(iv, offset):
+    """
+    Counter block of the CTR block that holds byte `offset` of the stream.
+
+    Args:
+        iv (bytes): 8-byte initial counter block.
+        offset (int): Byte offset in the plaintext/ciphertext stream.
+
+    Returns:
+        bytes: The 8-byte counter block (wrapping modulo 2**64).
+    """
+    counter = (int.from_bytes(iv, 'big') + offset // BLOCK_SIZE) & BLOCK_MASK
+    return counter.to_bytes(BLOCK_SIZE, 'big')
+
+def ctr_crypt_range_with(encrypt_block, data, iv, offset, batch=None):
+    """
+    Encrypt or decrypt a slice of a CTR stream on its own.
+
+    Only the blocks covering the slice are processed: the keystream starts at
+    the counter block of `offset`, and the bytes of its first block that lie
+    before `offset` are skipped. The cost is proportional to the slice, not
+    to its position in the stream.
+
+    Args:
+        encrypt_block (callable): Encrypts one 64-bit integer block.
+        data (bytes-like): The slice (CTR encryption and decryption are the same XOR).
+        iv (bytes): 8-byte initial counter block of the whole stream.
+        offset (int): Byte offset of the slice in the stream.
+        batch (BatchFunctions): Optional batch functions.
+
+    Returns:
+        bytes: The processed slice.
+
+    Raises:
+        ValueError: If the IV is invalid or the offset is negative.
+    """
+    if offset < 0:
+        raise ValueError("Offset must not be negative.")
+    _iv_to_int('CTR', iv)
+    skip = offset % BLOCK_SIZE
+    if not skip:
+        return encrypt_with(encrypt_block, data, 'CTR', ctr_counter(iv, offset), batch)
+    # Align to the block boundary with placeholder bytes, then trim them off
+    return encrypt_with(encrypt_block, bytes(skip) + bytes(data), 'CTR', ctr_counter(iv, offset), batch)[skip:]
+
+def ctr_crypt_range(data, key, iv, offset, engine=None):
+    """
+    Encrypt or decrypt a slice of a CTR stream that starts at byte `offset`.
+
+    Args:
+        data (bytes-like): The slice.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        iv (bytes): 8-byte initial counter block of the whole stream.
+        offset (int): Byte offset of the slice in the stream.
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+
+    Returns:
+        bytes: The processed slice.
+    """
+    encrypt_block, _ = block_functions(key)
+    return ctr_crypt_range_with(encrypt_block, data, iv, offset, batch_functions(key, engine))
+
+def ctr_decrypt_range(ciphertext, key, iv, start, stop, engine=None):
+    """
+    Decrypt bytes [start, stop) of a CTR ciphertext without touching the rest.
+
+    Args:
+        ciphertext (bytes-like): The whole ciphertext, e.g. a memory-mapped file.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        iv (bytes): 8-byte initial counter block.
+        start (int): First byte of the range.
+        stop (int): End of the range (exclusive, clamped to the ciphertext length).
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+
+    Returns:
+        bytes: The plaintext of the range.
+
+    Raises:
+        ValueError: If the range is invalid.
+    """
+    view = memoryview(ciphertext).cast('B')
+    if not 0 <= start <= stop:
+        raise ValueError("Range must satisfy 0 <= start <= stop.")
+    return ctr_crypt_range(view[start:min(stop, view.nbytes)], key, iv, start, engine)
+
+# Input bytes processed per step by `encrypt_into` and `decrypt_into`
+INTO_SEGMENT_SIZE = 64 * 1024
+
+def output_size(length, mode, padding=True):
+    """
+    Size of the ciphertext for a plaintext of `length` bytes.
+
+    Args:
+        length (int): Plaintext length in bytes.
+        mode (str): One of MODES.
+        padding (bool): Whether ECB and CBC input is PKCS#7 padded.
+
+    Returns:
+        int: Ciphertext length in bytes (an upper bound on the plaintext length when decrypting).
+    """
+    if _check_mode(mode) in PADDED_MODES and padding:
+        return length - length % BLOCK_SIZE + BLOCK_SIZE
+    return length
+
+def _next_iv(mode, iv, src, out, encrypting):
+    """
+    The IV that continues a mode after a segment of whole blocks.
+
+    Args:
+        mode (str): Mode name.
+        iv (bytes): IV the segment started from.
+        src (memoryview): Segment input.
+        out (bytes): Segment output.
+        encrypting (bool): Whether `out` is ciphertext.
+
+    Returns:
+        bytes: IV for the next segment (None for ECB).
+    """
+    if mode == 'ECB':
+        return None
+    if mode == 'CTR':
+        counter = int.from_bytes(iv, 'big') + len(src) // BLOCK_SIZE
+        return (counter & BLOCK_MASK).to_bytes(BLOCK_SIZE, 'big')
+    if mode == 'OFB':
+        # The last keystream block is what the last block was XORed with
+        return xor_bytes(src[-BLOCK_SIZE:], out[-BLOCK_SIZE:])
+    # CBC and CFB chain from the last ciphertext block
+    return bytes(out[-BLOCK_SIZE:] if encrypting else src[-BLOCK_SIZE:])
+
+class _ModeStream:
+    """
+    Shared state of ModeEncryptor and ModeDecryptor: the block functions,
+    the IV that continues the mode, and the bytes of an unfinished block.
+    """
+
+    __slots__ = ('mode', 'padding', 'encrypt_block', 'decrypt_block', 'batch', 'iv', '_pending', '_finished')
+
+    def __init__(self, key, mode='ECB', iv=None, engine=None, padding=True):
+        self.mode = _check_mode(mode)
+        _iv_to_int(self.mode, iv)
+        self.padding = padding
+        self.encrypt_block, self.decrypt_block = block_functions(key)
+        self.batch = batch_functions(key, engine)
+        self.iv = bytes(iv) if iv is not None else None
+        self._pending = bytearray()
+        self._finished = False
+
+    def _take(self, data, hold_last):
+        """
+        Buffer `data` and remove the whole blocks that can be processed now.
+
+        Args:
+            data (bytes-like): New input.
+            hold_last (bool): Keep the last whole block buffered (it may hold padding).
+
+        Returns:
+            bytes: Whole blocks to process (possibly empty).
+
+        Raises:
+            ValueError: If the stream was already finalized.
+        """
+        if self._finished:
+            raise ValueError("Stream has already been finalized.")
+        self._pending += data
+        usable = len(self._pending) - len(self._pending) % BLOCK_SIZE
+        if hold_last and usable == len(self._pending):
+            usable -= BLOCK_SIZE
+        if usable <= 0:
+            return b''
+        blocks = bytes(self._pending[:usable])
+        del self._pending[:usable]
+        return blocks
+
+    def _rest(self):
+        """
+        Mark the stream finished and return the buffered bytes.
+        """
+        if self._finished:
+            raise ValueError("Stream has already been finalized.")
+        self._finished = True
+        rest = bytes(self._pending)
+        self._pending.clear()
+        return rest
+
+class ModeEncryptor(_ModeStream):
+    """
+    Incremental encryption in a mode of operation.
+
+    Feed plaintext of any size with `update` and call `finalize` once at the
+    end; the concatenated output equals `encrypt` on the whole plaintext.
+    Only the bytes of an unfinished block are buffered between calls.
+
+    Args:
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+        padding (bool): Whether to PKCS#7 pad ECB and CBC input.
+
+    Raises:
+        ValueError: If the key, mode, IV or engine is invalid.
+    """
+
+    __slots__ = ()
+
+    def update(self, data):
+        """
+        Encrypt the next part of the plaintext.
+
+        Args:
+            data (bytes-like): Plaintext.
+
+        Returns:
+            bytes: Ciphertext for every block completed so far.
+        """
+        blocks = self._take(data, hold_last=False)
+        if not blocks:
+            return b''
+        out = encrypt_with(self.encrypt_block, blocks, self.mode, self.iv, self.batch, padding=False)
+        self.iv = _next_iv(self.mode, self.iv, blocks, out, encrypting=True)
+        return out
+
+    def finalize(self):
+        """
+        Encrypt the buffered tail, padding it for ECB and CBC.
+
+        Returns:
+            bytes: The last part of the ciphertext.
+
+        Raises:
+            ValueError: If unpadded ECB/CBC input did not end on a block boundary.
+        """
+        return encrypt_with(self.encrypt_block, self._rest(), self.mode, self.iv, self.batch, self.padding)
+
+class ModeDecryptor(_ModeStream):
+    """
+    Incremental decryption in a mode of operation.
+
+    For padded ECB and CBC the last block is held back until `finalize`,
+    which removes the padding.
+
+    Args:
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+        padding (bool): Whether to remove PKCS#7 padding from ECB and CBC output.
+
+    Raises:
+        ValueError: If the key, mode, IV or engine is invalid.
+    """
+
+    __slots__ = ()
+
+    def update(self, data):
+        """
+        Decrypt the next part of the ciphertext.
+
+        Args:
+            data (bytes-like): Ciphertext.
+
+        Returns:
+            bytes: Plaintext for every block that can be released so far.
+        """
+        blocks = self._take(data, hold_last=self.padding and self.mode in PADDED_MODES)
+        if not blocks:
+            return b''
+        out = decrypt_with(self.encrypt_block, self.decrypt_block, blocks, self.mode, self.iv,
+                           self.batch, padding=False)
+        self.iv = _next_iv(self.mode, self.iv, blocks, out, encrypting=False)
+        return out
+
+    def finalize(self):
+        """
+        Decrypt the buffered tail, removing the padding for ECB and CBC.
+
+        Returns:
+            bytes: The last part of the plaintext.
+
+        Raises:
+            ValueError: If the ciphertext length or padding is invalid.
+        """
+        return decrypt_with(self.encrypt_block, self.decrypt_block, self._rest(), self.mode, self.iv,
+                            self.batch, self.padding)
+
+def _write_at(dst, offset, data):
+    """
+    Copy `data` into `dst` at `offset` and return the offset after it.
+
+    Raises:
+        ValueError: If `dst` is too small.
+    """
+    end = offset + len(data)
+    if end > dst.nbytes:
+        raise ValueError("Output buffer is too small.")
+    dst[offset:end] = data
+    return end
+
+def _stream_into(stream, src, dst):
+    """
+    Run a ModeEncryptor/ModeDecryptor over a buffer one segment at a time, writing into `dst`.
+
+    Returns:
+        int: Number of bytes written.
+    """
+    src = memoryview(src).cast('B')
+    dst = memoryview(dst).cast('B')
+    written = 0
+    for offset in range(0, src.nbytes, INTO_SEGMENT_SIZE):
+        written = _write_at(dst, written, stream.update(src[offset:offset + INTO_SEGMENT_SIZE]))
+    return _write_at(dst, written, stream.finalize())
+
+def encrypt_into(src, dst, key, mode='ECB', iv=None, engine=None, padding=True):
+    """
+    Encrypt a buffer into a preallocated output buffer.
+
+    The input is processed INTO_SEGMENT_SIZE bytes at a time by a
+    ModeEncryptor, so memory use does not grow with the input.
+
+    Args:
+        src (bytes-like): Plaintext in any buffer (bytes, bytearray, memoryview, mmap).
+        dst (bytes-like): Writable buffer of at least `output_size(len(src), mode, padding)` bytes.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+        padding (bool): Whether to PKCS#7 pad ECB and CBC input.
+
+    Returns:
+        int: Number of bytes written to `dst`.
+
+    Raises:
+        ValueError: If the mode or IV is invalid, or `dst` is too small.
+    """
+    stream = ModeEncryptor(key, mode, iv, engine, padding)
+    if memoryview(dst).nbytes < output_size(memoryview(src).nbytes, stream.mode, padding):
+        raise ValueError("Output buffer is too small.")
+    return _stream_into(stream, src, dst)
+
+def decrypt_into(src, dst, key, mode='ECB', iv=None, engine=None, padding=True):
+    """
+    Decrypt a buffer into a preallocated output buffer.
+
+    Args:
+        src (bytes-like): Ciphertext in any buffer (bytes, bytearray, memoryview, mmap).
+        dst (bytes-like): Writable buffer of at least len(src) bytes.
+        key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+        mode (str): One of MODES.
+        iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+        engine (str): Batch engine for independent blocks ('numpy' or 'bitslice').
+        padding (bool): Whether to remove PKCS#7 padding from ECB and CBC output.
+
+    Returns:
+        int: Number of plaintext bytes written to `dst`.
+
+    Raises:
+        ValueError: If the mode, IV, ciphertext length or padding is invalid, or `dst` is too small.
+    """
+    stream = ModeDecryptor(key, mode, iv, engine, padding)
+    if memoryview(dst).nbytes < memoryview(src).nbytes:
+        raise ValueError("Output buffer is too small.")
+    return _stream_into(stream, src, dst)
@@ -0,0 +1,291 @@
+# backend/parallel.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .modes import (BLOCK_SIZE, BLOCK_MASK, PADDED_MODES, _check_mode, _iv_to_int, _next_iv, _write_at,
+                    encrypt_with, decrypt_with, output_size, pkcs7_pad, pkcs7_unpad,
+                    stage_block_functions, stage_batch_functions)
+from .triple_des import key_stages
+from . import modes
+
+# Bytes of input per task; a multiple of the block size so chunks never split a block
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Inputs smaller than this are processed inline: starting workers and copying
+# the data to them costs more than the encryption itself
+PARALLEL_THRESHOLD = 4 << 20
+
+# Modes whose blocks can be processed independently in each direction.
+# CBC and CFB encryption chain every block to the previous ciphertext, and
+# OFB chains its keystream, so they always run sequentially.
+PARALLEL_ENCRYPT_MODES = ('ECB', 'CTR')
+PARALLEL_DECRYPT_MODES = ('ECB', 'CBC', 'CFB', 'CTR')
+
+# Block functions of the key a worker process was started with
+_worker_functions = None
+
+def _init_worker(forward, reverse, engine):
+    """
+    Pool initializer: build the block and batch functions once per worker
+    from the compiled round keys, so tasks only carry data.
+    """
+    global _worker_functions
+    encrypt_block, decrypt_block = stage_block_functions(forward, reverse)
+    _worker_functions = (encrypt_block, decrypt_block, stage_batch_functions(forward, reverse, engine))
+
+def _encrypt_chunk(chunk, mode, iv):
+    """
+    Encrypt one block-aligned chunk in a worker (no padding).
+    """
+    encrypt_block, _, batch = _worker_functions
+    return encrypt_with(encrypt_block, chunk, mode, iv, batch, padding=False)
+
+def _decrypt_chunk(chunk, mode, iv):
+    """
+    Decrypt one block-aligned chunk in a worker (no unpadding).
+    """
+    encrypt_block, decrypt_block, batch = _worker_functions
+    return decrypt_with(encrypt_block, decrypt_block, chunk, mode, iv, batch, padding=False)
+
+def _chunk_ivs(data, mode, iv, chunk_size):
+    """
+    IV for every chunk of a buffer, so that each chunk can be processed on its own.
+
+    CTR chunks start at the counter of their first block; CBC and CFB chunks
+    chain from the last ciphertext block of the previous chunk.
+
+    Args:
+        data (bytes): The input buffer (ciphertext for CBC and CFB).
+        mode (str): One of the parallel modes.
+        iv (bytes): The IV of the whole buffer (None for ECB).
+        chunk_size (int): Chunk size in bytes, a multiple of the block size.
+
+    Returns:
+        list: One IV (or None for ECB) per chunk.
+    """
+    starts = range(0, len(data), chunk_size)
+    if mode == 'ECB':
+        return [None] * len(starts)
+    if mode == 'CTR':
+        counter = int.from_bytes(iv, 'big')
+        return [((counter + start // BLOCK_SIZE) & BLOCK_MASK).to_bytes(BLOCK_SIZE, 'big') for start in starts]
+    return [bytes(iv) if start == 0 else bytes(data[start - BLOCK_SIZE:start]) for start in starts]
+
+class ParallelCipher:
+    """
+    DES/Triple-DES over a pool of worker processes for one key.
+
+    The key schedule is compiled once here and sent to each worker when it
+    starts. Inputs are split into block-aligned chunks that are processed in
+    parallel and reassembled in order. The pool is only started for the first
+    input large enough to benefit; smaller inputs and the sequential modes
+    run inline.
+
+    Use it as a context manager (or call `close`) to shut the workers down.
+    """
+
+    def __init__(self, key, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, threshold=PARALLEL_THRESHOLD, engine=None):
+        """
+        Args:
+            key (bytes or int): 8-byte DES key, or 16/24-byte Triple-DES key bundle.
+            workers (int): Number of worker processes (default: CPU count).
+            chunk_size (int): Bytes per task, rounded down to whole blocks.
+            threshold (int): Minimum input size in bytes for parallel execution.
+            engine (str): Batch engine used inside each chunk ('numpy' or 'bitslice').
+
+        Raises:
+            ValueError: If the key, worker count, chunk size or engine is invalid.
+        """
+        self.key = key
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size - chunk_size % BLOCK_SIZE
+        self.threshold = threshold
+        self.engine = engine
+        if self.workers < 1:
+            raise ValueError("Worker count must be at least 1.")
+        if self.chunk_size < BLOCK_SIZE:
+            raise ValueError("Chunk size must be at least one block (8 bytes).")
+        self.forward, self.reverse = key_stages(key)
+        # Fail early on an unknown engine rather than in every worker
+        stage_batch_functions(self.forward, self.reverse, engine)
+        self._executor = None
+
+    def _use_pool(self, length):
+        """
+        Whether an input of `length` bytes is worth sending to the workers.
+        """
+        return self.workers > 1 and length >= self.threshold and length > self.chunk_size
+
+    def _map(self, task, data, mode, iv):
+        """
+        Run a chunk task over the whole buffer in the pool and join the results in order.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.forward, self.reverse, self.engine))
+        view = memoryview(data)
+        chunks = [bytes(view[start:start + self.chunk_size]) for start in range(0, len(data), self.chunk_size)]
+        ivs = _chunk_ivs(view, mode, iv, self.chunk_size)
+        return b''.join(self._executor.map(task, chunks, [mode] * len(chunks), ivs))
+
+    def encrypt(self, data, mode='ECB', iv=None, padding=True):
+        """
+        Encrypt data in a mode of operation, in parallel for ECB and CTR.
+
+        Args:
+            data (bytes): Plaintext.
+            mode (str): One of modes.MODES.
+            iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+            padding (bool): Whether to PKCS#7 pad ECB and CBC input.
+
+        Returns:
+            bytes: The ciphertext, identical to `modes.encrypt`.
+
+        Raises:
+            ValueError: If the mode, IV or input length is invalid.
+        """
+        mode = _check_mode(mode)
+        if mode not in PARALLEL_ENCRYPT_MODES or not self._use_pool(len(data)):
+            return modes.encrypt(data, self.key, mode, iv, self.engine, padding)
+        _iv_to_int(mode, iv)
+        if mode in PADDED_MODES and padding:
+            data = pkcs7_pad(data)
+        elif mode in PADDED_MODES and len(data) % BLOCK_SIZE:
+            raise ValueError(f"Unpadded {mode} input length must be a multiple of 8 bytes.")
+        return self._map(_encrypt_chunk, data, mode, iv)
+
+    def decrypt(self, data, mode='ECB', iv=None, padding=True):
+        """
+        Decrypt data in a mode of operation, in parallel for ECB, CBC, CFB and CTR.
+
+        Args:
+            data (bytes): Ciphertext.
+            mode (str): One of modes.MODES.
+            iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+            padding (bool): Whether to remove PKCS#7 padding from ECB and CBC output.
+
+        Returns:
+            bytes: The plaintext, identical to `modes.decrypt`.
+
+        Raises:
+            ValueError: If the mode, IV, ciphertext length or padding is invalid.
+        """
+        mode = _check_mode(mode)
+        if mode not in PARALLEL_DECRYPT_MODES or not self._use_pool(len(data)):
+            return modes.decrypt(data, self.key, mode, iv, self.engine, padding)
+        _iv_to_int(mode, iv)
+        if mode in PADDED_MODES and len(data) % BLOCK_SIZE:
+            raise ValueError(f"{mode} ciphertext length must be a non-zero multiple of 8 bytes.")
+        plain = self._map(_decrypt_chunk, data, mode, iv)
+        return pkcs7_unpad(plain) if mode in PADDED_MODES and padding else plain
+
+    def encrypt_into(self, src, dst, mode='ECB', iv=None, padding=True):
+        """
+        Encrypt a buffer into a preallocated output buffer, in parallel where the mode allows.
+
+        The input is processed one window of at least `workers * chunk_size` bytes
+        at a time, so memory use stays bounded for memory-mapped files of any size.
+
+        Args:
+            src (bytes-like): Plaintext in any buffer (bytes, bytearray, memoryview, mmap).
+            dst (bytes-like): Writable buffer of at least `modes.output_size(len(src), mode, padding)` bytes.
+            mode (str): One of modes.MODES.
+            iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+            padding (bool): Whether to PKCS#7 pad ECB and CBC input.
+
+        Returns:
+            int: Number of bytes written to `dst`.
+
+        Raises:
+            ValueError: If the mode or IV is invalid, or `dst` is too small.
+        """
+        mode = _check_mode(mode)
+        if memoryview(dst).nbytes < output_size(memoryview(src).nbytes, mode, padding):
+            raise ValueError("Output buffer is too small.")
+        if mode not in PARALLEL_ENCRYPT_MODES or not self._use_pool(memoryview(src).nbytes):
+            return modes.encrypt_into(src, dst, self.key, mode, iv, self.engine, padding)
+        return self._windows_into(self.encrypt, src, dst, mode, iv, padding, encrypting=True)
+
+    def decrypt_into(self, src, dst, mode='ECB', iv=None, padding=True):
+        """
+        Decrypt a buffer into a preallocated output buffer, in parallel where the mode allows.
+
+        Args:
+            src (bytes-like): Ciphertext in any buffer (bytes, bytearray, memoryview, mmap).
+            dst (bytes-like): Writable buffer of at least len(src) bytes.
+            mode (str): One of modes.MODES.
+            iv (bytes): 8-byte IV (initial counter block for CTR); None for ECB.
+            padding (bool): Whether to remove PKCS#7 padding from ECB and CBC output.
+
+        Returns:
+            int: Number of plaintext bytes written to `dst`.
+
+        Raises:
+            ValueError: If the mode, IV, ciphertext length or padding is invalid, or `dst` is too small.
+        """
+        mode = _check_mode(mode)
+        if memoryview(dst).nbytes < memoryview(src).nbytes:
+            raise ValueError("Output buffer is too small.")
+        if mode not in PARALLEL_DECRYPT_MODES or not self._use_pool(memoryview(src).nbytes):
+            return modes.decrypt_into(src, dst, self.key, mode, iv, self.engine, padding)
+        return self._windows_into(self.decrypt, src, dst, mode, iv, padding, encrypting=False)
+
+    def _windows_into(self, crypt, src, dst, mode, iv, padding, encrypting):
+        """
+        Run `crypt` (self.encrypt or self.decrypt) over `src` one window at a
+        time, chaining the IV between windows and padding only the last one.
+        """
+        _iv_to_int(mode, iv)
+        src = memoryview(src).cast('B')
+        dst = memoryview(dst).cast('B')
+        # Whole chunks, and large enough for the pool to be used
+        window = max(self.workers, -(-self.threshold // self.chunk_size)) * self.chunk_size
+        written = 0
+        for offset in range(0, src.nbytes, window):
+            segment = src[offset:offset + window]
+            last = offset + window >= src.nbytes
+            out = crypt(segment, mode, iv, padding and last)
+            written = _write_at(dst, written, out)
+            if not last:
+                iv = _next_iv(mode, iv, segment, out, encrypting)
+        return written
+
+    def close(self):
+        """
+        Shut down the worker processes, if they were started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def parallel_encrypt(data, key, mode='ECB', iv=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     threshold=PARALLEL_THRESHOLD, engine=None):
+    """
+    Encrypt data with a one-off pool of worker processes.
+
+    Same arguments and output as `modes.encrypt`, plus the tuning knobs of `ParallelCipher`.
+
+    Returns:
+        bytes: The ciphertext.
+    """
+    with ParallelCipher(key, workers, chunk_size, threshold, engine) as cipher:
+        return cipher.encrypt(data, mode, iv)
+
+def parallel_decrypt(data, key, mode='ECB', iv=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     threshold=PARALLEL_THRESHOLD, engine=None):
+    """
+    Decrypt data with a one-off pool of worker processes.
+
+    Same arguments and output as `modes.decrypt`, plus the tuning knobs of `ParallelCipher`.
+
+    Returns:
+        bytes: The plaintext.
+    """
+    with ParallelCipher(key, workers, chunk_size, threshold, engine) as cipher:
+        return cipher.decrypt(data, mode, iv)
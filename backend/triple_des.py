@@ -0,0 +1,132 @@
+# backend/triple_des.py
+
+from collections import namedtuple
+from .des import IP_TABLES, FP_TABLES, des_rounds_int
+from .key_expansion import get_key_schedule
+from .utils import permute_int
+
+# Keying option for each key bundle length in bytes:
+# 1 = three independent keys (EDE3), 2 = K1 = K3 (EDE2), 3 = K1 = K2 = K3 (single DES)
+KEYING_OPTIONS = {24: 1, 16: 2, 8: 3}
+
+# Compiled Triple-DES schedule: round keys of the three stages for each direction
+TripleKeySchedule = namedtuple('TripleKeySchedule', ['forward', 'reverse', 'keying_option'])
+
+def split_key(key):
+    """
+    Split a Triple-DES key bundle into its three 64-bit keys.
+
+    Args:
+        key (bytes): 24-byte (option 1), 16-byte (option 2) or 8-byte (option 3) key bundle.
+
+    Returns:
+        tuple: (K1, K2, K3) as 64-bit integers.
+
+    Raises:
+        ValueError: If the key bundle has an unsupported length.
+    """
+    if len(key) not in KEYING_OPTIONS:
+        raise ValueError("Triple-DES key must be 8, 16 or 24 bytes (16, 32 or 48 hexadecimal characters).")
+    keys = [int.from_bytes(key[i:i + 8], 'big') for i in range(0, len(key), 8)]
+    if len(keys) == 1:
+        return keys[0], keys[0], keys[0]
+    if len(keys) == 2:
+        return keys[0], keys[1], keys[0]
+    return tuple(keys)
+
+def compile_triple_key(key):
+    """
+    Compile the three key schedules of a Triple-DES key bundle.
+
+    Encryption is E(K1) -> D(K2) -> E(K3) and decryption is D(K3) -> E(K2) -> D(K1);
+    the individual schedules come from the process-wide key schedule cache.
+
+    Args:
+        key (bytes): 8, 16 or 24-byte key bundle.
+
+    Returns:
+        TripleKeySchedule: Round keys of the three stages in both directions.
+    """
+    k1, k2, k3 = (get_key_schedule(k) for k in split_key(key))
+    return TripleKeySchedule(
+        forward=(k1.forward, k2.reverse, k3.forward),
+        reverse=(k3.reverse, k2.forward, k1.reverse),
+        keying_option=KEYING_OPTIONS[len(key)]
+    )
+
+def key_stages(key):
+    """
+    Resolve a DES key or Triple-DES key bundle into per-stage round keys.
+
+    Args:
+        key (bytes or int): 8-byte DES key (or 64-bit integer), or 16/24-byte key bundle.
+
+    Returns:
+        tuple: (stages for encryption, stages for decryption); a single stage
+            for DES and three for Triple-DES.
+
+    Raises:
+        ValueError: If the key has an unsupported size.
+    """
+    if isinstance(key, int):
+        if not 0 <= key < 1 << 64:
+            raise ValueError("Key must be a 64-bit value.")
+        key = key.to_bytes(8, 'big')
+    if len(key) == 8:
+        schedule = get_key_schedule(int.from_bytes(key, 'big'))
+        return (schedule.forward,), (schedule.reverse,)
+    if len(key) in KEYING_OPTIONS:
+        schedule = compile_triple_key(key)
+        return schedule.forward, schedule.reverse
+    raise ValueError("Key must be 8 bytes (DES) or 16/24 bytes (Triple-DES).")
+
+def tdes_crypt_int(block, stages):
+    """
+    Run three chained DES operations on a 64-bit integer block.
+
+    The Final Permutation of one stage and the Initial Permutation of the next
+    cancel out, so only the outer IP/FP are applied; between stages the halves
+    are swapped back exactly as FP followed by IP would leave them.
+
+    Args:
+        block (int): The 64-bit input block.
+        stages (tuple): Round keys (16 48-bit integers) for each of the three stages.
+
+    Returns:
+        int: The 64-bit output block.
+    """
+    block = permute_int(block, IP_TABLES)
+    left = block >> 32
+    right = block & 0xFFFFFFFF
+
+    for round_keys in stages:
+        # Undo the swap of the last round (R16 + L16 becomes the next stage's L0 + R0)
+        right, left = des_rounds_int(left, right, round_keys)
+
+    return permute_int((left << 32) | right, FP_TABLES)
+
+def tdes_encrypt_int(block, key):
+    """
+    Encrypt a 64-bit integer block with Triple-DES (EDE).
+
+    Args:
+        block (int): The 64-bit plaintext.
+        key (bytes): 8, 16 or 24-byte key bundle.
+
+    Returns:
+        int: The 64-bit ciphertext.
+    """
+    return tdes_crypt_int(block, compile_triple_key(key).forward)
+
+def tdes_decrypt_int(block, key):
+    """
+    Decrypt a 64-bit integer block with Triple-DES (EDE).
+
+    Args:
+        block (int): The 64-bit ciphertext.
+        key (bytes): 8, 16 or 24-byte key bundle.
+
+    Returns:
+        int: The 64-bit plaintext.
+    """
+    return tdes_crypt_int(block, compile_triple_key(key).reverse)
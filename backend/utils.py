@@ -1,5 +1,10 @@
 # backend/utils.py
 
+import threading
+from collections import OrderedDict
+from .conversions import (bits_to_binary, binary_to_bits, hex_to_bits, bits_to_hex, bytes_to_hex,
+                          is_hex, is_binary)
+
 def permute(block, table):
     """
     Permute the input block based on the provided table.
@@ -44,20 +49,100 @@ def xor(a, b):
     """
     return [x ^ y for x, y in zip(a, b)]
 
+def bits_to_int(bits):
+    """
+    Convert a list of bits (most significant bit first) to an integer.
+
+    Args:
+        bits (list): List of bits.
+
+    Returns:
+        int: Integer value of the bits.
+    """
+    return int(bits_to_binary(bits), 2)
+
+def int_to_bits(value, width):
+    """
+    Convert an integer to a list of bits (most significant bit first).
+
+    Args:
+        value (int): Non-negative integer.
+        width (int): Number of bits in the output.
+
+    Returns:
+        list: List of `width` bits.
+    """
+    return binary_to_bits(format(value, f'0{width}b'))
+
+def compile_permutation(table, width):
+    """
+    Compile a permutation table into byte-indexed lookup tables for integers.
+
+    The input integer is split into bytes; each byte indexes a 256-entry table
+    holding the output bits it contributes, so a permutation costs one lookup
+    per input byte instead of one operation per bit.
+
+    Args:
+        table (list): A list defining the permutation order (1-based, as for `permute`).
+        width (int): Bit width of the input integer (a multiple of 8).
+
+    Returns:
+        list: One 256-entry lookup table per input byte, most significant byte first.
+
+    Raises:
+        ValueError: If the width is not a multiple of 8 or is smaller than the maximum index in the table.
+    """
+    if width % 8:
+        raise ValueError(f"Input width {width} is not a multiple of 8.")
+    if width < max(table):
+        raise ValueError(f"Input width {width} is smaller than the maximum table index {max(table)}.")
+    out_width = len(table)
+    tables = []
+    for byte_index in range(width // 8):
+        # Output bits set by each input bit of this byte (most significant bit first)
+        contributions = [0] * 8
+        for out_pos, in_pos in enumerate(table):
+            if (in_pos - 1) // 8 == byte_index:
+                contributions[(in_pos - 1) % 8] |= 1 << (out_width - 1 - out_pos)
+        lookup = [0] * 256
+        for value in range(1, 256):
+            lowest = value & -value
+            lookup[value] = lookup[value ^ lowest] | contributions[8 - lowest.bit_length()]
+        tables.append(lookup)
+    return tables
+
+def permute_int(value, tables):
+    """
+    Permute an integer using lookup tables built by `compile_permutation`.
+
+    Args:
+        value (int): Input integer.
+        tables (list): Byte-indexed lookup tables, most significant byte first.
+
+    Returns:
+        int: Permuted integer.
+    """
+    result = 0
+    shift = len(tables) * 8
+    for lookup in tables:
+        shift -= 8
+        result |= lookup[(value >> shift) & 0xFF]
+    return result
+
 def hex_to_bin(hex_str):
     """
     Convert a hexadecimal string to a list of bits.
 
     Args:
-        hex_str (str): Hexadecimal string.
+        hex_str (str): Hexadecimal string of any length.
 
     Returns:
-        list: List of bits.
+        list: List of bits (4 per hexadecimal digit).
+
+    Raises:
+        ValueError: If the string contains non-hexadecimal characters.
     """
-    scale = 16  # Hexadecimal
-    num_of_bits = len(hex_str) * 4
-    bin_str = bin(int(hex_str, scale))[2:].zfill(num_of_bits)
-    return [int(bit) for bit in bin_str]
+    return hex_to_bits(hex_str)
 
 def bin_to_hex(bin_list):
     """
@@ -67,15 +152,9 @@ def bin_to_hex(bin_list):
         bin_list (list): List of bits.
 
     Returns:
-        str: Hexadecimal string.
+        str: Upper-case hexadecimal string, one digit per 4 bits (16 for a 64-bit block).
     """
-    bin_str = ''.join(str(bit) for bit in bin_list)
-    hex_str = hex(int(bin_str, 2))[2:].upper()
-    # Calculate the required padding (16 hex characters for 64 bits)
-    padding_length = 16 - len(hex_str)
-    if padding_length > 0:
-        hex_str = '0' * padding_length + hex_str
-    return hex_str
+    return bits_to_hex(bin_list)
 
 def ascii_to_hex(text):
     """
@@ -87,7 +166,7 @@ def ascii_to_hex(text):
     Returns:
         str: Hexadecimal representation of the text.
     """
-    return text.encode('utf-8').hex().upper()
+    return bytes_to_hex(text.encode('utf-8'))
 
 def is_valid_hex(hex_str):
     """
@@ -99,11 +178,7 @@ def is_valid_hex(hex_str):
     Returns:
         bool: True if valid hex, False otherwise.
     """
-    try:
-        int(hex_str, 16)
-        return True
-    except ValueError:
-        return False
+    return is_hex(hex_str)
 
 def is_valid_binary(bin_str):
     """
@@ -115,4 +190,97 @@ def is_valid_binary(bin_str):
     Returns:
         bool: True if valid binary, False otherwise.
     """
-    return all(bit in ['0', '1'] for bit in bin_str)
+    return is_binary(bin_str)
+
+class LRUCache:
+    """
+    Thread-safe bounded cache that evicts the least recently used entry.
+
+    Keeps hit, miss and eviction counters so cache effectiveness can be monitored.
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, compute):
+        """
+        Return the cached value for a key, computing and storing it on a miss.
+
+        Args:
+            key: Hashable cache key.
+            compute (callable): Called with the key to build a missing value.
+
+        Returns:
+            The cached or newly computed value.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Compute outside the lock so slow misses do not block cache hits
+        value = compute(key)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+        return value
+
+    def resize(self, maxsize):
+        """
+        Change the maximum number of entries, evicting the oldest ones if needed.
+
+        Args:
+            maxsize (int): New maximum number of entries.
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Report cache usage.
+
+        Returns:
+            dict: Size, maximum size, hit/miss/eviction counters and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def _evict(self):
+        # Caller must hold the lock
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,212 @@
+# backend/variants.py
+
+import hashlib
+import json
+import os
+from .des import IP, E, P, S_BOX, compile_sp_tables, des_crypt_int, des_crypt_states_int
+from .key_expansion import SHIFT_SCHEDULE, KeySchedule, generate_keys_int
+from .utils import compile_permutation, LRUCache
+
+# Teaching variants of DES: a different round count, S-boxes, permutations or
+# key rotation schedule. PC-1 and PC-2 are kept, so keys stay 64-bit values
+# with 56 effective bits. A variant is validated once, compiled into the same
+# byte-indexed tables as the integer engine and cached by content hash.
+
+# Upper bound on the rounds of a variant
+MAX_VARIANT_ROUNDS = 32
+
+# Fields of a variant specification, as accepted by `DESVariant.from_dict`
+VARIANT_FIELDS = ('rounds', 'ip', 'fp', 'e', 'p', 's_boxes', 'shift_schedule')
+
+# Compiled variants by content hash; a handful are in use at a time
+variant_cache = LRUCache(maxsize=int(os.environ.get('DES_VARIANT_CACHE_SIZE', 32)))
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _check_table(name, table, length, width, permutation=False):
+    """
+    Validate a 1-based bit selection table and return it as a tuple.
+
+    Args:
+        name (str): Table name for error messages.
+        table (list): The table.
+        length (int): Required number of entries.
+        width (int): Largest allowed entry (the input width in bits).
+        permutation (bool): Whether every input bit must appear exactly once.
+
+    Returns:
+        tuple: The table.
+
+    Raises:
+        ValueError: If the table is malformed.
+    """
+    if not isinstance(table, (list, tuple)) or len(table) != length:
+        raise ValueError(f"{name} must be a list of {length} entries.")
+    if not all(_is_int(entry) and 1 <= entry <= width for entry in table):
+        raise ValueError(f"{name} entries must be integers from 1 to {width}.")
+    if permutation and len(set(table)) != length:
+        raise ValueError(f"{name} must be a permutation: every bit from 1 to {width} exactly once.")
+    return tuple(table)
+
+def _inverse(table):
+    inverse = [0] * len(table)
+    for position, source in enumerate(table, 1):
+        inverse[source - 1] = position
+    return tuple(inverse)
+
+class DESVariant:
+    """
+    Specification of a DES variant: round count and custom tables.
+
+    Tables use the same 1-based, most significant bit first conventions as
+    `des.py`. Omitted tables are the DES ones; FP defaults to the inverse of
+    IP and the shift schedule to the first `rounds` DES shifts.
+    """
+
+    __slots__ = VARIANT_FIELDS
+
+    def __init__(self, rounds=16, ip=IP, e=E, p=P, s_boxes=S_BOX, shift_schedule=None, fp=None):
+        """
+        Args:
+            rounds (int): Number of Feistel rounds (1 to MAX_VARIANT_ROUNDS).
+            ip (list): Initial Permutation, 64 entries.
+            e (list): Expansion, 48 entries selecting bits of the 32-bit R.
+            p (list): Permutation of the 32 S-box output bits.
+            s_boxes (list): Eight S-boxes, each 4 rows of 16 values from 0 to 15.
+            shift_schedule (list): Left rotation of C and D before each round key (0 to 27), one per round.
+            fp (list): Final Permutation; must be the inverse of IP.
+
+        Raises:
+            ValueError: If a value or table is malformed.
+        """
+        if not _is_int(rounds) or not 1 <= rounds <= MAX_VARIANT_ROUNDS:
+            raise ValueError(f"Rounds must be an integer from 1 to {MAX_VARIANT_ROUNDS}.")
+        self.rounds = rounds
+        self.ip = _check_table('IP', ip, 64, 64, permutation=True)
+        self.fp = _inverse(self.ip)
+        # Decryption runs the same network with reversed round keys, which only undoes encryption if FP = IP^-1
+        if fp is not None and _check_table('FP', fp, 64, 64, permutation=True) != self.fp:
+            raise ValueError("FP must be the inverse of IP.")
+        self.e = _check_table('E', e, 48, 32)
+        self.p = _check_table('P', p, 32, 32, permutation=True)
+        if (not isinstance(s_boxes, (list, tuple)) or len(s_boxes) != 8 or
+                not all(isinstance(sbox, (list, tuple)) and len(sbox) == 4 for sbox in s_boxes) or
+                not all(isinstance(row, (list, tuple)) and len(row) == 16 for sbox in s_boxes for row in sbox)):
+            raise ValueError("S-boxes must be 8 boxes of 4 rows of 16 values.")
+        if not all(_is_int(value) and 0 <= value <= 15 for sbox in s_boxes for row in sbox for value in row):
+            raise ValueError("S-box values must be integers from 0 to 15.")
+        self.s_boxes = tuple(tuple(tuple(row) for row in sbox) for sbox in s_boxes)
+        if shift_schedule is None:
+            if rounds > len(SHIFT_SCHEDULE):
+                raise ValueError(f"A shift schedule is required for more than {len(SHIFT_SCHEDULE)} rounds.")
+            shift_schedule = SHIFT_SCHEDULE[:rounds]
+        if (not isinstance(shift_schedule, (list, tuple)) or len(shift_schedule) != rounds or
+                not all(_is_int(shift) and 0 <= shift <= 27 for shift in shift_schedule)):
+            raise ValueError("The shift schedule must have one shift from 0 to 27 per round.")
+        self.shift_schedule = tuple(shift_schedule)
+
+    @classmethod
+    def from_dict(cls, spec):
+        """
+        Build a variant from a specification dict (e.g. parsed JSON).
+
+        Args:
+            spec (dict): Any of VARIANT_FIELDS; omitted fields take their defaults.
+
+        Returns:
+            DESVariant: The validated variant.
+
+        Raises:
+            ValueError: If the specification is malformed.
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("A variant specification must be an object.")
+        unknown = set(spec) - set(VARIANT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown variant fields: {', '.join(sorted(unknown))}. "
+                             f"Expected any of: {', '.join(VARIANT_FIELDS)}.")
+        return cls(**spec)
+
+    def to_dict(self):
+        """
+        Full specification of the variant, every table included.
+        """
+        return {field: getattr(self, field) for field in VARIANT_FIELDS}
+
+    @property
+    def digest(self):
+        """
+        Content hash identifying the variant (hexadecimal SHA-256).
+        """
+        return hashlib.sha256(json.dumps(self.to_dict(), separators=(',', ':')).encode()).hexdigest()
+
+class CompiledVariant:
+    """
+    A DES variant compiled into lookup tables for the integer engine.
+
+    Blocks and keys are 64-bit integers; round keys come from the variant's
+    shift schedule and are applied by `des.des_crypt_int` with the variant's tables.
+    """
+
+    __slots__ = ('variant', 'digest', 'tables')
+
+    def __init__(self, variant):
+        """
+        Args:
+            variant (DESVariant): The validated variant.
+        """
+        self.variant = variant
+        self.digest = variant.digest
+        self.tables = (compile_permutation(variant.ip, 64), compile_permutation(variant.e, 32),
+                       compile_sp_tables(variant.s_boxes, compile_permutation(variant.p, 32)),
+                       compile_permutation(variant.fp, 64))
+
+    def key_schedule(self, key):
+        """
+        Round keys for a 64-bit key in both directions.
+
+        Returns:
+            KeySchedule: Tuples of `rounds` 48-bit round keys for encryption and decryption.
+        """
+        round_keys = tuple(generate_keys_int(key, self.variant.shift_schedule))
+        return KeySchedule(round_keys, round_keys[::-1])
+
+    def encrypt_int(self, block, key):
+        """
+        Encrypt a 64-bit integer block.
+        """
+        return des_crypt_int(block, self.key_schedule(key).forward, *self.tables)
+
+    def decrypt_int(self, block, key):
+        """
+        Decrypt a 64-bit integer block.
+        """
+        return des_crypt_int(block, self.key_schedule(key).reverse, *self.tables)
+
+    def crypt_states_int(self, block, key, decrypt=False):
+        """
+        Encrypt or decrypt a 64-bit integer block, recording L and R after each round.
+
+        Returns:
+            tuple: (64-bit output block, list of (left, right) 32-bit pairs, as
+                for `des.des_crypt_states_int`)
+        """
+        schedule = self.key_schedule(key)
+        return des_crypt_states_int(block, schedule.reverse if decrypt else schedule.forward, *self.tables)
+
+def get_variant(spec):
+    """
+    Return the compiled form of a variant, compiling it on first use only.
+
+    Args:
+        spec (DESVariant or dict): The variant, or its specification.
+
+    Returns:
+        CompiledVariant: The compiled variant, shared by every caller with the same tables.
+
+    Raises:
+        ValueError: If the specification is malformed.
+    """
+    variant = spec if isinstance(spec, DESVariant) else DESVariant.from_dict(spec)
+    return variant_cache.get(variant.digest, lambda _: CompiledVariant(variant))
@@ -0,0 +1,25 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture(scope='session')
+def client(tmp_path_factory):
+    """
+    Test client of the Flask app, with a temporary database migrated to the
+    latest revision and uploaded files stored in a temporary directory.
+    """
+    os.environ['DES_STORAGE_DIR'] = str(tmp_path_factory.mktemp('encrypted_files'))
+    os.environ['DES_DATABASE_URL'] = 'sqlite:///' + str(tmp_path_factory.mktemp('database') / 'history.db')
+    from flask_migrate import upgrade
+    from backend.app import app, limiter
+    limiter.enabled = False
+    app.config['TESTING'] = True
+    with app.app_context():
+        upgrade(directory=os.path.join(ROOT, 'backend', 'migrations'))
+    return app.test_client()
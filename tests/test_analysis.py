@@ -0,0 +1,56 @@
+# tests/test_analysis.py
+
+import pytest
+
+from backend.analysis import KEY_EFFECTIVE_BITS, avalanche, get_sbox_tables, strict_avalanche, table_summary
+
+PLAINTEXT = 0x0123456789ABCDEF
+KEY = 0x133457799BBCDFF1
+
+def test_ddt():
+    ddt = get_sbox_tables().ddt
+    # Biham and Shamir: S1 maps input difference 34 to output difference 2 for 16 of the 64 inputs
+    assert ddt[0][0x34][2] == 16
+    assert ddt[0][0][0] == 64
+    assert (ddt.sum(axis=2) == 64).all()
+
+def test_lat():
+    lat = get_sbox_tables().lat
+    # Matsui: input bit mask 16 agrees with output mask 15 of S5 for only 12 of the 64 inputs
+    assert lat[4][16][15] == -20
+    assert (lat[:, 0, 0] == 32).all()
+    assert (lat[:, 1:, 0] == 0).all()
+
+def test_tables_are_read_only():
+    tables = get_sbox_tables()
+    assert not tables.ddt.flags.writeable and not tables.lat.flags.writeable
+
+def test_summary():
+    summary = table_summary(get_sbox_tables())
+    assert summary[0]['best_differential']['probability'] == 16 / 64
+    assert summary[4]['best_approximation'] == {'input_mask': 16, 'output_mask': 15, 'value': -20, 'bias': -20 / 64}
+
+def test_avalanche():
+    result = avalanche(PLAINTEXT, KEY)
+    assert len(result['plaintext']) == len(result['key']) == 64
+    assert all(len(distances) == 16 for distances in result['plaintext'] + result['key'])
+    # About half of the 64 state bits differ once the rounds have mixed
+    assert result['plaintext_mean'][-1] == pytest.approx(32, abs=2)
+    assert result['key_mean'][-1] == pytest.approx(32, abs=2)
+    assert result['plaintext_mean'][0] < 8
+
+def test_avalanche_parity_bits():
+    key_flips = avalanche(PLAINTEXT, KEY)['key']
+    for bit in range(64):
+        if bit in KEY_EFFECTIVE_BITS:
+            assert key_flips[bit][-1] > 0
+        else:
+            assert key_flips[bit] == [0] * 16
+
+def test_strict_avalanche():
+    result = strict_avalanche(samples=200, seed=1)
+    for name in ('plaintext', 'key'):
+        assert result[name]['mean'] == pytest.approx(0.5, abs=0.01)
+        assert result[name]['round_mean_distance'][-1] == pytest.approx(32, abs=0.5)
+    with pytest.raises(ValueError):
+        strict_avalanche(samples=0)
@@ -0,0 +1,45 @@
+# tests/test_compression.py
+
+import gzip
+import json
+
+from flask import Response
+
+# backend.app is imported inside the tests, once the client fixture has pointed it at a temporary database
+
+KEY = '133457799BBCDFF1'
+PLAINTEXT = '0123456789ABCDEF'
+
+def encrypt(client, trace, headers):
+    return client.post('/encrypt', data={'key': KEY, 'message': PLAINTEXT, 'input_format': 'hex', 'trace': trace},
+                       headers=headers)
+
+def test_large_json_is_gzipped(client):
+    from backend.app import COMPRESS_MIN_SIZE
+    plain = encrypt(client, 'full', {})
+    assert 'Content-Encoding' not in plain.headers
+    assert len(plain.data) >= COMPRESS_MIN_SIZE
+
+    response = encrypt(client, 'full', {'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(response.data) < len(plain.data)
+    # Same round details once decompressed (the trace id differs per request)
+    assert json.loads(gzip.decompress(response.data))['round_details'] == plain.get_json()['round_details']
+
+def test_small_json_is_not_compressed(client):
+    from backend.app import COMPRESS_MIN_SIZE
+    response = encrypt(client, 'none', {'Accept-Encoding': 'gzip'})
+    assert len(response.data) < COMPRESS_MIN_SIZE
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.get_json()['success']
+
+def test_non_json_is_not_compressed(client):
+    from backend.app import COMPRESS_MIN_SIZE, app, compressed
+    body = 'x' * 4 * COMPRESS_MIN_SIZE
+    view = compressed(lambda: Response(body, mimetype='text/plain'))
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = view()
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True) == body
@@ -0,0 +1,171 @@
+# tests/test_des.py
+
+import json
+import os
+import random
+
+import pytest
+
+from backend import bitslice_des
+from backend.des import (DESCipher, RoundTrace, des_encrypt, des_decrypt, des_encrypt_int, des_decrypt_int,
+                         des_crypt_bits, feistel, initial_permutation, pack_round_details, unpack_round_details,
+                         TRACE_NONE, TRACE_SUMMARY, TRACE_FULL)
+from backend.key_expansion import generate_keys, get_key_schedule
+from backend.modes import split_blocks, join_blocks
+from backend.utils import int_to_bits, bits_to_int, xor
+
+try:
+    from backend import batch_des
+except ImportError:  # NumPy is optional
+    batch_des = None
+
+# Stallings' worked example, used throughout the DES literature
+PLAINTEXT = 0x0123456789ABCDEF
+KEY = 0x133457799BBCDFF1
+CIPHERTEXT = 0x85E813540F0AB405
+
+def random_data(blocks, seed=0):
+    rng = random.Random(seed)
+    return rng.getrandbits(64), rng.randbytes(8 * blocks)
+
+def test_known_answer_int():
+    assert des_encrypt_int(PLAINTEXT, KEY) == CIPHERTEXT
+    assert des_decrypt_int(CIPHERTEXT, KEY) == PLAINTEXT
+
+@pytest.mark.parametrize('trace', [TRACE_NONE, TRACE_SUMMARY, TRACE_FULL])
+def test_known_answer_bits(trace):
+    result = des_encrypt(int_to_bits(PLAINTEXT, 64), int_to_bits(KEY, 64), trace=trace)
+    ciphertext = result if trace == TRACE_NONE else result[0]
+    assert bits_to_int(ciphertext) == CIPHERTEXT
+    result = des_decrypt(int_to_bits(CIPHERTEXT, 64), int_to_bits(KEY, 64), trace=trace)
+    plaintext = result if trace == TRACE_NONE else result[0]
+    assert bits_to_int(plaintext) == PLAINTEXT
+
+def test_known_answer_reference_engine():
+    round_keys = generate_keys(int_to_bits(KEY, 64))
+    assert bits_to_int(des_crypt_bits(int_to_bits(PLAINTEXT, 64), round_keys)) == CIPHERTEXT
+    assert bits_to_int(des_crypt_bits(int_to_bits(CIPHERTEXT, 64), round_keys[::-1])) == PLAINTEXT
+
+def test_known_answer_cipher():
+    cipher = DESCipher(KEY)
+    assert cipher.encrypt_block(PLAINTEXT) == CIPHERTEXT
+    assert cipher.encrypt_block(PLAINTEXT.to_bytes(8, 'big')) == CIPHERTEXT.to_bytes(8, 'big')
+    assert cipher.decrypt_block(CIPHERTEXT) == PLAINTEXT
+
+def test_full_trace_rounds():
+    _, round_details = des_encrypt(int_to_bits(PLAINTEXT, 64), int_to_bits(KEY, 64), trace=TRACE_FULL)
+    assert len(round_details) == 16
+    for previous, current in zip(round_details, round_details[1:]):
+        assert current.left_before == previous.left_after
+        assert current.right_before == previous.right_after
+    # Stallings: L16 R16 before the Final Permutation
+    assert (round_details[-1].left_after, round_details[-1].right_after) == (0x43423234, 0x0A4CD995)
+
+def reference_trace(block, round_keys):
+    """
+    Round details built from the bit-list `feistel`, in the `RoundTrace.to_dict` format.
+    """
+    permuted_block = initial_permutation(block)
+    left, right = permuted_block[:32], permuted_block[32:]
+    round_details = []
+    for number, subkey in enumerate(round_keys, 1):
+        f = feistel(right, subkey)
+        new_right = xor(left, f['permutation_output'])
+        round_details.append({'round': number, 'subkey': subkey, 'left_before': left, 'right_before': right,
+                              **f, 'left_after': right, 'right_after': new_right})
+        left, right = right, new_right
+    return round_details
+
+@pytest.mark.parametrize('decrypt', [False, True])
+def test_full_trace_matches_reference_trace(decrypt):
+    round_keys = generate_keys(int_to_bits(KEY, 64))
+    block = int_to_bits(CIPHERTEXT if decrypt else PLAINTEXT, 64)
+    crypt = des_decrypt if decrypt else des_encrypt
+    _, round_details = crypt(block, int_to_bits(KEY, 64), trace=TRACE_FULL)
+    expected = reference_trace(block, round_keys[::-1] if decrypt else round_keys)
+    assert [round_trace.to_dict() for round_trace in round_details] == expected
+
+    _, summary = crypt(block, int_to_bits(KEY, 64), trace=TRACE_SUMMARY)
+    assert [round_trace.to_dict() for round_trace in summary] == [
+        {field: round_info[field] for field in ('round', 'left_before', 'right_before', 'left_after', 'right_after')}
+        for round_info in expected]
+
+def test_round_trace_hex_round_trip():
+    _, round_details = des_encrypt(int_to_bits(PLAINTEXT, 64), int_to_bits(KEY, 64), trace=TRACE_FULL)
+    first = round_details[0].to_hex()
+    assert first['subkey'] == '1B02EFFC7072' and first['left_before'] == 'CC00CCFF'
+    for round_trace in round_details + [round_trace.summary() for round_trace in round_details]:
+        assert RoundTrace.from_hex(round_trace.to_hex()).to_dict() == round_trace.to_dict()
+    with pytest.raises(ValueError):
+        RoundTrace.from_hex({'round': 1, 'left_before': 'CC00CCFF'})
+
+@pytest.mark.parametrize('trace', [TRACE_SUMMARY, TRACE_FULL])
+def test_pack_round_details_round_trip(trace):
+    _, round_details = des_encrypt(int_to_bits(PLAINTEXT, 64), int_to_bits(KEY, 64), trace=trace)
+    packed = json.loads(json.dumps(pack_round_details(round_details)))
+    assert len(packed['rounds']) == 16
+    assert [round_trace.to_dict() for round_trace in unpack_round_details(packed)] == \
+        [round_trace.to_dict() for round_trace in round_details]
+    assert unpack_round_details(pack_round_details([])) == []
+
+@pytest.mark.parametrize('packed', [
+    None,
+    {},
+    {'rounds': []},
+    {'fields': [['left_before', 32]]},
+    {'fields': 'left_before', 'rounds': []},
+    {'fields': [['left', 32]], 'rounds': []},
+    {'fields': [['left_before', 48]], 'rounds': []},
+    {'fields': [['left_before', 32]], 'rounds': 'CC00CCFF'},
+    {'fields': [['left_before', 32]], 'rounds': ['CC00CCFF']},
+    {'fields': [['left_before', 32], ['right_before', 32], ['left_after', 32], ['right_after', 32]],
+     'rounds': ['CC00CCFF']},
+    {'fields': [['left_before', 32], ['right_before', 32], ['left_after', 32], ['right_after', 32]],
+     'rounds': ['XX' * 16]},
+])
+def test_unpack_round_details_rejects_malformed_input(packed):
+    with pytest.raises(ValueError):
+        unpack_round_details(packed)
+
+def test_history_round_details_bits(client):
+    from backend.app import History
+    _, round_details = des_encrypt(int_to_bits(PLAINTEXT, 64), int_to_bits(KEY, 64), trace=TRACE_FULL)
+    expected = [round_trace.to_dict() for round_trace in round_details]
+    # Rows are stored as hexadecimal; rows saved before that hold the bit lists themselves
+    stored = History(round_details=json.dumps([round_trace.to_hex() for round_trace in round_details]))
+    legacy = History(round_details=json.dumps(expected))
+    assert stored.round_details_bits() == expected
+    assert legacy.round_details_bits() == expected
+    assert History(round_details=None).round_details_bits() == []
+
+def test_reference_engine_matches_int_engine():
+    key, data = random_data(32)
+    round_keys = generate_keys(int_to_bits(key, 64))
+    expected = join_blocks([bits_to_int(des_crypt_bits(int_to_bits(block, 64), round_keys))
+                            for block in split_blocks(data)])
+    assert DESCipher(key).encrypt_blocks(data) == expected
+
+def test_bitslice_engine_matches_int_engine():
+    key, data = random_data(200, seed=1)
+    schedule = get_key_schedule(key)
+    ciphertext = bitslice_des.crypt_bytes(data, [schedule.forward])
+    assert ciphertext == DESCipher(key).encrypt_blocks(data)
+    assert bitslice_des.crypt_bytes(ciphertext, [schedule.reverse]) == data
+
+@pytest.mark.skipif(batch_des is None, reason='NumPy is not installed')
+def test_batch_engine_matches_int_engine():
+    key, data = random_data(200, seed=2)
+    schedule = get_key_schedule(key)
+    ciphertext = batch_des.crypt_bytes(data, [schedule.forward])
+    assert ciphertext == DESCipher(key).encrypt_blocks(data)
+    assert batch_des.crypt_bytes(ciphertext, [schedule.reverse]) == data
+
+def test_engines_on_random_keys():
+    for _ in range(20):
+        key = int.from_bytes(os.urandom(8), 'big')
+        block = int.from_bytes(os.urandom(8), 'big')
+        ciphertext = des_encrypt_int(block, key)
+        assert bits_to_int(des_encrypt(int_to_bits(block, 64), int_to_bits(key, 64), trace=TRACE_NONE)) == ciphertext
+        assert bitslice_des.crypt_bytes(block.to_bytes(8, 'big'), [get_key_schedule(key).forward]) == \
+            ciphertext.to_bytes(8, 'big')
+        assert des_decrypt_int(ciphertext, key) == block
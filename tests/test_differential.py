@@ -0,0 +1,27 @@
+# tests/test_differential.py
+
+import pytest
+
+from backend.differential import differential_attack
+
+def test_three_rounds():
+    result = differential_attack(3, 8, seed=1)
+    assert result['success']
+    assert result['recovered_bits'] == 48
+    assert result['recovered_subkey'] == result['subkey']
+    assert all(sbox['rank'] == 1 for sbox in result['sboxes'])
+
+def test_four_rounds():
+    result = differential_attack(4, 2000, seed=1)
+    assert result['success']
+    assert result['recovered_bits'] == 42
+    assert result['recovered_subkey'] == result['subkey'] & result['recovered_mask']
+
+def test_same_seed_same_key():
+    assert differential_attack(3, 8, seed=5)['key'] == differential_attack(3, 8, seed=5)['key']
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        differential_attack(5, 8)
+    with pytest.raises(ValueError):
+        differential_attack(3, 0)
@@ -0,0 +1,54 @@
+# tests/test_files.py
+
+from backend import modes
+
+KEY = '133457799BBCDFF1'
+IV = '0123456789ABCDEF'
+PLAINTEXT = b'The quick brown fox jumps over the lazy dog. ' * 10
+
+def upload(client, **params):
+    query = '&'.join(f'{name}={value}' for name, value in {'input_format': 'text', **params}.items())
+    return client.post(f'/files?{query}', data=PLAINTEXT, headers={'X-DES-Key': KEY})
+
+def test_upload_with_iv_defaults_to_ctr(client):
+    response = upload(client, iv=IV)
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['iv'] == IV
+    assert body['size'] == len(PLAINTEXT)
+
+    stored = client.get(f"/files/{body['file_id']}").data
+    assert stored[:8] == bytes.fromhex(IV)
+    assert stored[8:] == modes.encrypt(PLAINTEXT, bytes.fromhex(KEY), 'CTR', bytes.fromhex(IV))
+
+def test_upload_rejects_other_modes(client):
+    assert upload(client, mode='CBC').status_code == 400
+
+def test_upload_rejects_key_in_url(client):
+    response = client.post(f'/files?key={KEY}&input_format=text', data=PLAINTEXT)
+    assert response.status_code == 400
+    assert 'X-DES-Key' in response.get_json()['message']
+
+def test_plaintext_range(client):
+    file_id = upload(client).get_json()['file_id']
+    response = client.get(f'/files/{file_id}/plaintext', headers={'X-DES-Key': KEY, 'Range': 'bytes=13-99'})
+    assert response.status_code == 206
+    assert response.data == PLAINTEXT[13:100]
+    assert response.headers['Content-Range'] == f'bytes 13-99/{len(PLAINTEXT)}'
+
+def test_plaintext_multi_range_returns_whole_file(client):
+    file_id = upload(client).get_json()['file_id']
+    response = client.get(f'/files/{file_id}/plaintext', headers={'X-DES-Key': KEY, 'Range': 'bytes=0-9,20-29'})
+    assert response.status_code == 200
+    assert response.data == PLAINTEXT
+
+def test_plaintext_range_out_of_bounds(client):
+    file_id = upload(client).get_json()['file_id']
+    response = client.get(f'/files/{file_id}/plaintext',
+                          headers={'X-DES-Key': KEY, 'Range': f'bytes={len(PLAINTEXT)}-'})
+    assert response.status_code == 416
+
+def test_plaintext_rejects_key_in_url(client):
+    file_id = upload(client).get_json()['file_id']
+    response = client.get(f'/files/{file_id}/plaintext?key={KEY}')
+    assert response.status_code == 400
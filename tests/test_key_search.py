@@ -0,0 +1,61 @@
+# tests/test_key_search.py
+
+import pytest
+
+from backend.des import des_encrypt_int
+from backend.key_search import KEY_MASK, EFFECTIVE_KEY_MASK, KeySpace, search_keys
+
+KEY = 0x133457799BBCDFF1
+PLAINTEXT = 0x0123456789ABCDEF
+CIPHERTEXT = 0x85E813540F0AB405
+UNKNOWN_BITS = 12
+
+def effective(key):
+    return key & EFFECTIVE_KEY_MASK
+
+@pytest.mark.parametrize('engine', ['int', 'numpy'])
+def test_finds_known_key(engine):
+    space = KeySpace.lowest_bits(KEY, UNKNOWN_BITS)
+    assert space.size == 1 << UNKNOWN_BITS and KEY in space
+    result = search_keys(PLAINTEXT, CIPHERTEXT, space, chunk_bits=8, engine=engine, stop_on_first=False)
+    assert [effective(key) for key in result['keys']] == [effective(KEY)]
+    assert result['complete'] and result['tested'] == space.size
+
+@pytest.mark.parametrize('engine', ['int', 'numpy'])
+def test_complement_ciphertext_finds_complement_key(engine):
+    # Only ~KEY is in the space: KEY is found through E_~K(~P) = ~E_K(P)
+    space = KeySpace.lowest_bits(KEY ^ KEY_MASK, UNKNOWN_BITS)
+    assert KEY not in space and not space.complement_closed
+    complement_ciphertext = des_encrypt_int(PLAINTEXT ^ KEY_MASK, KEY)
+    result = search_keys(PLAINTEXT, CIPHERTEXT, space, complement_ciphertext=complement_ciphertext,
+                         chunk_bits=8, engine=engine, stop_on_first=False)
+    assert [effective(key) for key in result['keys']] == [effective(KEY)]
+    assert result['tested'] == result['total'] == 2 * space.size
+    assert result['encryptions'] == space.size
+
+def test_complement_closed():
+    assert KeySpace(0, EFFECTIVE_KEY_MASK).complement_closed
+    assert not KeySpace.lowest_bits(KEY, 55).complement_closed
+    assert KeySpace.lowest_bits(KEY, 56).complement_closed
+
+def test_extra_pairs_discard_keys():
+    space = KeySpace.lowest_bits(KEY, UNKNOWN_BITS)
+    other = 0x1111111111111111
+    valid = [(other, des_encrypt_int(other, KEY))]
+    assert search_keys(PLAINTEXT, CIPHERTEXT, space, extra_pairs=valid, chunk_bits=8)['keys']
+    invalid = [(other, des_encrypt_int(other, KEY) ^ 1)]
+    assert search_keys(PLAINTEXT, CIPHERTEXT, space, extra_pairs=invalid, chunk_bits=8)['keys'] == []
+
+def test_workers_stop_on_first():
+    space = KeySpace.lowest_bits(KEY, 16)
+    result = search_keys(PLAINTEXT, CIPHERTEXT, space, workers=2, chunk_bits=8, stop_on_first=True)
+    assert [effective(key) for key in result['keys']] == [effective(KEY)]
+    assert not result['complete'] and result['tested'] < space.size
+
+def test_invalid_key_space():
+    with pytest.raises(ValueError):
+        KeySpace(KEY, 0)
+    with pytest.raises(ValueError):
+        KeySpace(KEY, 1)  # A parity bit
+    with pytest.raises(ValueError):
+        KeySpace.lowest_bits(KEY, 57)
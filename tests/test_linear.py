@@ -0,0 +1,44 @@
+# tests/test_linear.py
+
+import pytest
+
+from backend.linear import S5_APPROXIMATION, TRAILS, Approximation, approximations_from_list, linear_attack, linear_trail
+
+def test_trail_biases():
+    # Piling-up lemma: 2 * (-20/64)^2 and 4 * (-18/64) * (-20/64)^2
+    assert TRAILS[3].bias == 0.1953125
+    assert TRAILS[4].bias == -0.06103515625
+    assert TRAILS[3].plaintext_mask == TRAILS[3].ciphertext_mask == 0x2104008000008000
+
+def test_linear_trail_rejects_non_chaining_approximations():
+    with pytest.raises(ValueError):
+        linear_trail([S5_APPROXIMATION, S5_APPROXIMATION, S5_APPROXIMATION])
+    with pytest.raises(ValueError):
+        linear_trail([None, None])
+    with pytest.raises(ValueError):
+        linear_trail([Approximation(8, 16, 15), None, S5_APPROXIMATION])
+
+def test_approximations_from_list():
+    assert linear_trail(approximations_from_list([[1, 27, 4], [5, 16, 15], None, [5, 16, 15]])) == TRAILS[4]
+    with pytest.raises(ValueError):
+        approximations_from_list([[0, 16, 15], None, [5, 16, 15]])
+    with pytest.raises(ValueError):
+        approximations_from_list({'sbox': 5})
+
+@pytest.mark.parametrize('rounds, pairs', [(3, 2000), (4, 20000)])
+def test_algorithm1(rounds, pairs):
+    result = linear_attack(rounds, algorithm=1, pairs=pairs, trials=4, seed=1)
+    assert result['success_rate'] == 1.0
+    assert result['mean_bias_estimate'] == pytest.approx(TRAILS[rounds].bias, abs=0.02)
+
+@pytest.mark.parametrize('rounds, pairs', [(4, 5000), (5, 100000)])
+def test_algorithm2(rounds, pairs):
+    result = linear_attack(rounds, algorithm=2, pairs=pairs, trials=4, seed=1)
+    assert result['success_rate'] == 1.0
+    assert all(trial['rank'] == 1 and trial['best'] == trial['correct'] for trial in result['results'])
+
+def test_unsupported_rounds():
+    with pytest.raises(ValueError):
+        linear_attack(6, algorithm=1)
+    with pytest.raises(ValueError):
+        linear_attack(3, algorithm=2)
@@ -0,0 +1,43 @@
+# tests/test_mitm.py
+
+import os
+import random
+
+import pytest
+
+from backend import mitm
+from backend.key_search import KeySpace
+from backend.mitm import MiddleTable, double_encrypt_int, meet_in_the_middle
+
+UNKNOWN_BITS = 10
+PLAINTEXT = 0x0123456789ABCDEF
+EXTRA_PLAINTEXT = 0x1111111111111111
+
+def keys_and_spaces(seed):
+    rng = random.Random(seed)
+    space1 = KeySpace.lowest_bits(0x133457799BBCDFF1, UNKNOWN_BITS)
+    space2 = KeySpace.lowest_bits(0x0E329232EA6D0D73, UNKNOWN_BITS)
+    return space1.key(rng.randrange(space1.size)), space2.key(rng.randrange(space2.size)), space1, space2
+
+@pytest.mark.parametrize('memory_limit, on_disk', [(mitm.DEFAULT_MEMORY_LIMIT, False), (8, True)])
+def test_recovers_keys(tmp_path, memory_limit, on_disk):
+    key1, key2, space1, space2 = keys_and_spaces(seed=17)
+    ciphertext = double_encrypt_int(PLAINTEXT, key1, key2)
+    extra_pairs = [(EXTRA_PLAINTEXT, double_encrypt_int(EXTRA_PLAINTEXT, key1, key2))]
+    result = meet_in_the_middle(PLAINTEXT, ciphertext, space1, space2, extra_pairs, memory_limit=memory_limit,
+                                directory=str(tmp_path), chunk_bits=6)
+    assert result['keys'] == [(key1, key2)]
+    assert result['on_disk'] is on_disk
+    assert result['runs'] == ((1 << (UNKNOWN_BITS - 6)) if on_disk else 1)
+    assert result['operations'] == space1.size + space2.size
+    # The table file is deleted afterwards
+    assert os.listdir(tmp_path) == []
+
+def test_failed_build_deletes_table_file(tmp_path):
+    def interrupt(done, total, seconds):
+        raise KeyboardInterrupt
+
+    space = KeySpace.lowest_bits(0x133457799BBCDFF1, UNKNOWN_BITS)
+    with pytest.raises(KeyboardInterrupt):
+        MiddleTable(PLAINTEXT, space, memory_limit=8, directory=str(tmp_path), chunk_bits=6, progress=interrupt)
+    assert os.listdir(tmp_path) == []
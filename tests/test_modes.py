@@ -0,0 +1,91 @@
+# tests/test_modes.py
+
+import pytest
+
+from backend import modes
+
+# FIPS 81, Appendix B: "Now is the time for all " under one key and IV
+KEY = bytes.fromhex('0123456789ABCDEF')
+IV = bytes.fromhex('1234567890ABCDEF')
+PLAINTEXT = b'Now is the time for all '
+VECTORS = {
+    'ECB': '3FA40E8A984D48156A271787AB8883F9893D51EC4B563B53',
+    'CBC': 'E5C7CDDE872BF27C43E934008C389C0F683788499A7C05F6',
+    'CFB': 'F3096249C7F46E51A69E839B1A92F78403467133898EA622',
+    'OFB': 'F3096249C7F46E5135F24A242EEB3D3F3D6D5BE3255AF8C3',
+    'CTR': 'F3096249C7F46E51163A8CA0FFC94C27FA2F80F480B86F75',
+}
+
+ENGINES = ['bitslice'] + (['numpy'] if modes.batch_des is not None else [])
+
+@pytest.mark.parametrize('mode', modes.MODES)
+def test_known_answer(mode):
+    iv = None if mode == 'ECB' else IV
+    ciphertext = bytes.fromhex(VECTORS[mode])
+    assert modes.encrypt(PLAINTEXT, KEY, mode, iv, padding=False) == ciphertext
+    assert modes.decrypt(ciphertext, KEY, mode, iv, padding=False) == PLAINTEXT
+
+@pytest.mark.parametrize('mode', modes.PADDED_MODES)
+def test_padding_adds_a_full_block(mode):
+    iv = None if mode == 'ECB' else IV
+    ciphertext = modes.encrypt(PLAINTEXT, KEY, mode, iv)
+    assert ciphertext[:len(PLAINTEXT)] == bytes.fromhex(VECTORS[mode])
+    assert len(ciphertext) == len(PLAINTEXT) + modes.BLOCK_SIZE
+    assert modes.decrypt(ciphertext, KEY, mode, iv) == PLAINTEXT
+
+@pytest.mark.parametrize('length', range(0, 17))
+def test_pkcs7_round_trip(length):
+    data = bytes(range(length))
+    padded = modes.pkcs7_pad(data)
+    assert len(padded) % modes.BLOCK_SIZE == 0 and len(padded) > length
+    assert modes.pkcs7_unpad(padded) == data
+
+@pytest.mark.parametrize('padded', [b'', b'\x01' * 7, b'A' * 7 + b'\x00', b'A' * 7 + b'\x09', b'A' * 6 + b'\x01\x02'])
+def test_pkcs7_rejects_bad_padding(padded):
+    with pytest.raises(ValueError):
+        modes.pkcs7_unpad(padded)
+
+def test_stream_modes_keep_the_length():
+    for mode in ('CFB', 'OFB', 'CTR'):
+        ciphertext = modes.encrypt(PLAINTEXT[:13], KEY, mode, IV)
+        assert ciphertext == bytes.fromhex(VECTORS[mode])[:13]
+        assert modes.decrypt(ciphertext, KEY, mode, IV) == PLAINTEXT[:13]
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('mode', modes.MODES)
+def test_batch_engines_match_block_engine(mode, engine):
+    # Long enough for the batch engines to take over from block-at-a-time encryption
+    data = bytes(range(256)) * 20 + b'tail'
+    iv = None if mode == 'ECB' else IV
+    encrypt_block, decrypt_block = modes.block_functions(KEY)
+    expected = modes.encrypt_with(encrypt_block, data, mode, iv)
+    ciphertext = modes.encrypt(data, KEY, mode, iv, engine=engine)
+    assert ciphertext == expected
+    assert modes.decrypt_with(encrypt_block, decrypt_block, ciphertext, mode, iv) == data
+    assert modes.decrypt(ciphertext, KEY, mode, iv, engine=engine) == data
+
+@pytest.mark.parametrize('mode', modes.MODES)
+def test_incremental_encryption_matches_one_shot(mode):
+    data = bytes(range(256)) * 3 + b'odd'
+    iv = None if mode == 'ECB' else IV
+    encryptor = modes.ModeEncryptor(KEY, mode, iv)
+    chunks = [encryptor.update(data[i:i + 37]) for i in range(0, len(data), 37)]
+    assert b''.join(chunks) + encryptor.finalize() == modes.encrypt(data, KEY, mode, iv)
+
+def test_ctr_decrypt_range():
+    data = bytes(range(256)) * 4
+    ciphertext = modes.encrypt(data, KEY, 'CTR', IV)
+    for start, stop in ((0, 8), (3, 5), (13, 700), (1000, 1024)):
+        assert modes.ctr_decrypt_range(ciphertext, KEY, IV, start, stop) == data[start:stop]
+
+def test_ctr_counter_wraps():
+    iv = bytes.fromhex('FFFFFFFFFFFFFFFF')
+    assert modes.ctr_counter(iv, 8) == bytes(8)
+    data = bytes(24)
+    assert modes.decrypt(modes.encrypt(data, KEY, 'CTR', iv), KEY, 'CTR', iv) == data
+
+def test_invalid_mode_and_iv():
+    with pytest.raises(ValueError):
+        modes.encrypt(PLAINTEXT, KEY, 'XTS', IV)
+    with pytest.raises(ValueError):
+        modes.encrypt(PLAINTEXT, KEY, 'CBC', IV[:4])
@@ -0,0 +1,35 @@
+# tests/test_stream.py
+
+from backend import modes
+
+KEY = '133457799BBCDFF1'
+HEADERS = {'X-DES-Key': KEY}
+PLAINTEXT = b'Now is the time for all good men to come to the aid of the party.\n' * 20
+
+def test_cbc_round_trip(client):
+    response = client.post('/encrypt_stream?mode=CBC&input_format=text', data=PLAINTEXT, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers['X-Mode'] == 'CBC'
+    iv = bytes.fromhex(response.headers['X-IV'])
+    assert len(iv) == 8
+    assert modes.decrypt(response.data, bytes.fromhex(KEY), 'CBC', iv) == PLAINTEXT
+
+def test_mode_defaults_to_cbc(client):
+    response = client.post('/encrypt_stream?input_format=text', data=PLAINTEXT, headers=HEADERS)
+    assert response.headers['X-Mode'] == 'CBC'
+
+def test_empty_body(client):
+    response = client.post('/encrypt_stream', data=b'', headers=HEADERS)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Request body is required.'
+
+def test_bad_hex_in_first_chunk(client):
+    response = client.post('/encrypt_stream?input_format=hex', data=b'0123456789ABCDEFXY',
+                           headers=HEADERS)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_key_in_url_is_rejected(client):
+    response = client.post(f'/encrypt_stream?key={KEY}&input_format=text', data=PLAINTEXT)
+    assert response.status_code == 400
+    assert 'X-DES-Key' in response.get_json()['message']
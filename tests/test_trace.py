@@ -0,0 +1,76 @@
+# tests/test_trace.py
+
+import uuid
+
+import pytest
+
+from backend.des import RoundTrace, unpack_round_details
+
+KEY = '133457799BBCDFF1'
+PLAINTEXT = '0123456789ABCDEF'
+CIPHERTEXT = '85E813540F0AB405'
+
+def encrypt(client, **fields):
+    return client.post('/encrypt', data={'key': KEY, 'message': PLAINTEXT, 'input_format': 'hex', **fields}).get_json()
+
+@pytest.mark.parametrize('trace', ['full', 'summary'])
+def test_trace_matches_inline_round_details(client, trace):
+    body = encrypt(client, trace=trace)
+    assert body['success'] and len(body['trace_id']) == 32
+    response = client.get(f"/trace/{body['trace_id']}?trace={trace}")
+    assert response.status_code == 200
+    assert response.get_json()['round_details'] == body['round_details']
+
+def test_trace_of_decryption(client):
+    body = client.post('/decrypt', data={'key': KEY, 'ciphertext': CIPHERTEXT, 'input_format': 'hex'}).get_json()
+    assert body['success']
+    assert client.get(f"/trace/{body['trace_id']}").get_json()['round_details'] == body['round_details']
+
+def test_trace_round(client):
+    body = encrypt(client)
+    response = client.get(f"/trace/{body['trace_id']}/round/16")
+    assert response.status_code == 200
+    assert response.get_json()['round'] == 16
+    assert response.get_json()['round_details'] == body['round_details'][15:]
+    assert client.get(f"/trace/{body['trace_id']}/round/17").status_code == 404
+    assert client.get(f"/trace/{body['trace_id']}/round/0").status_code == 404
+
+def test_trace_formats(client):
+    trace_id = encrypt(client)['trace_id']
+    hex_rounds = client.get(f'/trace/{trace_id}?trace_format=hex').get_json()['round_details']
+    assert hex_rounds[0]['subkey'] == '1B02EFFC7072'
+    assert (hex_rounds[-1]['left_after'], hex_rounds[-1]['right_after']) == ('43423234', '0A4CD995')
+    summary = client.get(f'/trace/{trace_id}?trace=summary&trace_format=hex').get_json()['round_details']
+    assert summary[0] == {'round': 1, 'left_before': 'CC00CCFF', 'right_before': 'F0AAF0AA',
+                          'left_after': 'F0AAF0AA', 'right_after': 'EF4A6544'}
+    packed = client.get(f'/trace/{trace_id}?trace_format=packed').get_json()['round_details']
+    assert [field for field, _ in packed['fields']][:2] == ['subkey', 'left_before']
+    assert len(packed['rounds']) == 16
+
+def test_bad_trace_requests(client):
+    assert client.get('/trace/not-a-trace-id').status_code == 404
+    assert client.get(f'/trace/{uuid.uuid4().hex}').status_code == 404
+    trace_id = encrypt(client)['trace_id']
+    assert client.get(f'/trace/{trace_id}?trace=none').status_code == 400
+    assert client.get(f'/trace/{trace_id}?trace_format=xml').status_code == 400
+
+@pytest.mark.parametrize('operation, field, block', [('encrypt', 'message', PLAINTEXT),
+                                                     ('decrypt', 'ciphertext', CIPHERTEXT)])
+def test_inline_trace_formats(client, operation, field, block):
+    def crypt(trace_format):
+        body = client.post(f'/{operation}', data={'key': KEY, field: block, 'input_format': 'hex',
+                                                  'trace_format': trace_format}).get_json()
+        assert body['success']
+        return body['round_details']
+
+    def as_bits(round_details):
+        # The bits format leaves out the raw S-box output, which 'sbox_details' carries
+        return [{field: value for field, value in round_trace.to_dict().items() if field != 'sbox_output'}
+                for round_trace in round_details]
+
+    bits = crypt('bits')
+    assert as_bits(RoundTrace.from_hex(round_info) for round_info in crypt('hex')) == bits
+    assert as_bits(unpack_round_details(crypt('packed'))) == bits
+    response = client.post(f'/{operation}', data={'key': KEY, field: block, 'input_format': 'hex',
+                                                   'trace_format': 'xml'})
+    assert response.status_code == 400
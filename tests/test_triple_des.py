@@ -0,0 +1,50 @@
+# tests/test_triple_des.py
+
+import pytest
+
+from backend import modes
+from backend.des import des_encrypt_int
+from backend.triple_des import split_key, tdes_encrypt_int, tdes_decrypt_int
+
+K1 = bytes.fromhex('0123456789ABCDEF')
+K2 = bytes.fromhex('23456789ABCDEF01')
+K3 = bytes.fromhex('456789ABCDEF0123')
+
+# NIST SP 800-67, Appendix B: keying option 1 in ECB mode
+PLAINTEXT = b'The qufck brown fox jump'
+CIPHERTEXT_OPTION_1 = bytes.fromhex('A826FD8CE53B855FCCE21C8112256FE668D5C05DD9B6B900')
+# Keying option 2 (K3 = K1) on the same plaintext
+CIPHERTEXT_OPTION_2 = bytes.fromhex('C44862F70CF2FBDC9077D0909FA91B884CABD61FC58E0CBB')
+
+def test_keying_option_1():
+    assert modes.encrypt(PLAINTEXT, K1 + K2 + K3, 'ECB', padding=False) == CIPHERTEXT_OPTION_1
+    assert modes.decrypt(CIPHERTEXT_OPTION_1, K1 + K2 + K3, 'ECB', padding=False) == PLAINTEXT
+
+def test_keying_option_2():
+    assert modes.encrypt(PLAINTEXT, K1 + K2, 'ECB', padding=False) == CIPHERTEXT_OPTION_2
+    assert modes.encrypt(PLAINTEXT, K1 + K2 + K1, 'ECB', padding=False) == CIPHERTEXT_OPTION_2
+
+def test_keying_option_3_is_single_des():
+    block = int.from_bytes(PLAINTEXT[:8], 'big')
+    assert tdes_encrypt_int(block, K1) == des_encrypt_int(block, int.from_bytes(K1, 'big'))
+    assert tdes_encrypt_int(block, K1 * 3) == des_encrypt_int(block, int.from_bytes(K1, 'big'))
+
+def test_block_round_trip():
+    block = int.from_bytes(PLAINTEXT[8:16], 'big')
+    for key in (K1 + K2 + K3, K1 + K2):
+        assert tdes_decrypt_int(tdes_encrypt_int(block, key), key) == block
+
+def test_split_key():
+    k1, k2, k3 = (int.from_bytes(k, 'big') for k in (K1, K2, K3))
+    assert split_key(K1 + K2 + K3) == (k1, k2, k3)
+    assert split_key(K1 + K2) == (k1, k2, k1)
+    assert split_key(K1) == (k1, k1, k1)
+    with pytest.raises(ValueError):
+        split_key(K1 + K2[:4])
+
+@pytest.mark.parametrize('mode', modes.MODES)
+def test_modes_round_trip(mode):
+    iv = None if mode == 'ECB' else bytes.fromhex('1234567890ABCDEF')
+    data = bytes(range(256)) * 2 + b'tail'
+    for key in (K1 + K2 + K3, K1 + K2):
+        assert modes.decrypt(modes.encrypt(data, key, mode, iv), key, mode, iv) == data
@@ -0,0 +1,58 @@
+# tests/test_variants.py
+
+import numpy as np
+import pytest
+
+from backend import batch_des
+from backend.des import IP, S_BOX
+from backend.variants import DESVariant, get_variant
+
+KEY = 0x133457799BBCDFF1
+PLAINTEXT = 0x0123456789ABCDEF
+CIPHERTEXT = 0x85E813540F0AB405
+
+def test_default_variant_is_des():
+    variant = get_variant({})
+    assert variant.encrypt_int(PLAINTEXT, KEY) == CIPHERTEXT
+    assert variant.decrypt_int(CIPHERTEXT, KEY) == PLAINTEXT
+    assert get_variant({'rounds': 16}) is variant
+
+@pytest.mark.parametrize('rounds', [1, 3, 8, 15])
+def test_reduced_rounds_match_batch_engine(rounds):
+    variant = get_variant({'rounds': rounds})
+    blocks = np.array([PLAINTEXT, 0, 0xFFFFFFFFFFFFFFFF], dtype=np.uint64)
+    expected = batch_des.encrypt_blocks(blocks, KEY, rounds)
+    assert [variant.encrypt_int(int(block), KEY) for block in blocks] == [int(block) for block in expected]
+    assert variant.decrypt_int(int(expected[0]), KEY) == PLAINTEXT
+
+def test_custom_tables_round_trip():
+    # Rotated S-boxes and the identity IP still give an invertible cipher
+    variant = get_variant({'rounds': 20, 'ip': list(range(1, 65)), 's_boxes': S_BOX[1:] + S_BOX[:1],
+                           'shift_schedule': [1, 2] * 10})
+    ciphertext = variant.encrypt_int(PLAINTEXT, KEY)
+    assert ciphertext != CIPHERTEXT
+    assert variant.decrypt_int(ciphertext, KEY) == PLAINTEXT
+    output, states = variant.crypt_states_int(PLAINTEXT, KEY)
+    assert output == ciphertext and len(states) == 21
+
+@pytest.mark.parametrize('spec', [
+    [],
+    {'rounds': 0},
+    {'rounds': True},
+    {'rounds': 17},
+    {'sboxes': S_BOX},
+    {'ip': IP[:-1]},
+    {'ip': [1] * 64},
+    {'fp': IP},
+    {'e': [0] * 48},
+    {'s_boxes': S_BOX[:7]},
+    {'s_boxes': [[[16] * 16] * 4] * 8},
+    {'shift_schedule': [1] * 15},
+])
+def test_malformed_specs(spec):
+    with pytest.raises(ValueError):
+        get_variant(spec)
+
+def test_to_dict_round_trip():
+    variant = DESVariant(rounds=4)
+    assert DESVariant.from_dict(variant.to_dict()).digest == variant.digest